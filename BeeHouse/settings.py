@@ -44,6 +44,7 @@ INSTALLED_APPS = [
     'users',
     'home',
     'contactus',
+    'notifications',
 ]
 
 MIDDLEWARE = [
@@ -69,6 +70,7 @@ TEMPLATES = [
                 'django.template.context_processors.request',
                 'django.contrib.auth.context_processors.auth',
                 'django.contrib.messages.context_processors.messages',
+                'cart.context_processors.cart_badge',
             ],
         },
     },
@@ -107,6 +109,15 @@ SMS_API_KEY_SECRET = config('SMS_API_KEY_SECRET', default='')
 SMS_AUTH_TOKEN = config('SMS_AUTH_TOKEN', default='')
 SMS_TWILIO_NUMBER = config('SMS_TWILIO_NUMBER')
 SMS_ENABLED = config('SMS_ENABLED', default=True, cast=bool)
+# Africa's Talking, for SMS_BACKEND = 'notifications.backends.AfricasTalkingBackend'
+SMS_AT_USERNAME = config('SMS_AT_USERNAME', default='sandbox')
+SMS_AT_API_KEY = config('SMS_AT_API_KEY', default='')
+SMS_AT_SENDER_ID = config('SMS_AT_SENDER_ID', default='')
+# Used by the sms_worker command; requests only queue messages in the outbox
+SMS_BACKEND = config(
+    'SMS_BACKEND',
+    default='notifications.backends.TwilioBackend' if SMS_ENABLED else 'notifications.backends.ConsoleBackend',
+)
 
 # Security Settings (Production)
 if not DEBUG:
@@ -12,19 +12,19 @@ class CartItemInline(admin.TabularInline):
 
 @admin.register(Cart)
 class CartAdmin(admin.ModelAdmin):
-    list_display = ['user', 'created_at', 'get_items_count', 'get_cart_total']
+    list_display = ['user', 'created_at', 'item_count', 'get_cart_total']
     inlines = [CartItemInline]
-    readonly_fields = ['created_at']
-    
-    def get_items_count(self, obj):
-        return obj.items.count()
-    get_items_count.short_description = 'Items Count'
+    readonly_fields = ['created_at', 'item_count', 'subtotal']
     
     def get_cart_total(self, obj):
-        total = sum(item.get_total_price() for item in obj.items.all())
-        return f"{total} DZD"
+        return f"{obj.subtotal} DZD"
     get_cart_total.short_description = 'Cart Total'
 
+    def save_related(self, request, form, formsets, change):
+        # Inline edits bypass the cart's delta updates
+        super().save_related(request, form, formsets, change)
+        Cart.recalculate([form.instance.pk])
+
 @admin.register(CartItem)
 class CartItemAdmin(admin.ModelAdmin):
     list_display = ['cart', 'product', 'quantity', 'get_total_price']
@@ -32,4 +32,17 @@ class CartItemAdmin(admin.ModelAdmin):
     
     def get_total_price(self, obj):
         return f"{obj.get_total_price()} DZD"
-    get_total_price.short_description = 'Total Price'
\ No newline at end of file
+    get_total_price.short_description = 'Total Price'
+
+    def save_model(self, request, obj, form, change):
+        super().save_model(request, obj, form, change)
+        Cart.recalculate([obj.cart_id])
+
+    def delete_model(self, request, obj):
+        super().delete_model(request, obj)
+        Cart.recalculate([obj.cart_id])
+
+    def delete_queryset(self, request, queryset):
+        cart_ids = list(queryset.values_list('cart_id', flat=True).distinct())
+        super().delete_queryset(request, queryset)
+        Cart.recalculate(cart_ids)
@@ -0,0 +1,151 @@
+import re
+
+from django.db import transaction
+
+from products.models import Product
+from .models import Cart, CartItem
+
+MAX_QUANTITY = 999  # Per line; wholesale orders go well past the cart page's 99
+MAX_LINES = 200  # Per request
+
+QUICK_ORDER_SEPARATORS = re.compile(r'[\s,;]+')
+
+
+class CartBatchError(ValueError):
+    """Raised when a batch request is malformed"""
+
+
+def parse_changes(changes):
+    """Validate [{product_id, quantity}, ...] into {product_id: quantity}"""
+    if not isinstance(changes, list):
+        raise CartBatchError('changes must be a list')
+    if len(changes) > MAX_LINES:
+        raise CartBatchError(f'at most {MAX_LINES} lines per request')
+
+    quantities = {}
+    for change in changes:
+        try:
+            product_id = int(change['product_id'])
+            quantity = int(change['quantity'])
+        except (KeyError, TypeError, ValueError):
+            raise CartBatchError(f'invalid line {change!r}')
+        if not 0 <= quantity <= MAX_QUANTITY:
+            raise CartBatchError(f'quantity must be between 0 and {MAX_QUANTITY}')
+        quantities[product_id] = quantity  # Last change of a product wins
+    return quantities
+
+
+def parse_quick_order(text):
+    """
+    Parse a pasted quick-order list into ({product_id: quantity}, errors).
+
+    One line per product: the product slug, then an optional quantity,
+    e.g. "miel-sidr 12", "miel-sidr, 12" or "miel-sidr x12". Repeated
+    slugs are added together. Slugs are resolved in a single query.
+    """
+    wanted = {}
+    errors = []
+    for number, line in enumerate(text.splitlines(), start=1):
+        parts = [part for part in QUICK_ORDER_SEPARATORS.split(line.strip()) if part]
+        if not parts:
+            continue
+        slug, quantity = parts[0], '1'
+        if len(parts) == 2:
+            quantity = parts[1].lstrip('xX×')
+        elif len(parts) > 2:
+            errors.append(f'Line {number}: expected "slug quantity"')
+            continue
+        if not quantity.isdigit() or not 0 < int(quantity) <= MAX_QUANTITY:
+            errors.append(f'Line {number}: invalid quantity "{parts[-1]}"')
+            continue
+        wanted[slug] = wanted.get(slug, 0) + int(quantity)
+
+    if len(wanted) > MAX_LINES:
+        raise CartBatchError(f'at most {MAX_LINES} lines per request')
+
+    ids = dict(Product.objects.filter(slug__in=list(wanted)).values_list('slug', 'id'))
+    quantities = {}
+    for slug, quantity in wanted.items():
+        if slug in ids:
+            quantities[ids[slug]] = min(quantity, MAX_QUANTITY)
+        else:
+            errors.append(f'Unknown product "{slug}"')
+    return quantities, errors
+
+
+def existing_product_ids(*quantities):
+    """Ids from the given {product_id: quantity} dicts that are real products"""
+    ids = set().union(*(q or {} for q in quantities))
+    return set(Product.objects.filter(id__in=list(ids)).values_list('id', flat=True))
+
+
+@transaction.atomic
+def apply_changes(cart, set_quantities=None, add_quantities=None):
+    """
+    Apply a whole batch of cart edits to a DB cart in one transaction.
+
+    set_quantities replaces line quantities (0 removes the line) with one
+    DELETE and one multi-row upsert. add_quantities adds to existing lines,
+    as a quick order does. The cart totals are recounted once at the end.
+    """
+    set_quantities = set_quantities or {}
+    known = existing_product_ids(set_quantities, add_quantities)
+
+    removed = [pk for pk, quantity in set_quantities.items() if quantity == 0]
+    if removed:
+        cart.items.filter(product_id__in=removed).delete()
+
+    CartItem.objects.bulk_create(
+        [
+            CartItem(cart=cart, product_id=pk, quantity=quantity)
+            for pk, quantity in set_quantities.items()
+            if quantity > 0 and pk in known
+        ],
+        update_conflicts=True,
+        unique_fields=['cart', 'product'],
+        update_fields=['quantity'],
+    )
+
+    if add_quantities:
+        CartItem.add_quantities(cart, [(pk, quantity) for pk, quantity in add_quantities.items() if pk in known])
+
+    # Set quantities replace unknown old ones, so recount instead of a delta
+    Cart.recalculate([cart.pk], touch=True)
+
+
+def apply_guest_changes(cart, set_quantities=None, add_quantities=None):
+    """Same as apply_changes for a cookie GuestCart; returns False if it got full"""
+    known = existing_product_ids(set_quantities, add_quantities)
+    for pk, quantity in (set_quantities or {}).items():
+        if pk not in known:
+            continue
+        if quantity == 0:
+            cart.remove(pk)
+        elif pk in cart.lines:
+            cart.update(pk, quantity)
+        elif not cart.add(pk, quantity):
+            return False
+    for pk, quantity in (add_quantities or {}).items():
+        if pk in known and not cart.add(pk, quantity):
+            return False
+    return True
+
+
+def serialize_cart(items, cart):
+    """JSON-ready lines plus the totals of a Cart or GuestCart"""
+    count, total = cart.get_totals()
+    return {
+        'items': [
+            {
+                'product_id': item.product.id,
+                'slug': item.product.slug,
+                'name': item.product.name,
+                'price': float(item.product.price),
+                'quantity': item.quantity,
+                'total': float(item.get_total_price()),
+            }
+            for item in items
+        ],
+        'cart_count': count,
+        'cart_total': float(total),
+    }
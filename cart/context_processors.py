@@ -0,0 +1,24 @@
+from .guest import GuestCart
+from .models import Cart
+
+
+def cart_badge(request):
+    """
+    Cart item count for the navbar badge.
+
+    Passed as a callable so pages that don't render the badge pay
+    nothing. Logged-in counts come from the cache, guest counts from
+    the cart cookie, so neither costs an aggregate query.
+    """
+    def cart_count():
+        if not hasattr(request, '_cart_count'):
+            summary = getattr(request, '_cart_summary', None)
+            if summary is not None:
+                request._cart_count = summary.item_count  # Already loaded by the view
+            elif request.user.is_authenticated:
+                request._cart_count = Cart.get_cached_count(request.user.id)
+            else:
+                request._cart_count = GuestCart.from_request(request).get_count()
+        return request._cart_count
+
+    return {'cart_count': cart_count}
@@ -0,0 +1,131 @@
+import json
+
+from django.conf import settings
+from django.core import signing
+
+from products.models import Product
+from .models import Cart, CartItem
+
+# Guest carts live in a signed cookie, so anonymous browsing and
+# adding to cart never write to the database (not even a session row).
+GUEST_CART_COOKIE = 'guest_cart'
+GUEST_CART_SALT = 'cart.guest'
+GUEST_CART_MAX_AGE = 60 * 60 * 24 * 30  # 30 days
+GUEST_CART_MAX_LINES = 50  # Keeps the cookie well under the 4KB limit
+
+
+class GuestCartItem:
+    """Cookie cart line with the same interface as CartItem"""
+
+    def __init__(self, product, quantity):
+        self.product = product
+        self.quantity = quantity
+
+    @property
+    def id(self):
+        # Guest lines are addressed by product id in the cart URLs
+        return self.product.id
+
+    @property
+    def product_id(self):
+        return self.product.id
+
+    def get_total_price(self):
+        return self.quantity * self.product.price
+
+    def __str__(self):
+        return f"{self.quantity} x {self.product.name}"
+
+
+class GuestCart:
+    """Cart of an anonymous visitor, with the same interface as Cart"""
+
+    def __init__(self, lines=None):
+        self.lines = lines or {}  # product_id -> quantity
+        self._items = None
+
+    @classmethod
+    def from_request(cls, request):
+        try:
+            data = request.get_signed_cookie(
+                GUEST_CART_COOKIE, salt=GUEST_CART_SALT, max_age=GUEST_CART_MAX_AGE
+            )
+            lines = {int(pk): int(quantity) for pk, quantity in json.loads(data).items()}
+        except (KeyError, signing.BadSignature, ValueError, TypeError, AttributeError):
+            lines = {}
+        return cls({pk: quantity for pk, quantity in lines.items() if quantity > 0})
+
+    def add(self, product_id, quantity=1):
+        if product_id not in self.lines and len(self.lines) >= GUEST_CART_MAX_LINES:
+            return False
+        self.lines[product_id] = self.lines.get(product_id, 0) + quantity
+        self._items = None
+        return True
+
+    def update(self, product_id, quantity):
+        if product_id in self.lines:
+            if quantity > 0:
+                self.lines[product_id] = quantity
+            else:
+                del self.lines[product_id]
+            self._items = None
+
+    def remove(self, product_id):
+        self.lines.pop(product_id, None)
+        self._items = None
+
+    @property
+    def items(self):
+        """Cart lines with their products, loaded in a single query"""
+        if self._items is None:
+            products = Product.objects.in_bulk(list(self.lines))
+            self._items = [
+                GuestCartItem(products[pk], quantity)
+                for pk, quantity in self.lines.items()
+                if pk in products  # Drop products deleted since they were added
+            ]
+        return self._items
+
+    def get_total(self):
+        return sum(item.get_total_price() for item in self.items)
+
+    def get_count(self):
+        return sum(self.lines.values())
+
+    def get_totals(self):
+        return self.get_count(), self.get_total()
+
+    def save(self, response):
+        if not self.lines:
+            response.delete_cookie(GUEST_CART_COOKIE)
+            return
+        response.set_signed_cookie(
+            GUEST_CART_COOKIE,
+            json.dumps(self.lines, separators=(',', ':')),
+            salt=GUEST_CART_SALT,
+            max_age=GUEST_CART_MAX_AGE,
+            secure=settings.SESSION_COOKIE_SECURE,
+            httponly=True,
+            samesite='Lax',
+        )
+
+
+def merge_guest_cart(request, response):
+    """
+    Move the guest cart of a visitor who just logged in into their DB cart.
+
+    Quantities of products already in the DB cart are added together,
+    with a single multi-row upsert.
+    """
+    guest = GuestCart.from_request(request)
+    if not guest.lines:
+        return
+
+    # Only keep products that still exist
+    known = set(Product.objects.filter(id__in=list(guest.lines)).values_list('id', flat=True))
+    lines = {pk: quantity for pk, quantity in guest.lines.items() if pk in known}
+
+    cart, created = Cart.objects.get_or_create(user=request.user)
+    CartItem.add_quantities(cart, lines.items())
+
+    response.delete_cookie(GUEST_CART_COOKIE)
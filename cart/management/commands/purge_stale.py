@@ -0,0 +1,86 @@
+import time
+from datetime import timedelta
+
+from django.contrib.sessions.models import Session
+from django.core.management.base import BaseCommand
+from django.db.models import Max, Min
+from django.utils import timezone
+
+from cart.models import Cart
+
+
+class Command(BaseCommand):
+    help = 'Delete carts idle for too long and expired sessions, in small chunks (safe to run from cron)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--cart-days', type=int, default=60, help='Delete carts untouched for this many days')
+        parser.add_argument('--chunk-size', type=int, default=1000, help='Rows examined per delete')
+        parser.add_argument('--dry-run', action='store_true', help='Count what would be deleted without deleting')
+
+    def handle(self, *args, **options):
+        self.chunk_size = options['chunk_size']
+        self.dry_run = options['dry_run']
+        self.verb = 'to remove' if self.dry_run else 'removed'
+        started = time.monotonic()
+
+        carts = self.purge_carts(timezone.now() - timedelta(days=options['cart_days']))
+        sessions = self.purge_sessions(timezone.now())
+
+        self.stdout.write(self.style.SUCCESS(
+            f'\n✓ {carts} carts and {sessions} sessions {self.verb} in {time.monotonic() - started:.2f}s'
+        ))
+
+    def purge_carts(self, cutoff):
+        """
+        Walk the cart table in fixed id ranges.
+
+        Each range is its own short DELETE (items cascade with it), so no
+        statement locks more than chunk_size carts at once.
+        """
+        bounds = Cart.objects.aggregate(low=Min('id'), high=Max('id'))
+        if bounds['low'] is None:
+            return 0
+
+        total = 0
+        for start in range(bounds['low'], bounds['high'] + 1, self.chunk_size):
+            chunk_started = time.monotonic()
+            stale = Cart.objects.filter(
+                id__gte=start, id__lt=start + self.chunk_size, updated_at__lt=cutoff
+            )
+            if self.dry_run:
+                removed = stale.count()
+            else:
+                user_ids = list(stale.values_list('user_id', flat=True))
+                removed = stale.delete()[1].get(Cart._meta.label, 0)
+                Cart.invalidate_counts(user_ids)
+            total += removed
+            if removed:
+                self.stdout.write(
+                    f'✓ Carts #{start}-{start + self.chunk_size - 1}: {removed} {self.verb} '
+                    f'in {time.monotonic() - chunk_started:.2f}s'
+                )
+        return total
+
+    def purge_sessions(self, now):
+        """
+        Delete expired sessions (including ones holding reg_data/reset_data)
+        in batches of chunk_size keys, walking the session_key order.
+        """
+        total = 0
+        after = ''
+        while True:
+            chunk_started = time.monotonic()
+            keys = list(
+                Session.objects.filter(session_key__gt=after, expire_date__lt=now)
+                .order_by('session_key')
+                .values_list('session_key', flat=True)[:self.chunk_size]
+            )
+            if not keys:
+                return total
+            after = keys[-1]
+            if not self.dry_run:
+                Session.objects.filter(session_key__in=keys).delete()
+            total += len(keys)
+            self.stdout.write(
+                f'✓ Sessions up to {after[:8]}…: {len(keys)} {self.verb} in {time.monotonic() - chunk_started:.2f}s'
+            )
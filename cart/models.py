@@ -1,26 +1,163 @@
-from django.db import models
+from decimal import Decimal
+
+from django.core.cache import cache
+from django.db import models, connection, transaction
 from django.contrib.auth.models import User
 from products.models import Product
-from django.db.models import Sum, F
+from django.db.models import Sum, F, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce, Now
+
+CART_COUNT_CACHE_TIMEOUT = 600  # Bounds staleness if an invalidation races a refill
 
 class Cart(models.Model):
     user = models.OneToOneField(User, on_delete=models.CASCADE)
     created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)  # Last change to the cart's items
+
+    # Denormalized totals, updated by every cart mutation so reading them
+    # never needs an aggregate over the items
+    item_count = models.PositiveIntegerField(default=0)
+    subtotal = models.DecimalField(max_digits=12, decimal_places=2, default=0)
     
+    class Meta:
+        indexes = [
+            models.Index(fields=['updated_at']),
+        ]
+
     def __str__(self):
         return f"Cart - {self.user.username}"
     
     def get_total(self):
-        total = self.items.aggregate(
-            total=Sum(F('quantity') * F('product__price'))
-        )['total']
-        return total 
+        return self.subtotal
+
+    def get_totals(self):
+        """Item count and total price"""
+        return self.item_count, self.subtotal
+
+    @staticmethod
+    def count_cache_key(user_id):
+        return f'cart_count:{user_id}'
+
+    @classmethod
+    def get_cached_count(cls, user_id):
+        """Item count for the navbar badge, read from the cache when possible"""
+        key = cls.count_cache_key(user_id)
+        count = cache.get(key)
+        if count is None:
+            count = cls.objects.filter(user_id=user_id).values_list('item_count', flat=True).first() or 0
+            cache.set(key, count, CART_COUNT_CACHE_TIMEOUT)
+        return count
+
+    @classmethod
+    def invalidate_counts(cls, user_ids):
+        """Drop cached badge counts once the current transaction commits"""
+        keys = [cls.count_cache_key(user_id) for user_id in user_ids]
+        if keys:
+            transaction.on_commit(lambda: cache.delete_many(keys))
+
+    @classmethod
+    def apply_delta(cls, cart, count, subtotal):
+        """Shift a cart's totals by a change in its items, atomically in SQL"""
+        cls.objects.filter(pk=cart.pk).update(
+            item_count=F('item_count') + count,
+            subtotal=F('subtotal') + subtotal,
+            updated_at=Now(),
+        )
+        cls.invalidate_counts([cart.user_id])
+
+    @classmethod
+    def recalculate(cls, carts=None, touch=False):
+        """
+        Recompute totals from the items in one UPDATE.
+
+        For changes that cannot be expressed as a delta: product price
+        changes, deleted products and batch edits. carts is a queryset or
+        list of ids; None means every cart. touch=True marks the carts as
+        active, for edits made by their owners.
+        """
+        items = CartItem.objects.filter(cart=OuterRef('pk')).order_by().values('cart')
+        count = items.annotate(count=Sum('quantity')).values('count')
+        total = items.annotate(
+            total=Sum(F('quantity') * F('product__price'), output_field=models.DecimalField())
+        ).values('total')
+
+        queryset = cls.objects.all() if carts is None else cls.objects.filter(pk__in=carts)
+        cls.invalidate_counts(set(queryset.values_list('user_id', flat=True)))
+        extra = {'updated_at': Now()} if touch else {}
+        queryset.update(
+            item_count=Coalesce(Subquery(count), 0),
+            subtotal=Coalesce(Subquery(total), Value(Decimal('0')), output_field=models.DecimalField()),
+            **extra,
+        )
 
 class CartItem(models.Model):
     cart = models.ForeignKey(Cart, on_delete=models.CASCADE, related_name='items')
     product = models.ForeignKey(Product, on_delete=models.CASCADE)
     quantity = models.IntegerField(default=1)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['cart', 'product'], name='unique_cart_product'),
+        ]
+
+    @classmethod
+    def add_quantities(cls, cart, lines):
+        """
+        Add (product_id, quantity) lines to cart in one multi-row upsert.
+
+        INSERT ... ON CONFLICT DO UPDATE increments the existing rows inside
+        the database, so concurrent adds of the same product never lose an
+        increment and no row is read first. The cart totals move by the
+        same amounts.
+        """
+        totals = {}
+        for product_id, quantity in lines:
+            # One row per product: an upsert cannot update the same row twice
+            totals[product_id] = totals.get(product_id, 0) + quantity
+        if not totals:
+            return
+        prices = dict(Product.objects.filter(id__in=list(totals)).values_list('id', 'price'))
+        lines = [(product_id, quantity) for product_id, quantity in totals.items() if product_id in prices]
+        if not lines:
+            return
+
+        table = connection.ops.quote_name(cls._meta.db_table)
+        rows = ', '.join(['(%s, %s, %s)'] * len(lines))
+        with transaction.atomic():
+            with connection.cursor() as cursor:
+                cursor.execute(
+                    f'INSERT INTO {table} (cart_id, product_id, quantity) VALUES {rows} '
+                    f'ON CONFLICT (cart_id, product_id) DO UPDATE SET quantity = {table}.quantity + EXCLUDED.quantity',
+                    [value for product_id, quantity in lines for value in (cart.pk, product_id, quantity)],
+                )
+            Cart.apply_delta(
+                cart,
+                sum(quantity for _, quantity in lines),
+                sum(quantity * prices[product_id] for product_id, quantity in lines),
+            )
     
+    def set_quantity(self, quantity):
+        """
+        Change this line's quantity (0 removes it) and shift the cart totals.
+
+        The delta is taken from the row as locked in the database, not from
+        self.quantity, so an add_quantities() upsert that committed since
+        this item was loaded is not counted twice in the totals.
+        """
+        with transaction.atomic():
+            previous = (
+                CartItem.objects.select_for_update().filter(pk=self.pk).values_list('quantity', flat=True).first()
+            )
+            if previous is None:
+                return  # Already removed by another request
+            if quantity > 0:
+                self.quantity = quantity
+                self.save(update_fields=['quantity'])
+            else:
+                quantity = 0
+                self.delete()
+            Cart.apply_delta(self.cart, quantity - previous, (quantity - previous) * self.product.price)
+
     def get_total_price(self):
         return self.quantity * self.product.price
     
@@ -0,0 +1,34 @@
+from django.db.models.signals import pre_save, post_save, pre_delete, post_delete
+from django.dispatch import receiver
+
+from products.models import Product
+from .models import Cart
+
+
+@receiver(pre_save, sender=Product)
+def remember_price(sender, instance, **kwargs):
+    """Record the old price so carts holding the product can be repriced"""
+    instance._cart_previous_price = None
+    if instance.pk:
+        instance._cart_previous_price = (
+            Product.objects.filter(pk=instance.pk).values_list('price', flat=True).first()
+        )
+
+
+@receiver(post_save, sender=Product)
+def reprice_carts(sender, instance, created, **kwargs):
+    previous = getattr(instance, '_cart_previous_price', None)
+    if not created and previous is not None and previous != instance.price:
+        Cart.recalculate(Cart.objects.filter(items__product=instance))
+
+
+@receiver(pre_delete, sender=Product)
+def remember_carts(sender, instance, **kwargs):
+    """The product's cart lines are cascade-deleted, note whose totals change"""
+    instance._cart_ids = list(Cart.objects.filter(items__product=instance).values_list('id', flat=True))
+
+
+@receiver(post_delete, sender=Product)
+def recount_carts(sender, instance, **kwargs):
+    if getattr(instance, '_cart_ids', None):
+        Cart.recalculate(instance._cart_ids)
@@ -0,0 +1,47 @@
+from .guest import GuestCart
+from .models import CartItem
+
+
+class CartSummary:
+    """
+    Cart lines and totals for one request, loaded with a single query.
+
+    Use CartSummary.for_request(request) so the cart page, checkout and
+    place_order share one load instead of each re-fetching the cart.
+    """
+
+    def __init__(self, items, cart_id=None):
+        self.items = items
+        self.cart_id = cart_id  # None for guests or users without a cart row
+        for item in items:
+            item.line_total = item.quantity * item.product.price
+        self.line_count = len(items)
+        self.item_count = sum(item.quantity for item in items)
+        self.subtotal = sum((item.line_total for item in items), 0)
+
+    def __bool__(self):
+        return bool(self.items)
+
+    def lines(self):
+        """(product_id, quantity) pairs, e.g. for reserving stock"""
+        return [(item.product_id, item.quantity) for item in self.items]
+
+    @classmethod
+    def for_request(cls, request):
+        if not hasattr(request, '_cart_summary'):
+            if request.user.is_authenticated:
+                # Filtering on the user reaches the items without loading the cart
+                items = list(
+                    CartItem.objects.filter(cart__user=request.user)
+                    .select_related('product')
+                    .order_by('id')
+                )
+                request._cart_summary = cls(items, items[0].cart_id if items else None)
+            else:
+                request._cart_summary = cls(GuestCart.from_request(request).items)
+        return request._cart_summary
+
+    @staticmethod
+    def invalidate(request):
+        """Forget the memoized summary after changing the cart mid-request"""
+        request.__dict__.pop('_cart_summary', None)
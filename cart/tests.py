@@ -1,3 +1,77 @@
-from django.test import TestCase
+import json
+from decimal import Decimal
 
-# Create your tests here.
+from django.contrib.auth.models import User
+from django.core.signing import get_cookie_signer
+from django.db import connection
+from django.http import HttpResponse
+from django.test import RequestFactory, TestCase
+from django.test.utils import CaptureQueriesContext
+
+from products.models import Product
+from .guest import GUEST_CART_COOKIE, GUEST_CART_SALT, merge_guest_cart
+from .models import Cart, CartItem
+
+
+class CartTestCase(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user('shopper', password='secret-pass-123')
+        cls.products = [
+            Product.objects.create(name=f'Miel {n}', category='Miel', quantity='1kg', price=Decimal(1000 + n * 250))
+            for n in range(3)
+        ]
+
+    def setUp(self):
+        self.cart = Cart.objects.create(user=self.user)
+
+    def upserts(self, queries):
+        table = CartItem._meta.db_table
+        return [query for query in queries if query['sql'].startswith(f'INSERT INTO "{table}"')]
+
+
+class MergeGuestCartTests(CartTestCase):
+    def guest_request(self, lines):
+        request = RequestFactory().get('/')
+        request.user = self.user
+        signer = get_cookie_signer(salt=GUEST_CART_COOKIE + GUEST_CART_SALT)
+        request.COOKIES[GUEST_CART_COOKIE] = signer.sign(json.dumps(lines))
+        return request
+
+    def test_merges_in_one_upsert(self):
+        first, second, third = self.products
+        CartItem.add_quantities(self.cart, [(first.pk, 1)])
+        request = self.guest_request({first.pk: 2, second.pk: 3, third.pk: 1})
+
+        with CaptureQueriesContext(connection) as context:
+            merge_guest_cart(request, HttpResponse())
+
+        self.assertEqual(len(self.upserts(context.captured_queries)), 1)
+        quantities = dict(CartItem.objects.filter(cart=self.cart).values_list('product_id', 'quantity'))
+        self.assertEqual(quantities, {first.pk: 3, second.pk: 3, third.pk: 1})
+
+
+class AddQuantitiesTests(CartTestCase):
+    def totals(self):
+        self.cart.refresh_from_db()
+        return self.cart.item_count, self.cart.subtotal
+
+    def test_repeated_adds_sum_on_one_row(self):
+        first, second, _ = self.products
+        CartItem.add_quantities(self.cart, [(first.pk, 2)])
+        CartItem.add_quantities(self.cart, [(first.pk, 3), (second.pk, 1)])
+        CartItem.add_quantities(self.cart, [(first.pk, 1), (first.pk, 1)])  # Same product twice in one call
+
+        rows = list(CartItem.objects.filter(cart=self.cart).order_by('product_id').values_list('product_id', 'quantity'))
+        self.assertEqual(rows, [(first.pk, 7), (second.pk, 1)])
+
+        totals = self.totals()
+        self.assertEqual(totals, (8, 7 * first.price + second.price))
+        Cart.recalculate([self.cart.pk])
+        self.assertEqual(self.totals(), totals)
+
+    def test_unknown_products_are_ignored(self):
+        first = self.products[0]
+        CartItem.add_quantities(self.cart, [(first.pk, 1), (999999, 4)])
+        self.assertEqual(list(CartItem.objects.filter(cart=self.cart).values_list('product_id', flat=True)), [first.pk])
+        self.assertEqual(self.totals(), (1, first.price))
@@ -8,4 +8,6 @@ urlpatterns = [
     path('add/<int:product_id>/', views.add_to_cart, name='add_to_cart'),
     path('remove/<int:item_id>/', views.remove_from_cart, name='remove_from_cart'),
     path('update/<int:item_id>/', views.update_cart_item, name='update_cart_item'),  # ADD THIS
+    path('batch/', views.batch_update, name='batch_update'),
+    path('count/', views.get_cart_count, name='cart_count'),
 ]
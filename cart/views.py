@@ -1,72 +1,128 @@
+import json
+
 from django.shortcuts import render, redirect, get_object_or_404
-from django.contrib.auth.decorators import login_required
 from django.http import JsonResponse
+from django.views.decorators.http import require_POST
 from products.models import Product
 from .models import Cart, CartItem
+from .guest import GuestCart
+from .summary import CartSummary
+from .batch import CartBatchError, parse_changes, parse_quick_order, apply_changes, apply_guest_changes, serialize_cart
 
-@login_required
 def add_to_cart(request, product_id):
     """Add product to cart - AJAX enabled"""
     product = get_object_or_404(Product, id=product_id)
-    cart, created = Cart.objects.get_or_create(user=request.user)
-    
-    cart_item, created = CartItem.objects.get_or_create(
-        cart=cart,
-        product=product
-    )
-    
-    if not created:
-        cart_item.quantity += 1
-        cart_item.save()
-    
+
+    if request.user.is_authenticated:
+        cart, created = Cart.objects.get_or_create(user=request.user)
+        CartItem.add_quantities(cart, [(product.id, 1)])
+        cart.refresh_from_db(fields=['item_count', 'subtotal'])
+        cart_count, cart_total = cart.get_totals()
+    else:
+        # Guests keep their cart in a signed cookie, no database writes
+        cart = GuestCart.from_request(request)
+        if not cart.add(product.id):
+            if request.headers.get('X-Requested-With') == 'XMLHttpRequest':
+                return JsonResponse({'success': False, 'message': 'Your cart is full'}, status=400)
+            return redirect('cart:view_cart')
+        cart_count, cart_total = cart.get_totals()
+
     # Check if AJAX request
     if request.headers.get('X-Requested-With') == 'XMLHttpRequest':
-        cart_count = sum(item.quantity for item in cart.items.all())
-        return JsonResponse({
+        response = JsonResponse({
             'success': True,
             'message': f'{product.name} added to cart!',
             'cart_count': cart_count,
-            'cart_total': float(cart.get_total())
+            'cart_total': float(cart_total)
         })
-    
-    # Fallback for non-AJAX
-    return redirect('cart:view_cart')
+    else:
+        # Fallback for non-AJAX
+        response = redirect('cart:view_cart')
+
+    if isinstance(cart, GuestCart):
+        cart.save(response)
+    return response
 
-@login_required
 def view_cart(request):
-    cart, created = Cart.objects.get_or_create(user=request.user)
-    cart_items = cart.items.all()
-    
-    total = sum(item.get_total_price() for item in cart_items)
-    
+    summary = CartSummary.for_request(request)
+
     return render(request, 'cart/cart.html', {
-        'cart_items': cart_items,
-        'total': total
+        'cart_items': summary.items,
+        'total': summary.subtotal
     })
 
-@login_required
 def remove_from_cart(request, item_id):
-    cart_item = get_object_or_404(CartItem, id=item_id, cart__user=request.user)
-    cart_item.delete()
+    if not request.user.is_authenticated:
+        # Guest cart lines are addressed by product id
+        cart = GuestCart.from_request(request)
+        cart.remove(item_id)
+        response = redirect('cart:view_cart')
+        cart.save(response)
+        return response
+
+    cart_item = get_object_or_404(CartItem.objects.select_related('product', 'cart'), id=item_id, cart__user=request.user)
+    cart_item.set_quantity(0)
     return redirect('cart:view_cart')
 
-@login_required
 def update_cart_item(request, item_id):
     if request.method == 'POST':
-        cart_item = get_object_or_404(CartItem, id=item_id, cart__user=request.user)
         quantity = int(request.POST.get('quantity', 1))
-        
-        if quantity > 0:
-            cart_item.quantity = quantity
-            cart_item.save()
-        else:
-            cart_item.delete()
-    
+
+        if not request.user.is_authenticated:
+            cart = GuestCart.from_request(request)
+            cart.update(item_id, quantity)
+            response = redirect('cart:view_cart')
+            cart.save(response)
+            return response
+
+        cart_item = get_object_or_404(CartItem.objects.select_related('product', 'cart'), id=item_id, cart__user=request.user)
+        cart_item.set_quantity(max(quantity, 0))
+
     return redirect('cart:view_cart')
 
-@login_required
 def get_cart_count(request):
     """API endpoint to get cart count"""
-    cart, created = Cart.objects.get_or_create(user=request.user)
-    cart_count = sum(item.quantity for item in cart.items.all())
-    return JsonResponse({'cart_count': cart_count})
\ No newline at end of file
+    if not request.user.is_authenticated:
+        return JsonResponse({'cart_count': GuestCart.from_request(request).get_count()})
+    return JsonResponse({'cart_count': Cart.get_cached_count(request.user.id)})
+
+@require_POST
+def batch_update(request):
+    """
+    Apply many cart changes in one request - JSON API.
+
+    Body: {"changes": [{"product_id": 1, "quantity": 3}, ...],
+           "quick_order": "miel-sidr 12\nmiel-jujubier 6"}
+    changes set line quantities (0 removes), quick_order lines are added
+    to the cart. Returns the recomputed cart.
+    """
+    try:
+        data = json.loads(request.body or b'{}')
+        if not isinstance(data, dict) or not isinstance(data.get('quick_order', ''), str):
+            raise CartBatchError('invalid request body')
+        set_quantities = parse_changes(data.get('changes', []))
+        add_quantities, errors = parse_quick_order(data.get('quick_order', ''))
+    except (ValueError, CartBatchError) as e:
+        return JsonResponse({'success': False, 'message': str(e)}, status=400)
+
+    if request.user.is_authenticated:
+        cart, created = Cart.objects.get_or_create(user=request.user)
+        apply_changes(cart, set_quantities, add_quantities)
+        cart.refresh_from_db(fields=['item_count', 'subtotal'])
+        response = JsonResponse({
+            'success': True,
+            'errors': errors,
+            **serialize_cart(list(cart.items.select_related('product')), cart),
+        })
+    else:
+        cart = GuestCart.from_request(request)
+        if not apply_guest_changes(cart, set_quantities, add_quantities):
+            return JsonResponse({'success': False, 'message': 'Your cart is full'}, status=400)
+        response = JsonResponse({
+            'success': True,
+            'errors': errors,
+            **serialize_cart(cart.items, cart),
+        })
+        cart.save(response)
+
+    return response
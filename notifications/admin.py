@@ -0,0 +1,24 @@
+from django.contrib import admin
+from django.utils import timezone
+
+from .models import SmsOutbox
+
+
+@admin.register(SmsOutbox)
+class SmsOutboxAdmin(admin.ModelAdmin):
+    list_display = ['id', 'phone', 'kind', 'status', 'attempts', 'created_at', 'sent_at']
+    list_filter = ['status', 'kind', 'created_at']
+    search_fields = ['phone', 'body', 'provider_id']
+    readonly_fields = [
+        'phone', 'body', 'kind', 'priority', 'attempts', 'next_attempt_at',
+        'claimed_at', 'sent_at', 'provider_id', 'last_error', 'created_at',
+    ]
+    actions = ['retry']
+
+    def retry(self, request, queryset):
+        """Send failed messages again on the worker's next round"""
+        updated = queryset.filter(status=SmsOutbox.FAILED).update(
+            status=SmsOutbox.PENDING, attempts=0, next_attempt_at=timezone.now(),
+        )
+        self.message_user(request, f'{updated} SMS queued for retry 🔁')
+    retry.short_description = '🔁 Retry selected failed SMS'
@@ -0,0 +1,240 @@
+import logging
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+
+from django.conf import settings
+from django.utils import timezone
+from django.utils.module_loading import import_string
+
+logger = logging.getLogger(__name__)
+
+TIMEOUT = 10  # Seconds to wait on a provider API call
+
+
+class SmsError(Exception):
+    """A message could not be sent; permanent errors are not retried"""
+
+    def __init__(self, message, permanent=False):
+        super().__init__(message)
+        self.permanent = permanent
+
+
+class RateLimiter:
+    """Space out calls to at most per_second, shared by the sending threads"""
+
+    def __init__(self, per_second=None):
+        self.interval = 1 / per_second if per_second else 0
+        self.next_at = time.monotonic()
+        self._lock = threading.Lock()
+
+    def wait(self):
+        if not self.interval:
+            return
+        with self._lock:
+            now = time.monotonic()
+            at = max(self.next_at, now)
+            self.next_at = at + self.interval
+        time.sleep(at - now)
+
+
+class BaseBackend:
+    """
+    Sends SMS through one provider.
+
+    A backend is meant to live as long as its process (see get_backend):
+    provider clients are created once per sending thread and keep their
+    HTTP connections open, and send_many() fans a batch out over a thread
+    pool throttled to the provider's rate limit.
+    """
+    # Messages per second the provider accepts, None for no limit
+    max_per_second = None
+    max_concurrency = 4
+
+    def __init__(self, max_per_second=None, max_concurrency=None):
+        if max_per_second:
+            self.max_per_second = max_per_second
+        if max_concurrency:
+            self.max_concurrency = max_concurrency
+        self.limiter = RateLimiter(self.max_per_second)
+        self._local = threading.local()
+        self._pool = None
+        self._pool_lock = threading.Lock()
+
+    def send(self, phone, body):
+        """Send one SMS and return the provider's message id"""
+        raise NotImplementedError
+
+    def send_many(self, messages):
+        """
+        Send (phone, body) pairs concurrently.
+
+        Returns one (provider_id, error) pair per message, in order; a
+        failed message does not stop the others.
+        """
+        def send_one(message):
+            self.limiter.wait()
+            try:
+                return self.send(*message), None
+            except Exception as e:
+                return None, e
+
+        return list(self.pool.map(send_one, messages))
+
+    @property
+    def pool(self):
+        if self._pool is None:
+            with self._pool_lock:
+                if self._pool is None:
+                    self._pool = ThreadPoolExecutor(self.max_concurrency, thread_name_prefix='sms')
+        return self._pool
+
+    def client(self):
+        """This thread's provider client, created on first use and then reused"""
+        client = getattr(self._local, 'client', None)
+        if client is None:
+            client = self._local.client = self.make_client()
+        return client
+
+    def make_client(self):
+        return None
+
+    def close(self):
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
+
+
+class ConsoleBackend(BaseBackend):
+    """Print messages instead of sending them, for local development"""
+
+    def __init__(self, stream=None, **kwargs):
+        super().__init__(**kwargs)
+        self.stream = stream or sys.stdout
+        self._lock = threading.Lock()
+
+    def send(self, phone, body):
+        with self._lock:
+            self.stream.write(f"📱 SMS to {phone}: {body}\n")
+            self.stream.flush()
+        return ''
+
+
+class FileBackend(ConsoleBackend):
+    """Append messages to SMS_FILE_PATH"""
+
+    def __init__(self, **kwargs):
+        path = getattr(settings, 'SMS_FILE_PATH', os.path.join(settings.BASE_DIR, 'sms.log'))
+        super().__init__(open(path, 'a', encoding='utf-8'), **kwargs)
+
+    def send(self, phone, body):
+        with self._lock:
+            self.stream.write(f"[{timezone.now():%Y-%m-%d %H:%M:%S}] {phone}: {body}\n")
+            self.stream.flush()
+        return ''
+
+
+class LocMemBackend(BaseBackend):
+    """Keep messages in LocMemBackend.outbox, for tests"""
+    outbox = []
+    _lock = threading.Lock()
+
+    def send(self, phone, body):
+        with self._lock:
+            self.outbox.append((phone, body))
+            return str(len(self.outbox))
+
+
+class TwilioBackend(BaseBackend):
+    max_per_second = 1  # Twilio's default for a single long code number
+
+    def make_client(self):
+        from twilio.http.http_client import TwilioHttpClient
+        from twilio.rest import Client
+
+        http_client = TwilioHttpClient(pool_connections=True, timeout=TIMEOUT)
+        if getattr(settings, 'SMS_API_KEY_SID', ''):
+            # Using API Key (more secure)
+            return Client(
+                settings.SMS_API_KEY_SID, settings.SMS_API_KEY_SECRET, settings.SMS_ACCOUNT_SID,
+                http_client=http_client,
+            )
+        return Client(settings.SMS_ACCOUNT_SID, settings.SMS_AUTH_TOKEN, http_client=http_client)
+
+    def send(self, phone, body):
+        from twilio.base.exceptions import TwilioRestException
+
+        try:
+            message = self.client().messages.create(body=body, from_=settings.SMS_TWILIO_NUMBER, to=phone)
+        except TwilioRestException as e:
+            # 4xx (bad number, unverified number...) will fail the same way again
+            raise SmsError(str(e), permanent=400 <= (e.status or 0) < 500 and e.status != 429) from e
+        return message.sid
+
+
+class AfricasTalkingBackend(BaseBackend):
+    """
+    Africa's Talking messaging API.
+
+    Called over a pooled requests.Session rather than through the
+    africastalking SDK, which opens a new connection for every request.
+    """
+    max_per_second = 10
+    API_URL = 'https://api.africastalking.com/version1/messaging'
+    SANDBOX_URL = 'https://api.sandbox.africastalking.com/version1/messaging'
+    # Recipient status codes that will not succeed on a retry
+    PERMANENT_CODES = {403, 406}  # InvalidPhoneNumber, UserInBlacklist
+
+    def make_client(self):
+        import requests
+
+        session = requests.Session()
+        session.headers.update({'apiKey': settings.SMS_AT_API_KEY, 'Accept': 'application/json'})
+        return session
+
+    def send(self, phone, body):
+        import requests
+
+        username = settings.SMS_AT_USERNAME
+        data = {'username': username, 'to': phone, 'message': body}
+        if getattr(settings, 'SMS_AT_SENDER_ID', ''):
+            data['from'] = settings.SMS_AT_SENDER_ID
+        url = self.SANDBOX_URL if username == 'sandbox' else self.API_URL
+        try:
+            response = self.client().post(url, data=data, timeout=TIMEOUT)
+        except requests.RequestException as e:
+            raise SmsError(str(e)) from e
+        if response.status_code >= 400:
+            raise SmsError(
+                f"{response.status_code}: {response.text[:200]}",
+                permanent=response.status_code in (400, 401, 403),
+            )
+
+        result = response.json()['SMSMessageData']
+        if not result['Recipients']:
+            raise SmsError(result.get('Message', 'No recipients accepted'))
+        recipient = result['Recipients'][0]
+        if recipient['status'] != 'Success':
+            raise SmsError(recipient['status'], permanent=recipient.get('statusCode') in self.PERMANENT_CODES)
+        return recipient['messageId']
+
+
+@lru_cache(maxsize=None)
+def _shared_backend(path):
+    return import_string(path)()
+
+
+def get_backend(path=None, **kwargs):
+    """
+    The backend named by path or settings.SMS_BACKEND.
+
+    Without options the instance is shared by the whole process, so its
+    clients and connections are reused across calls.
+    """
+    path = path or settings.SMS_BACKEND
+    if kwargs:
+        return import_string(path)(**kwargs)
+    return _shared_backend(path)
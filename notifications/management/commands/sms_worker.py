@@ -0,0 +1,34 @@
+from django.core.management.base import BaseCommand
+
+from notifications import outbox
+from notifications.backends import get_backend
+
+
+class Command(BaseCommand):
+    help = 'Send queued SMS from the outbox, retrying failures with backoff'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--concurrency', type=int, default=4, help='Messages sent in parallel')
+        parser.add_argument('--batch-size', type=int, default=50, help='Messages claimed per round')
+        parser.add_argument('--rate', type=float, help="Messages per second (default: the backend's limit)")
+        parser.add_argument('--once', action='store_true', help='Exit once the outbox is empty')
+
+    def handle(self, *args, **options):
+        backend = get_backend(max_concurrency=options['concurrency'], max_per_second=options['rate'])
+        self.stdout.write(f'Sending SMS with {type(backend).__name__}')
+
+        def log(sent, failed):
+            self.stdout.write(f'✓ {sent} sent' + (f', {failed} failed' if failed else ''))
+
+        try:
+            sent, failed = outbox.run(
+                backend,
+                batch_size=options['batch_size'],
+                once=options['once'],
+                log=log,
+            )
+        except KeyboardInterrupt:
+            return
+        finally:
+            backend.close()
+        self.stdout.write(self.style.SUCCESS(f'\n✓ Outbox empty: {sent} sent, {failed} failed'))
@@ -0,0 +1,41 @@
+# Generated by Django 5.2.8 on 2026-10-18 15:00
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SmsOutbox',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('phone', models.CharField(max_length=20)),
+                ('body', models.TextField()),
+                ('kind', models.CharField(blank=True, help_text='e.g. verification, order_shipped', max_length=50)),
+                ('priority', models.PositiveSmallIntegerField(default=5)),
+                ('status', models.CharField(choices=[('pending', 'Pending'), ('sending', 'Sending'), ('sent', 'Sent'), ('failed', 'Failed')], default='pending', max_length=10)),
+                ('attempts', models.PositiveSmallIntegerField(default=0)),
+                ('next_attempt_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('claimed_at', models.DateTimeField(blank=True, null=True)),
+                ('sent_at', models.DateTimeField(blank=True, null=True)),
+                ('provider_id', models.CharField(blank=True, max_length=100)),
+                ('last_error', models.TextField(blank=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                'verbose_name': 'SMS',
+                'verbose_name_plural': 'SMS outbox',
+                'indexes': [
+                    models.Index(fields=['status', 'priority', 'next_attempt_at'], name='notificatio_status_793205_idx'),
+                    models.Index(fields=['created_at'], name='notificatio_created_cc8d40_idx'),
+                ],
+            },
+        ),
+    ]
@@ -0,0 +1,69 @@
+from django.db import models
+from django.utils import timezone
+
+from .phone import clean_phone_number
+
+
+class SmsOutbox(models.Model):
+    """
+    SMS waiting to be sent by the sms_worker command.
+
+    Requests only insert rows here, in the same transaction as whatever
+    the message is about, so a slow or failing SMS provider never holds
+    up a request and a rolled-back change never sends a message.
+    """
+    PENDING = 'pending'
+    SENDING = 'sending'
+    SENT = 'sent'
+    FAILED = 'failed'
+    STATUS_CHOICES = [
+        (PENDING, 'Pending'),
+        (SENDING, 'Sending'),
+        (SENT, 'Sent'),
+        (FAILED, 'Failed'),
+    ]
+
+    # Lower is sent first
+    PRIORITY_HIGH = 0  # Verification codes, the user is waiting for them
+    PRIORITY_NORMAL = 5
+
+    phone = models.CharField(max_length=20)
+    body = models.TextField()
+    kind = models.CharField(max_length=50, blank=True, help_text="e.g. verification, order_shipped")
+    priority = models.PositiveSmallIntegerField(default=PRIORITY_NORMAL)
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default=PENDING)
+    attempts = models.PositiveSmallIntegerField(default=0)
+    next_attempt_at = models.DateTimeField(default=timezone.now)
+    claimed_at = models.DateTimeField(null=True, blank=True)
+    sent_at = models.DateTimeField(null=True, blank=True)
+    provider_id = models.CharField(max_length=100, blank=True)
+    last_error = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        verbose_name = "SMS"
+        verbose_name_plural = "SMS outbox"
+        indexes = [
+            # The worker's claim query
+            models.Index(fields=['status', 'priority', 'next_attempt_at']),
+            models.Index(fields=['created_at']),
+        ]
+
+    def __str__(self):
+        return f"{self.kind or 'SMS'} to {self.phone} ({self.status})"
+
+    @classmethod
+    def build(cls, phone, body, kind='', priority=PRIORITY_NORMAL):
+        return cls(phone=clean_phone_number(phone), body=body, kind=kind, priority=priority)
+
+    @classmethod
+    def enqueue(cls, phone, body, kind='', priority=PRIORITY_NORMAL):
+        """Queue one SMS, call inside the transaction of the change it reports"""
+        message = cls.build(phone, body, kind, priority)
+        message.save()
+        return message
+
+    @classmethod
+    def enqueue_many(cls, messages):
+        """Queue SMS built with SmsOutbox.build() in one INSERT"""
+        return cls.objects.bulk_create(messages)
@@ -0,0 +1,101 @@
+import logging
+import time
+from datetime import timedelta
+
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from .backends import SmsError
+from .models import SmsOutbox
+
+logger = logging.getLogger(__name__)
+
+MAX_ATTEMPTS = 5
+BACKOFF_BASE = 30  # Seconds before the first retry, doubled after each failure
+BACKOFF_MAX = 60 * 60
+LEASE = timedelta(minutes=5)  # A claimed row is given back if its worker died
+
+
+def backoff(attempts):
+    return timedelta(seconds=min(BACKOFF_BASE * 2 ** (attempts - 1), BACKOFF_MAX))
+
+
+def claim(batch_size):
+    """
+    Mark up to batch_size due messages as sending and return them.
+
+    SKIP LOCKED lets several workers claim from the table at once without
+    waiting on, or double-sending, each other's rows.
+    """
+    now = timezone.now()
+    with transaction.atomic():
+        messages = list(
+            SmsOutbox.objects.select_for_update(skip_locked=True)
+            .filter(
+                Q(status=SmsOutbox.PENDING, next_attempt_at__lte=now)
+                | Q(status=SmsOutbox.SENDING, claimed_at__lt=now - LEASE)
+            )
+            .order_by('priority', 'next_attempt_at', 'id')[:batch_size]
+        )
+        SmsOutbox.objects.filter(pk__in=[message.pk for message in messages]).update(
+            status=SmsOutbox.SENDING, claimed_at=now,
+        )
+    return messages
+
+
+def dispatch(messages, backend):
+    """Send claimed messages through backend and record the outcome of each"""
+    results = backend.send_many([(message.phone, message.body) for message in messages])
+
+    sent, failed = [], []
+    now = timezone.now()
+    for message, (provider_id, error) in zip(messages, results):
+        message.attempts += 1
+        message.claimed_at = None
+        if error is None:
+            message.status = SmsOutbox.SENT
+            message.sent_at = timezone.now()
+            message.provider_id = provider_id or ''
+            message.last_error = ''
+            sent.append(message)
+            continue
+
+        logger.error(f"SMS #{message.pk} to {message.phone} failed: {error}")
+        message.last_error = str(error)
+        permanent = isinstance(error, SmsError) and error.permanent
+        if permanent or message.attempts >= MAX_ATTEMPTS:
+            message.status = SmsOutbox.FAILED
+        else:
+            message.status = SmsOutbox.PENDING
+            message.next_attempt_at = now + backoff(message.attempts)
+        failed.append(message)
+
+    SmsOutbox.objects.bulk_update(
+        sent, ['status', 'attempts', 'claimed_at', 'sent_at', 'provider_id', 'last_error'],
+    )
+    SmsOutbox.objects.bulk_update(
+        failed, ['status', 'attempts', 'claimed_at', 'next_attempt_at', 'last_error'],
+    )
+    return len(sent), len(failed)
+
+
+def run(backend, batch_size=50, once=False, idle_sleep=2.0, log=None):
+    """
+    Send queued messages until interrupted, or until the queue is empty
+    when once is set. Returns (sent, failed) totals.
+    """
+    total_sent = total_failed = 0
+    while True:
+        messages = claim(batch_size)
+        if not messages:
+            if once:
+                break
+            time.sleep(idle_sleep)
+            continue
+        sent, failed = dispatch(messages, backend)
+        total_sent += sent
+        total_failed += failed
+        if log:
+            log(sent, failed)
+    return total_sent, total_failed
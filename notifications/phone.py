@@ -0,0 +1,14 @@
+def clean_phone_number(phone):
+    """Convert Algerian phone to +213XXXXXXXXX format"""
+    phone = str(phone).replace(' ', '').replace('-', '').replace('(', '').replace(')', '')
+
+    if phone.startswith('00213'):
+        phone = '+' + phone[2:]
+    elif phone.startswith('0'):
+        phone = '+213' + phone[1:]
+    elif phone.startswith('213'):
+        phone = '+' + phone
+    elif not phone.startswith('+'):
+        phone = '+213' + phone
+
+    return phone
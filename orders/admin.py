@@ -1,13 +1,18 @@
-from django.contrib import admin
+from django import forms
+from django.contrib import admin, messages
 from django.urls import path
 from django.shortcuts import render, get_object_or_404
-from django.http import HttpResponse
-from .models import Order, OrderItem, ShippingRate, StopDesk
+from django.http import HttpResponse, StreamingHttpResponse
+from django.utils import timezone
+from .models import Order, OrderItem, OrderStatusEvent, ShippingRate, StopDesk
+from . import export, status
 from django.urls import reverse
 from django.utils.html import format_html
 from django.utils.safestring import mark_safe
-from django.conf import settings
-from twilio.rest import Client
+from django.db import transaction
+from django.db.models import Sum
+from notifications.models import SmsOutbox
+from products.inventory import release_stock
 import logging
 
 # Set up logging
@@ -23,147 +28,58 @@ class OrderItemInline(admin.TabularInline):
         return f"{obj.get_total_price()} DZD"
     get_total_price.short_description = 'Total'
 
-# SMS Helper Functions
-def clean_phone_number(phone):
-    """Convert Algerian phone to +213XXXXXXXXX format"""
-    phone = str(phone).replace(' ', '').replace('-', '').replace('(', '').replace(')', '')
-    
-    if phone.startswith('00213'):
-        phone = '+' + phone[2:]
-    elif phone.startswith('0'):
-        phone = '+213' + phone[1:]
-    elif phone.startswith('213'):
-        phone = '+' + phone
-    elif not phone.startswith('+'):
-        phone = '+213' + phone
+class OrderStatusEventInline(admin.TabularInline):
+    model = OrderStatusEvent
+    extra = 0
+    readonly_fields = ('previous_status', 'status', 'changed_by', 'created_at')
+    can_delete = False
     
-    return phone
+    def has_add_permission(self, request, obj=None):
+        return False
 
-def get_twilio_client():
-    """Create and return Twilio client using settings from .env"""
-    try:
-        # Check if using API Key or Auth Token
-        if hasattr(settings, 'SMS_API_KEY_SID') and settings.SMS_API_KEY_SID:
-            # Using API Key (more secure)
-            client = Client(
-                settings.SMS_API_KEY_SID,
-                settings.SMS_API_KEY_SECRET,
-                settings.SMS_ACCOUNT_SID
-            )
-            logger.info("Twilio client created with API Key")
-        else:
-            # Using Auth Token
-            client = Client(
-                settings.SMS_ACCOUNT_SID,
-                settings.SMS_AUTH_TOKEN
-            )
-            logger.info("Twilio client created with Auth Token")
-        return client
-    except Exception as e:
-        logger.error(f"Failed to create Twilio client: {e}")
-        return None
+# SMS messages, queued in the outbox and sent by the sms_worker command
+def order_shipped_sms(order):
+    body = f"🚚 Good news! Your Bee House order #{order.id} has been shipped!"
+    if order.tracking_number:
+        body += f" Track it: {order.tracking_number}"
+    return SmsOutbox.build(order.phone, body, kind='order_shipped')
 
-def send_order_shipped(phone, order_id, tracking_number=None):
-    """Send SMS when order is shipped"""
-    
-    # Check if SMS is enabled
-    if not getattr(settings, 'SMS_ENABLED', True):
-        logger.info(f"SMS disabled - Would send shipped notification for order #{order_id} to {phone}")
-        print(f"📱 SMS DISABLED - Order #{order_id} shipped notification for {phone}")
-        if tracking_number:
-            print(f"   Tracking: {tracking_number}")
-        return True
-    
-    try:
-        client = get_twilio_client()
-        if not client:
-            logger.error("Failed to create Twilio client")
-            return False
-        
-        phone = clean_phone_number(phone)
-        
-        message_body = f"🚚 Good news! Your Bee House order #{order_id} has been shipped!"
-        if tracking_number:
-            message_body += f" Track it: {tracking_number}"
-        
-        message = client.messages.create(
-            body=message_body,
-            from_=settings.SMS_TWILIO_NUMBER,
-            to=phone
-        )
-        
-        logger.info(f"Shipped SMS sent successfully to {phone}. SID: {message.sid}")
-        return True
-        
-    except Exception as e:
-        logger.error(f"SMS Error (shipped): {e}")
-        print(f"❌ SMS Error: {e}")
-        return False
+def order_cancelled_sms(order):
+    return SmsOutbox.build(
+        order.phone,
+        f"❌ Your Bee House order #{order.id} has been cancelled. Contact us if you have questions.",
+        kind='order_cancelled',
+    )
 
-def send_order_cancelled(phone, order_id):
-    """Send SMS when order is cancelled"""
-    
-    # Check if SMS is enabled
-    if not getattr(settings, 'SMS_ENABLED', True):
-        logger.info(f"SMS disabled - Would send cancelled notification for order #{order_id} to {phone}")
-        print(f"📱 SMS DISABLED - Order #{order_id} cancelled notification for {phone}")
-        return True
-    
-    try:
-        client = get_twilio_client()
-        if not client:
-            logger.error("Failed to create Twilio client")
-            return False
-        
-        phone = clean_phone_number(phone)
-        
-        message = client.messages.create(
-            body=f"❌ Your Bee House order #{order_id} has been cancelled. Contact us if you have questions.",
-            from_=settings.SMS_TWILIO_NUMBER,
-            to=phone
-        )
-        
-        logger.info(f"Cancelled SMS sent successfully to {phone}. SID: {message.sid}")
-        return True
-        
-    except Exception as e:
-        logger.error(f"SMS Error (cancelled): {e}")
-        print(f"❌ SMS Error: {e}")
-        return False
+def order_delivered_sms(order):
+    return SmsOutbox.build(
+        order.phone,
+        f"✅ Your Bee House order #{order.id} has been delivered! Enjoy your products! 🐝",
+        kind='order_delivered',
+    )
 
-def send_order_delivered(phone, order_id):
-    """Send SMS when order is delivered"""
-    
-    # Check if SMS is enabled
-    if not getattr(settings, 'SMS_ENABLED', True):
-        logger.info(f"SMS disabled - Would send delivered notification for order #{order_id} to {phone}")
-        print(f"📱 SMS DISABLED - Order #{order_id} delivered notification for {phone}")
-        return True
-    
-    try:
-        client = get_twilio_client()
-        if not client:
-            logger.error("Failed to create Twilio client")
-            return False
-        
-        phone = clean_phone_number(phone)
-        
-        message = client.messages.create(
-            body=f"✅ Your Bee House order #{order_id} has been delivered! Enjoy your products! 🐝",
-            from_=settings.SMS_TWILIO_NUMBER,
-            to=phone
-        )
-        
-        logger.info(f"Delivered SMS sent successfully to {phone}. SID: {message.sid}")
-        return True
-        
-    except Exception as e:
-        logger.error(f"SMS Error (delivered): {e}")
-        print(f"❌ SMS Error: {e}")
-        return False
+STATUS_SMS = {
+    'shipped': order_shipped_sms,
+    'delivered': order_delivered_sms,
+    'cancelled': order_cancelled_sms,
+}
+
+class OrderAdminForm(forms.ModelForm):
+    """Only offers the statuses Order.TRANSITIONS allows from the current one"""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        order = self.instance
+        if order.pk and 'status' in self.fields:
+            self.fields['status'].choices = [
+                (value, label) for value, label in self.fields['status'].choices
+                if value == order.status or order.can_transition(value)
+            ]
 
 @admin.register(Order)
 class OrderAdmin(admin.ModelAdmin):
+    form = OrderAdminForm
+    
     list_display = [
         'id',
         'user',
@@ -181,6 +97,7 @@ class OrderAdmin(admin.ModelAdmin):
     search_fields = ['id', 'user__username', 'full_name', 'phone']
     
     readonly_fields = [
+        'id',
         'user',
         'created_at',
         'updated_at',
@@ -191,7 +108,7 @@ class OrderAdmin(admin.ModelAdmin):
         'order_details_summary'
     ]
     
-    inlines = [OrderItemInline]
+    inlines = [OrderItemInline, OrderStatusEventInline]
     
     fieldsets = (
         ('Order Information', {
@@ -281,103 +198,110 @@ class OrderAdmin(admin.ModelAdmin):
     order_details_summary.short_description = 'Order Items'
     
     # ========== Actions ==========
-    actions = ['mark_as_processing', 'mark_as_shipped', 'mark_as_delivered', 'mark_as_cancelled']
+    actions = [
+        'mark_as_processing', 'mark_as_shipped', 'mark_as_delivered', 'mark_as_cancelled',
+        'export_csv', 'export_jsonl', 'export_courier_manifest',
+    ]
+    
+    def save_model(self, request, obj, form, change):
+        """Save the form, applying a status edit like the actions do"""
+        if not (change and 'status' in form.changed_data):
+            super().save_model(request, obj, form, change)
+            return
+        
+        new_status = obj.status
+        with transaction.atomic():
+            obj.status = form.initial['status']
+            super().save_model(request, obj, form, change)
+            orders, queued = self.apply_transition(
+                request, Order.objects.filter(pk=obj.pk), new_status, STATUS_SMS.get(new_status)
+            )
+        if orders:
+            obj.status = new_status
+            if queued:
+                self.message_user(request, f'{queued} SMS queued 📨')
+        else:
+            # Changed by someone else since the form was loaded
+            self.message_user(
+                request,
+                f'Status not changed: the order left {form.initial["status"]} while you were editing it',
+                level=messages.WARNING,
+            )
+    
+    def apply_transition(self, request, queryset, new_status, sms=None):
+        """
+        Move the selection to new_status where allowed, restocking newly
+        cancelled orders and queueing sms for each changed order.
+        Returns (changed orders, number of SMS queued).
+        """
+        with transaction.atomic():
+            orders = status.transition(queryset, new_status, request.user)
+            
+            if new_status == 'cancelled':
+                # Put the items of newly cancelled orders back in stock
+                released = (
+                    OrderItem.objects.filter(order__in=orders)
+                    .values('product_id')
+                    .annotate(quantity=Sum('quantity'))
+                )
+                release_stock((row['product_id'], row['quantity']) for row in released)
+            
+            # Queued with the status change, sent by the sms_worker command
+            queued = len(SmsOutbox.enqueue_many([sms(order) for order in orders])) if sms else 0
+        return orders, queued
+    
+    def transition(self, request, queryset, new_status, label, sms=None):
+        """Apply a status change to the selection and report what happened"""
+        orders, queued = self.apply_transition(request, queryset, new_status, sms)
+        
+        msg = f'{len(orders)} order(s) marked as {label}'
+        if sms:
+            msg += f' | {queued} SMS queued 📨'
+        skipped = queryset.count() - len(orders)
+        if skipped:
+            msg += f' | {skipped} skipped (not allowed from their current status)'
+        self.message_user(request, msg)
     
     def mark_as_processing(self, request, queryset):
         """Mark orders as processing"""
-        updated = queryset.update(status='processing')
-        self.message_user(request, f'{updated} order(s) marked as Processing ⏳')
+        self.transition(request, queryset, 'processing', 'Processing ⏳')
     mark_as_processing.short_description = '⏳ Mark selected as Processing'
     
     def mark_as_shipped(self, request, queryset):
-        """Mark orders as shipped and send SMS notification"""
-        updated = 0
-        sms_sent = 0
-        sms_failed = 0
-        
-        for order in queryset:
-            # Update status
-            order.status = 'shipped'
-            order.save()
-            updated += 1
-            
-            # Send SMS
-            if send_order_shipped(order.phone, order.id, order.tracking_number):
-                sms_sent += 1
-            else:
-                sms_failed += 1
-        
-        # Build message
-        msg = f'{updated} order(s) marked as Shipped 🚚'
-        if getattr(settings, 'SMS_ENABLED', True):
-            msg += f' | {sms_sent} SMS sent ✅'
-            if sms_failed > 0:
-                msg += f' | {sms_failed} SMS failed ❌'
-        else:
-            msg += ' | SMS notifications disabled in settings'
-        
-        self.message_user(request, msg)
+        """Mark orders as shipped and queue SMS notifications"""
+        self.transition(request, queryset, 'shipped', 'Shipped 🚚', order_shipped_sms)
     mark_as_shipped.short_description = '🚚 Mark selected as Shipped (Send SMS)'
     
     def mark_as_delivered(self, request, queryset):
-        """Mark orders as delivered and send SMS notification"""
-        updated = 0
-        sms_sent = 0
-        sms_failed = 0
-        
-        for order in queryset:
-            # Update status
-            order.status = 'delivered'
-            order.save()
-            updated += 1
-            
-            # Send SMS
-            if send_order_delivered(order.phone, order.id):
-                sms_sent += 1
-            else:
-                sms_failed += 1
-        
-        # Build message
-        msg = f'{updated} order(s) marked as Delivered ✅'
-        if getattr(settings, 'SMS_ENABLED', True):
-            msg += f' | {sms_sent} SMS sent ✅'
-            if sms_failed > 0:
-                msg += f' | {sms_failed} SMS failed ❌'
-        else:
-            msg += ' | SMS notifications disabled in settings'
-        
-        self.message_user(request, msg)
+        """Mark orders as delivered and queue SMS notifications"""
+        self.transition(request, queryset, 'delivered', 'Delivered ✅', order_delivered_sms)
     mark_as_delivered.short_description = '✅ Mark selected as Delivered (Send SMS)'
     
     def mark_as_cancelled(self, request, queryset):
-        """Mark orders as cancelled and send SMS notification"""
-        updated = 0
-        sms_sent = 0
-        sms_failed = 0
-        
-        for order in queryset:
-            # Update status
-            order.status = 'cancelled'
-            order.save()
-            updated += 1
-            
-            # Send SMS
-            if send_order_cancelled(order.phone, order.id):
-                sms_sent += 1
-            else:
-                sms_failed += 1
-        
-        # Build message
-        msg = f'{updated} order(s) marked as Cancelled ❌'
-        if getattr(settings, 'SMS_ENABLED', True):
-            msg += f' | {sms_sent} SMS sent ✅'
-            if sms_failed > 0:
-                msg += f' | {sms_failed} SMS failed ❌'
-        else:
-            msg += ' | SMS notifications disabled in settings'
-        
-        self.message_user(request, msg)
+        """Mark orders as cancelled, restock their items and queue SMS notifications"""
+        self.transition(request, queryset, 'cancelled', 'Cancelled ❌', order_cancelled_sms)
     mark_as_cancelled.short_description = '❌ Mark selected as Cancelled (Send SMS)'
+    
+    # ========== Export ==========
+    def export_response(self, queryset, fmt, preset):
+        """Stream the selection as a download instead of building it in memory"""
+        content_type, extension = export.FORMATS[fmt]
+        response = StreamingHttpResponse(export.stream(queryset, fmt, preset), content_type=content_type)
+        filename = f"orders-{preset}-{timezone.now():%Y%m%d-%H%M}.{extension}"
+        response['Content-Disposition'] = f'attachment; filename="{filename}"'
+        return response
+    
+    def export_csv(self, request, queryset):
+        return self.export_response(queryset, 'csv', 'full')
+    export_csv.short_description = '📤 Export selected (CSV)'
+    
+    def export_jsonl(self, request, queryset):
+        return self.export_response(queryset, 'jsonl', 'full')
+    export_jsonl.short_description = '📤 Export selected (JSON lines)'
+    
+    def export_courier_manifest(self, request, queryset):
+        return self.export_response(queryset, 'csv', 'courier')
+    export_courier_manifest.short_description = '🚚 Export courier manifest (CSV)'
 
 
 @admin.register(OrderItem)
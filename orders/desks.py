@@ -0,0 +1,94 @@
+import threading
+import time
+from types import MappingProxyType
+
+from .geo import GridIndex, distance_km
+from .models import StopDesk
+from .rates import bump_version, current_version, is_stale, json_payload
+
+VERSION_KEY = 'stop_desks_version'
+CELL_DEGREES = 0.5  # Grid cell size for the nearest-desk index, ~55 km of latitude
+
+FIELDS = (
+    'id', 'name', 'city', 'address', 'phone',
+    'latitude', 'longitude', 'working_hours', 'working_days',
+)
+
+# Active stop desks grouped by wilaya, reloaded like the rate table when a
+# StopDesk is saved or deleted, or after rates.MAX_AGE seconds. Payloads
+# are serialized on first request for a wilaya and reused until the next
+# reload.
+_by_wilaya = MappingProxyType({})
+_payloads = {}
+_digest = ''
+_index = GridIndex([])
+_version = None
+_loaded_at = 0.0
+_lock = threading.Lock()
+
+
+def reload():
+    bump_version(VERSION_KEY)
+
+
+def load_desks():
+    by_wilaya = {}
+    for desk in StopDesk.objects.filter(is_active=True).values(*FIELDS, 'wilaya'):
+        desk['latitude'] = float(desk['latitude'])
+        desk['longitude'] = float(desk['longitude'])
+        by_wilaya.setdefault(desk.pop('wilaya'), []).append(MappingProxyType(desk))
+    return MappingProxyType({wilaya: tuple(desks) for wilaya, desks in by_wilaya.items()})
+
+
+def _refresh():
+    global _by_wilaya, _payloads, _digest, _index, _version, _loaded_at
+    version = current_version(VERSION_KEY)
+    if is_stale(version, _version, _loaded_at):
+        with _lock:
+            if is_stale(version, _version, _loaded_at):
+                by_wilaya = load_desks()
+                _digest = json_payload({
+                    wilaya: [dict(desk) for desk in desks] for wilaya, desks in by_wilaya.items()
+                })[1]
+                _index = GridIndex(
+                    ((desk['latitude'], desk['longitude'], desk) for desks in by_wilaya.values() for desk in desks),
+                    CELL_DEGREES,
+                )
+                _by_wilaya, _payloads, _version = by_wilaya, {}, version
+                _loaded_at = time.monotonic()
+
+
+def get_by_wilaya(wilaya):
+    """Active stop desks in wilaya, as read-only dicts"""
+    _refresh()
+    return _by_wilaya.get(wilaya, ())
+
+
+def get_digest():
+    """Hash of every active desk, changes whenever any wilaya's payload does"""
+    _refresh()
+    return _digest
+
+
+def get_payload(wilaya):
+    """(body, etag) of the stop desks in wilaya"""
+    _refresh()
+    payloads = _payloads
+    if wilaya not in payloads:
+        payloads[wilaya] = json_payload([dict(desk) for desk in _by_wilaya.get(wilaya, ())])
+    return payloads[wilaya]
+
+
+def nearest_in_wilaya(wilaya, lat, lng):
+    """The active desk in wilaya closest to (lat, lng), or None"""
+    return min(
+        get_by_wilaya(wilaya),
+        key=lambda desk: distance_km(lat, lng, desk['latitude'], desk['longitude']),
+        default=None,
+    )
+
+
+def nearest(lat, lng, k=3):
+    """The k active desks closest to (lat, lng), as (distance_km, desk) pairs"""
+    _refresh()
+    return _index.nearest(lat, lng, k)
@@ -0,0 +1,118 @@
+import csv
+import json
+
+CHUNK_SIZE = 2000
+
+# Spreadsheets run cells starting with these as formulas
+FORMULA_PREFIXES = ('=', '+', '-', '@', '\t', '\r')
+
+# (column, value) per preset; values are read from an Order loaded by
+# export_queryset() for that preset
+PRESETS = {
+    'full': [
+        ('order_id', lambda order: order.id),
+        ('created_at', lambda order: order.created_at.isoformat()),
+        ('status', lambda order: order.status),
+        ('username', lambda order: order.user.username),
+        ('full_name', lambda order: order.full_name),
+        ('phone', lambda order: order.phone),
+        ('wilaya', lambda order: order.wilaya),
+        ('city', lambda order: order.city),
+        ('address', lambda order: order.address),
+        ('delivery_type', lambda order: order.delivery_type),
+        ('stop_desk', lambda order: order.stop_desk.name if order.stop_desk else ''),
+        ('subtotal', lambda order: order.subtotal),
+        ('shipping_cost', lambda order: order.shipping_cost),
+        ('total_price', lambda order: order.total_price),
+        ('payment_method', lambda order: order.payment_method),
+        ('tracking_number', lambda order: order.tracking_number or ''),
+    ],
+    # What the delivery company needs to pick up and collect cash on delivery
+    'courier': [
+        ('order_id', lambda order: order.id),
+        ('full_name', lambda order: order.full_name),
+        ('phone', lambda order: order.phone),
+        ('wilaya', lambda order: order.wilaya),
+        ('city', lambda order: order.city),
+        ('address', lambda order: order.address),
+        ('delivery_type', lambda order: order.delivery_type),
+        ('stop_desk', lambda order: order.stop_desk.name if order.stop_desk else ''),
+        ('cod_amount', lambda order: order.total_price),
+        ('tracking_number', lambda order: order.tracking_number or ''),
+    ],
+}
+
+FORMATS = {
+    'csv': ('text/csv', 'csv'),
+    'jsonl': ('application/x-ndjson', 'jsonl'),
+}
+
+
+def export_queryset(queryset, preset):
+    """queryset with the joins and prefetches the preset reads"""
+    queryset = queryset.select_related('user', 'stop_desk')
+    if preset == 'full':
+        # With iterator(chunk_size) the prefetch runs once per chunk
+        queryset = queryset.prefetch_related('items__product')
+    return queryset
+
+
+def order_items(order):
+    return [
+        {'product': item.product.name, 'quantity': item.quantity, 'price': item.price}
+        for item in order.items.all()
+    ]
+
+
+def iter_rows(queryset, preset='full', chunk_size=CHUNK_SIZE):
+    """Yield one dict per order, loading chunk_size orders at a time"""
+    columns = PRESETS[preset]
+    for order in export_queryset(queryset, preset).iterator(chunk_size=chunk_size):
+        row = {name: value(order) for name, value in columns}
+        if preset == 'full':
+            row['items'] = order_items(order)
+        yield row
+
+
+class Echo:
+    """File-like object whose write() returns the line for csv.writer"""
+
+    def write(self, value):
+        return value
+
+
+def csv_cell(value):
+    """value, quoted with a leading ' if a spreadsheet would read it as a formula"""
+    if isinstance(value, str) and value.startswith(FORMULA_PREFIXES):
+        return "'" + value
+    return value
+
+
+def stream_csv(rows, preset='full'):
+    writer = csv.writer(Echo())
+    header = [name for name, _ in PRESETS[preset]]
+    if preset == 'full':
+        header.append('items')
+    yield writer.writerow(header)
+    for row in rows:
+        if preset == 'full':
+            row['items'] = '; '.join(f"{item['quantity']} x {item['product']}" for item in row['items'])
+        yield writer.writerow([csv_cell(value) for value in row.values()])
+
+
+def stream_jsonl(rows):
+    for row in rows:
+        yield json.dumps(row, ensure_ascii=False, default=str) + '\n'
+
+
+def stream(queryset, fmt='csv', preset='full', chunk_size=CHUNK_SIZE):
+    """
+    Serialized export of queryset, one line at a time.
+
+    Memory stays flat however many orders match, and output starts as
+    soon as the first chunk has been read.
+    """
+    rows = iter_rows(queryset, preset, chunk_size)
+    if fmt == 'jsonl':
+        return stream_jsonl(rows)
+    return stream_csv(rows, preset)
@@ -0,0 +1,375 @@
+# Bundled gazetteer for offline reverse geocoding (see orders.geocoding).
+# (wilaya, commune, latitude, longitude) of commune centres and other
+# populated places. Wilaya names use the same spelling as
+# ShippingRate.wilaya and the checkout form. Every wilaya has its seat;
+# the rest come from GeoNames (geonames.org, CC BY 4.0) places with at
+# least 500 inhabitants, filed under their GeoNames wilaya. The denser the
+# list, the closer nearest-place matching follows the real wilaya borders.
+
+COMMUNES = [
+    # 01 - 10
+    ('Adrar', 'Adrar', 27.8743, -0.2939),
+    ('Adrar', 'Reggane', 26.7167, 0.1667),
+    ('Adrar', 'Aoulef', 26.9667, 1.0833),
+    ('Adrar', 'Kasbate El Djena', 27.0200, 1.0454),
+    ('Adrar', 'Tilouline', 27.0391, -0.0940),
+    ('Adrar', 'Tamentit', 27.7605, -0.2600),
+    ('Adrar', 'Tidmaine', 27.0827, -0.1086),
+    ('Adrar', 'Tit', 26.9360, 1.4921),
+    ('Adrar', 'Akabli', 26.7083, 1.3753),
+    ('Adrar', 'Sali', 26.9655, -0.0404),
+    ('Adrar', 'Ouled Ahmed Timmi', 27.8416, -0.2889),
+    ('Adrar', 'Bouda', 28.0033, -0.4238),
+    ('Adrar', 'Timokten', 27.0222, 1.0146),
+    ('Adrar', 'Tsabit', 28.3505, -0.2240),
+    ('Adrar', 'Tamest', 27.4259, -0.2434),
+    ('Chlef', 'Chlef', 36.1650, 1.3345),
+    ('Chlef', 'Ténès', 36.5122, 1.3047),
+    ('Chlef', 'Ech Chettia', 36.1959, 1.2554),
+    ('Chlef', 'Oued Fodda', 36.1850, 1.5330),
+    ('Chlef', 'Aïn Merane', 36.1628, 0.9704),
+    ('Chlef', 'Oued Sly', 36.1012, 1.1995),
+    ('Chlef', 'Boukadir', 36.0663, 1.1260),
+    ('Chlef', 'Sidi Akkacha', 36.4647, 1.3026),
+    ('Chlef', 'Abou el Hassan', 36.4166, 1.1962),
+    ('Chlef', 'Béni Bou Attab', 35.9950, 1.6175),
+    ('Laghouat', 'Laghouat', 33.8000, 2.8650),
+    ('Laghouat', 'Aflou', 34.1130, 2.1020),
+    ('Oum El Bouaghi', 'Oum El Bouaghi', 35.8770, 7.1130),
+    ('Oum El Bouaghi', 'Aïn Beïda', 35.7964, 7.3928),
+    ('Oum El Bouaghi', "Aïn M'lila", 36.0370, 6.5700),
+    ('Oum El Bouaghi', 'Aïn Fakroun', 35.9711, 6.8737),
+    ('Oum El Bouaghi', 'Aïn Kercha', 35.9247, 6.6953),
+    ('Oum El Bouaghi', 'Meskiana', 35.6306, 7.6661),
+    ('Batna', 'Batna', 35.5560, 6.1740),
+    ('Batna', 'Barika', 35.3890, 5.3660),
+    ('Batna', 'Arris', 35.2590, 6.3480),
+    ('Batna', 'Aïn Touta', 35.3768, 5.9000),
+    ('Batna', 'Merouana', 35.6311, 5.9119),
+    ('Batna', 'Tazoult-Lambese', 35.4817, 6.2607),
+    ('Batna', 'Râs el Aïoun', 35.6738, 5.6453),
+    ('Batna', "N'Gaous", 35.5550, 5.6106),
+    ('Batna', 'Timgad', 35.4928, 6.4700),
+    ('Batna', 'Boumagueur', 35.5052, 5.5525),
+    ('Batna', 'Draa Klalouche', 35.7923, 5.9771),
+    ('Batna', 'Tarhit Ouled Hellal', 35.0811, 6.3338),
+    ('Béjaïa', 'Béjaïa', 36.7520, 5.0840),
+    ('Béjaïa', 'Akbou', 36.4570, 4.5340),
+    ('Béjaïa', 'Kherrata', 36.4940, 5.2770),
+    ('Béjaïa', 'Barbacha', 36.5667, 4.9667),
+    ('Béjaïa', 'el hed', 36.6500, 4.7736),
+    ('Béjaïa', 'El Kseur', 36.6794, 4.8555),
+    ('Béjaïa', 'Amizour', 36.6402, 4.9013),
+    ('Béjaïa', 'Feraoun', 36.5604, 4.8545),
+    ('Béjaïa', 'Chemini', 36.6000, 4.6167),
+    ('Béjaïa', 'Seddouk', 36.5472, 4.6861),
+    ('Béjaïa', 'Ighram', 36.4629, 4.5053),
+    ('Biskra', 'Biskra', 34.8500, 5.7280),
+    ('Biskra', 'Tolga', 34.7220, 5.3830),
+    ('Biskra', 'Sidi Okba', 34.7451, 5.8983),
+    ('Biskra', 'Zeribet el Oued', 34.6828, 6.5111),
+    ('Biskra', 'Oumache', 34.6929, 5.6809),
+    ('Béchar', 'Béchar', 31.6170, -2.2170),
+    ('Béchar', 'Kenadsa', 31.5600, -2.4300),
+    ('Béchar', 'Abadla', 31.0170, -2.7330),
+    ('Blida', 'Blida', 36.4700, 2.8280),
+    ('Blida', 'Boufarik', 36.5750, 2.9110),
+    ('Blida', 'Larbaa', 36.5670, 3.1500),
+    ('Blida', 'Beni Mered', 36.5239, 2.8613),
+    ('Blida', 'Meftah', 36.6204, 3.2225),
+    ('Blida', 'Souma', 36.5183, 2.9053),
+    ('Blida', 'Bougara', 36.5418, 3.0810),
+    ('Blida', 'El Affroun', 36.4701, 2.6253),
+    ('Blida', 'Beni Tamou', 36.5383, 2.8217),
+    ('Blida', 'Bouinan', 36.5317, 2.9919),
+    ('Blida', 'Mouzaïa', 36.4669, 2.6899),
+    ('Blida', 'Ouled Slama Fouaga', 36.5483, 3.1101),
+    ('Blida', 'Chiffa', 36.4629, 2.7387),
+    ('Blida', 'Oued el Alleug', 36.5553, 2.7903),
+    ('Blida', 'Chebli', 36.5772, 3.0092),
+    ('Bouira', 'Bouira', 36.3750, 3.9020),
+    ('Bouira', 'Lakhdaria', 36.5640, 3.5970),
+    ('Bouira', 'Sour El Ghozlane', 36.1470, 3.6900),
+    ('Bouira', 'Aïn Bessem', 36.2933, 3.6732),
+    ('Bouira', 'Chorfa', 36.3650, 4.3264),
+
+    # 11 - 20
+    ('Tamanrasset', 'Tamanrasset', 22.7850, 5.5230),
+    ('Tébessa', 'Tébessa', 35.4040, 8.1240),
+    ('Tébessa', 'Bir El Ater', 34.7440, 8.0600),
+    ('Tébessa', 'Cheria', 35.2731, 7.7519),
+    ('Tébessa', 'Ouenza', 35.9533, 8.1292),
+    ('Tébessa', 'El Aouinet', 35.8669, 7.8867),
+    ('Tébessa', 'Hammamet', 35.4486, 7.9518),
+    ('Tlemcen', 'Tlemcen', 34.8780, -1.3150),
+    ('Tlemcen', 'Maghnia', 34.8460, -1.7300),
+    ('Tlemcen', 'Ghazaouet', 35.0940, -1.8600),
+    ('Tlemcen', 'Mansoûra', 34.8616, -1.3394),
+    ('Tlemcen', 'Chetouane', 34.9213, -1.2951),
+    ('Tlemcen', 'Sebdou', 34.6370, -1.3314),
+    ('Tlemcen', 'Remchi', 35.0620, -1.4336),
+    ('Tlemcen', 'Nedroma', 35.0136, -1.7480),
+    ('Tlemcen', 'Hennaya', 34.9514, -1.3681),
+    ('Tlemcen', 'Ouled Mimoun', 34.9047, -1.0339),
+    ('Tlemcen', 'Sidi Abdelli', 35.0694, -1.1371),
+    ('Tlemcen', 'Bensekrane', 35.0746, -1.2243),
+    ('Tlemcen', 'Beni Mester', 34.8704, -1.4232),
+    ('Tlemcen', 'Sidi Senoussi', 34.9969, -1.0945),
+    ('Tiaret', 'Tiaret', 35.3710, 1.3170),
+    ('Tiaret', 'Sougueur', 35.1857, 1.4961),
+    ('Tiaret', 'Ksar Chellala', 35.2122, 2.3189),
+    ('Tiaret', 'Frenda', 35.0654, 1.0494),
+    ('Tiaret', 'Aïn Deheb', 34.8422, 1.5470),
+    ('Tiaret', 'Mehdia', 35.4306, 1.7571),
+    ('Tiaret', 'Djebilet Rosfa', 34.8638, 0.8350),
+    ('Tizi Ouzou', 'Tizi Ouzou', 36.7120, 4.0460),
+    ('Tizi Ouzou', 'Azazga', 36.7450, 4.3710),
+    ('Tizi Ouzou', 'Draâ Ben Khedda', 36.7330, 3.9600),
+    ('Tizi Ouzou', 'Boghni', 36.5422, 3.9531),
+    ('Tizi Ouzou', 'Draa el Mizan', 36.5363, 3.8334),
+    ('Tizi Ouzou', 'Timizart', 36.8000, 4.2667),
+    ('Tizi Ouzou', 'Makouda', 36.7857, 4.0627),
+    ('Tizi Ouzou', 'Beni Douala', 36.6195, 4.0828),
+    ('Tizi Ouzou', 'Freha', 36.7523, 4.3155),
+    ('Tizi Ouzou', "L'Arbaa Naït Irathen", 36.6311, 4.1986),
+    ('Tizi Ouzou', 'Mekla', 36.6818, 4.2638),
+    ('Tizi Ouzou', 'Aïn el Hammam', 36.5647, 4.3062),
+    ('Tizi Ouzou', 'Tizi Gheniff', 36.5884, 3.7744),
+    ('Tizi Ouzou', 'Tirmitine', 36.6539, 3.9814),
+    ('Tizi Ouzou', 'Maâtkas', 36.6047, 3.9844),
+    ('Tizi Ouzou', 'Arhribs', 36.7936, 4.3116),
+    ('Tizi Ouzou', 'Tizi-n-Tleta', 36.5457, 4.0571),
+    ('Tizi Ouzou', 'Tadmaït', 36.7441, 3.9005),
+    ('Tizi Ouzou', 'Boudjima', 36.8022, 4.1519),
+    ('Tizi Ouzou', 'Tizi Rached', 36.6718, 4.1918),
+    ('Tizi Ouzou', 'Ait Yahia', 36.5891, 4.3350),
+    ('Alger', 'Alger Centre', 36.7750, 3.0600),
+    ('Alger', 'Bab Ezzouar', 36.7260, 3.1830),
+    ('Alger', 'Chéraga', 36.7670, 2.9590),
+    ('Alger', 'Rouïba', 36.7380, 3.2810),
+    ('Alger', 'Draria', 36.7160, 2.9950),
+    ('Alger', 'Birtouta', 36.6400, 3.0000),
+    ('Alger', 'Algiers', 36.7323, 3.0875),
+    ('Alger', 'Bordj el Kiffan', 36.7487, 3.1925),
+    ('Alger', 'Baraki', 36.6666, 3.0961),
+    ('Alger', 'Birkhadem', 36.7150, 3.0500),
+    ('Alger', 'Reghaïa', 36.7359, 3.3402),
+    ('Alger', 'Bordj el Bahri', 36.7907, 3.2495),
+    ('Alger', 'Douéra', 36.6700, 2.9444),
+    ('Alger', 'Dar el Beïda', 36.7133, 3.2125),
+    ('Alger', 'Aïn Taya', 36.7933, 3.2869),
+    ('Alger', 'Aïn Benian', 36.8028, 2.9219),
+    ('Alger', 'Sidi Moussa', 36.6064, 3.0878),
+    ('Alger', 'Rais Hamidou', 36.8169, 3.0127),
+    ('Alger', 'Zeralda', 36.7117, 2.8424),
+    ('Alger', 'Saoula', 36.7046, 3.0246),
+    ('Djelfa', 'Djelfa', 34.6730, 3.2630),
+    ('Djelfa', 'Aïn Oussera', 35.4500, 2.9060),
+    ('Djelfa', 'Messaad', 34.1540, 3.5030),
+    ('Djelfa', 'Hassi Bahbah', 35.0711, 3.0299),
+    ('Djelfa', 'Aïn el Bell', 34.3438, 3.2247),
+    ('Djelfa', 'El Idrissia', 34.4454, 2.5275),
+    ('Djelfa', 'Charef', 34.6210, 2.7950),
+    ('Djelfa', 'Feidh el Botma', 34.5000, 3.7667),
+    ('Djelfa', 'Birine', 35.6350, 3.2250),
+    ('Djelfa', 'Dar Chioukh', 34.8964, 3.4854),
+    ('Jijel', 'Jijel', 36.8200, 5.7670),
+    ('Jijel', 'El Milia', 36.7500, 6.2720),
+    ('Jijel', 'District of Taher', 36.7720, 5.8982),
+    ('Jijel', 'Ziama Mansouria', 36.6732, 5.4812),
+    ('Sétif', 'Sétif', 36.1900, 5.4140),
+    ('Sétif', 'El Eulma', 36.1530, 5.6900),
+    ('Sétif', 'Aïn Oulmene', 35.9200, 5.3000),
+    ('Sétif', 'Aïn Azel', 35.8185, 5.5111),
+    ('Sétif', 'Bougaa', 36.3329, 5.0884),
+    ('Sétif', 'Aïn Arnat', 36.1868, 5.3135),
+    ('Sétif', 'Salah Bey', 35.8545, 5.2905),
+    ('Sétif', 'Babor', 36.4899, 5.5393),
+    ('Saida', 'Saida', 34.8300, 0.1520),
+    ('Saida', 'Aïn el Hadjar', 34.7585, 0.1453),
+
+    # 21 - 30
+    ('Skikda', 'Skikda', 36.8760, 6.9090),
+    ('Skikda', 'Collo', 37.0070, 6.5610),
+    ('Skikda', 'Azzaba', 36.7400, 7.1030),
+    ('Skikda', 'El Arrouch', 36.6531, 6.8364),
+    ('Skikda', 'Tamalous', 36.8376, 6.6402),
+    ('Skikda', 'Kerkera', 36.9292, 6.5856),
+    ('Sidi Bel Abbès', 'Sidi Bel Abbès', 35.1900, -0.6310),
+    ('Sidi Bel Abbès', 'Sfizef', 35.2346, -0.2444),
+    ('Sidi Bel Abbès', 'Aïn el Berd', 35.3640, -0.5128),
+    ('Annaba', 'Annaba', 36.9000, 7.7660),
+    ('Annaba', 'El Bouni', 36.8610, 7.7210),
+    ('Annaba', 'Sidi Amar', 36.8202, 7.7164),
+    ('Annaba', 'Ahmed Bel Hadj', 36.8015, 7.6081),
+    ('Annaba', 'El Hadjar', 36.8038, 7.7368),
+    ('Annaba', 'Berrahal', 36.8353, 7.4533),
+    ('Guelma', 'Guelma', 36.4620, 7.4260),
+    ('Guelma', 'Héliopolis', 36.5036, 7.4428),
+    ('Guelma', 'Oued Zenati', 36.3161, 7.1636),
+    ('Guelma', 'Boumahra Ahmed', 36.4583, 7.5139),
+    ('Guelma', 'Berrahab', 36.2080, 7.1026),
+    ('Constantine', 'Constantine', 36.3650, 6.6150),
+    ('Constantine', 'El Khroub', 36.2630, 6.6940),
+    ('Constantine', 'Hamma Bouziane', 36.4121, 6.5960),
+    ('Constantine', 'Ali Mendjeli', 36.2459, 6.5671),
+    ('Constantine', 'Aïn Smara', 36.2674, 6.5014),
+    ('Constantine', 'Aïn Abid', 36.2319, 6.9433),
+    ('Constantine', 'Zighout Youcef', 36.5331, 6.7124),
+    ('Constantine', 'Didouche Mourad', 36.4525, 6.6364),
+    ('Médéa', 'Médéa', 36.2640, 2.7540),
+    ('Médéa', 'Berrouaghia', 36.1350, 2.9110),
+    ('Médéa', 'Ksar El Boukhari', 35.8890, 2.7490),
+    ('Médéa', 'Chellalat el Adhaouara', 35.9397, 3.4159),
+    ('Médéa', 'Bougzoul', 35.7056, 2.8460),
+    ('Médéa', 'Ouzera', 36.2542, 2.8472),
+    ('Médéa', 'Aziz', 35.8233, 2.4515),
+    ('Médéa', 'Aïn Boucif', 35.8912, 3.1585),
+    ('Médéa', 'Draâ Esmar', 36.2735, 2.7170),
+    ('Mostaganem', 'Mostaganem', 35.9310, 0.0890),
+    ("M'Sila", "M'Sila", 35.7060, 4.5420),
+    ("M'Sila", 'Bou Saâda', 35.2130, 4.1740),
+    ("M'Sila", 'Sidi Aïssa', 35.8855, 3.7724),
+    ("M'Sila", 'Aïn el Melh', 34.8415, 4.1638),
+    ("M'Sila", 'Ain el Hadjel', 35.6700, 3.8815),
+    ("M'Sila", 'Melouza', 35.9800, 4.1867),
+    ('Mascara', 'Mascara', 35.3970, 0.1400),
+    ('Mascara', 'Mohammadia', 35.5886, 0.0686),
+    ('Mascara', 'Sig', 35.5283, -0.1937),
+    ('Mascara', 'Tighenif', 35.4172, 0.3298),
+    ('Mascara', 'Bou Hanifia el Hamamat', 35.3147, -0.0504),
+    ('Mascara', 'Oued el Abtal', 35.4560, 0.6878),
+    ('Ouargla', 'Ouargla', 31.9490, 5.3250),
+    ('Ouargla', 'Hassi Messaoud', 31.6800, 6.0730),
+    ('Ouargla', 'Rouissat', 31.9243, 5.3502),
+    ('Ouargla', 'El Hadjira', 32.6134, 5.5126),
+
+    # 31 - 40
+    ('Oran', 'Oran', 35.6970, -0.6330),
+    ('Oran', 'Es Sénia', 35.6480, -0.6240),
+    ('Oran', 'Bir El Djir', 35.7200, -0.5450),
+    ('Oran', 'Arzew', 35.8500, -0.3170),
+    ('Oran', 'Aïn El Turk', 35.7440, -0.7670),
+    ('Oran', 'Assi Bou Nif', 35.6922, -0.4994),
+    ('Oran', 'En Nedjma', 35.6478, -0.5695),
+    ('Oran', 'Aïn el Bya', 35.8039, -0.3018),
+    ('Oran', 'Sidi ech Chahmi', 35.6590, -0.5217),
+    ('Oran', 'Gdyel', 35.7811, -0.4258),
+    ('Oran', 'Bou Tlelis', 35.5727, -0.8996),
+    ('Oran', 'Mers el Kebir', 35.7279, -0.7081),
+    ('El Bayadh', 'El Bayadh', 33.6830, 1.0200),
+    ('El Bayadh', 'El Abiodh Sidi Cheikh', 32.8930, 0.5484),
+    ('El Bayadh', 'Brezina', 33.0989, 1.2608),
+    ('Illizi', 'Illizi', 26.4830, 8.4670),
+    ('Illizi', 'In Amenas', 28.0500, 9.5500),
+    ('Bordj Bou Arréridj', 'Bordj Bou Arréridj', 36.0730, 4.7610),
+    ('Bordj Bou Arréridj', 'Ras El Oued', 35.9550, 5.0340),
+    ('Bordj Bou Arréridj', 'El Achir', 36.0639, 4.6274),
+    ('Bordj Bou Arréridj', 'Bordj Ghdir', 35.9011, 4.8981),
+    ('Bordj Bou Arréridj', 'Mansourah', 36.0872, 4.4519),
+    ('Bordj Bou Arréridj', 'Bordj Zemoura', 36.2746, 4.8567),
+    ('Boumerdès', 'Boumerdès', 36.7670, 3.4780),
+    ('Boumerdès', 'Bordj Menaïel', 36.7410, 3.7230),
+    ('Boumerdès', 'Dellys', 36.9130, 3.9140),
+    ('Boumerdès', 'Boudouaou', 36.7274, 3.4099),
+    ('Boumerdès', 'Khemis el Khechna', 36.6500, 3.3308),
+    ('Boumerdès', 'Ouled Moussa', 36.6839, 3.3666),
+    ('Boumerdès', 'Ouled Haddaj', 36.7146, 3.3422),
+    ('Boumerdès', 'Chabet el Ameur', 36.6371, 3.6947),
+    ('Boumerdès', 'Beni Amrane', 36.6677, 3.5911),
+    ('Boumerdès', 'Arbatache', 36.6377, 3.3713),
+    ('Boumerdès', 'Thenia', 36.7254, 3.5566),
+    ('Boumerdès', 'Naciria', 36.7463, 3.8316),
+    ('El Tarf', 'El Tarf', 36.7670, 8.3130),
+    ('El Tarf', 'El Kala', 36.8960, 8.4430),
+    ('El Tarf', 'Besbes', 36.7022, 7.8472),
+    ('El Tarf', 'Drean', 36.6848, 7.7511),
+    ('El Tarf', 'Ben Mehidi', 36.7697, 7.9064),
+    ('Tindouf', 'Tindouf', 27.6710, -8.1470),
+    ('Tissemsilt', 'Tissemsilt', 35.6070, 1.8110),
+    ('Tissemsilt', 'Lardjem', 35.7492, 1.5478),
+    ('Tissemsilt', 'Theniet el Had', 35.8711, 2.0281),
+    ('El Oued', 'El Oued', 33.3680, 6.8670),
+    ('El Oued', 'Guemar', 33.4890, 6.8000),
+    ('El Oued', 'Debila', 33.5167, 6.9500),
+    ('El Oued', 'Robbah', 33.2797, 6.9098),
+    ('El Oued', 'Reguiba', 33.5639, 6.7033),
+    ('Khenchela', 'Khenchela', 35.4360, 7.1430),
+    ('Khenchela', 'Kaïs', 35.4947, 6.9249),
+
+    # 41 - 48
+    ('Souk Ahras', 'Souk Ahras', 36.2860, 7.9510),
+    ('Souk Ahras', 'Sedrata', 36.1287, 7.5338),
+    ('Souk Ahras', "M'Daourouch", 36.0782, 7.8196),
+    ('Tipaza', 'Tipaza', 36.5890, 2.4480),
+    ('Tipaza', 'Koléa', 36.6400, 2.7680),
+    ('Tipaza', 'Cherchell', 36.6070, 2.1900),
+    ('Tipaza', 'Bou Ismaïl', 36.6426, 2.6901),
+    ('Tipaza', 'Hadjout', 36.5126, 2.4138),
+    ('Mila', 'Mila', 36.4500, 6.2640),
+    ('Mila', 'Chelghoum Laïd', 36.1620, 6.1660),
+    ('Mila', 'Tadjenanet', 36.1213, 5.9867),
+    ('Mila', 'Rouached', 36.4577, 6.0427),
+    ('Mila', 'Grarem', 36.5161, 6.3272),
+    ('Mila', 'Telerghma', 36.1165, 6.3543),
+    ('Mila', "Fedj M'Zala", 36.4094, 5.9446),
+    ('Mila', 'Sidi Mérouane', 36.5206, 6.2611),
+    ('Aïn Defla', 'Aïn Defla', 36.2640, 1.9680),
+    ('Aïn Defla', 'Khemis Miliana', 36.2610, 2.2200),
+    ('Aïn Defla', 'Miliana', 36.3050, 2.2270),
+    ('Aïn Defla', 'El Attaf', 36.2239, 1.6719),
+    ('Aïn Defla', 'El Abadia', 36.2695, 1.6861),
+    ('Aïn Defla', 'Aïn Lechiakh', 36.1585, 2.4051),
+    ('Aïn Defla', 'Hammam Righa', 36.3797, 2.3989),
+    ('Aïn Defla', 'Barbouche', 36.1059, 2.4819),
+    ('Naâma', 'Naâma', 33.2670, -0.3170),
+    ('Naâma', 'Mécheria', 33.5500, -0.2830),
+    ('Naâma', 'Aïn Sefra', 32.7500, -0.5830),
+    ('Aïn Témouchent', 'Aïn Témouchent', 35.2970, -1.1400),
+    ('Aïn Témouchent', 'Beni Saf', 35.3020, -1.3830),
+    ('Aïn Témouchent', 'El Amria', 35.5244, -1.0158),
+    ('Aïn Témouchent', 'Hammam Bou Hadjar', 35.3789, -0.9678),
+    ('Aïn Témouchent', 'El Malah', 35.3914, -1.0924),
+    ('Aïn Témouchent', 'Sidi Ben Adda', 35.3059, -1.1814),
+    ('Aïn Témouchent', 'Aghlal', 35.2011, -1.0696),
+    ('Ghardaïa', 'Ghardaïa', 32.4900, 3.6740),
+    ('Ghardaïa', 'Metlili', 32.2680, 3.6330),
+    ('Ghardaïa', 'Guerara', 32.7921, 4.4995),
+    ('Ghardaïa', 'Berriane', 32.8265, 3.7669),
+    ('Relizane', 'Relizane', 35.7370, 0.5560),
+    ('Relizane', 'Oued Rhiou', 35.9612, 0.9190),
+    ('Relizane', 'Djidiouia', 35.9299, 0.8287),
+    ('Relizane', 'Ammi Moussa', 35.8678, 1.1114),
+    ('Relizane', 'Mazouna', 36.1223, 0.8986),
+    ('Relizane', 'Zemoura', 35.7225, 0.7551),
+    ('Relizane', 'Rouachdia', 35.7085, 0.7306),
+
+    # 49 - 58
+    ('Timimoun', 'Timimoun', 29.2630, 0.2310),
+    ('Timimoun', 'Aougrout', 28.7029, 0.3352),
+    ('Timimoun', 'Zaouiet ed Debarh', 29.6990, 0.7127),
+    ('Timimoun', 'Oulad Saïd', 29.4205, 0.2388),
+    ('Timimoun', 'Fatis', 29.7335, 0.6585),
+    ('Timimoun', 'Deldoul', 28.7680, 0.0534),
+    ('Timimoun', 'Charouine', 29.0150, -0.2644),
+    ('Timimoun', 'Oulad Aïssa', 29.4184, -0.0876),
+    ('Timimoun', 'Metarfa', 28.5844, -0.1504),
+    ('Timimoun', 'Talmine', 29.3291, -0.4975),
+    ('Timimoun', 'Ksar Kaddour', 29.5888, 0.3738),
+    ('Bordj Badji Mokhtar', 'Bordj Badji Mokhtar', 21.3280, 0.9550),
+    ('Bordj Badji Mokhtar', 'Timiaouine', 20.4408, 1.8055),
+    ('Ouled Djellal', 'Ouled Djellal', 34.4170, 5.0670),
+    ('Ouled Djellal', 'Sidi Khaled', 34.3870, 4.9878),
+    ('Béni Abbès', 'Béni Abbès', 30.1310, -2.1690),
+    ('In Salah', 'In Salah', 27.1970, 2.4660),
+    ('In Guezzam', 'In Guezzam', 19.5670, 5.7670),
+    ('Touggourt', 'Touggourt', 33.1060, 6.0640),
+    ('Touggourt', 'Tebesbest', 33.1167, 6.0833),
+    ('Touggourt', 'Megarine', 33.1919, 6.0869),
+    ('Touggourt', 'Taïbet', 33.0851, 6.3891),
+    ('Djanet', 'Djanet', 24.5540, 9.4850),
+    ("El M'Ghair", "El M'Ghair", 33.9500, 5.9170),
+    ("El M'Ghair", 'Djamaa', 33.5339, 5.9931),
+    ("El M'Ghair", 'Sidi Amrane', 33.4988, 6.0080),
+    ('El Meniaa', 'El Meniaa', 30.5790, 2.8790),
+]
@@ -0,0 +1,75 @@
+import heapq
+import math
+
+EARTH_RADIUS_KM = 6371.0
+KM_PER_DEGREE = math.pi * EARTH_RADIUS_KM / 180
+
+
+def distance_km(lat1, lng1, lat2, lng2):
+    """Great-circle distance (haversine)"""
+    lat1, lng1, lat2, lng2 = map(math.radians, (lat1, lng1, lat2, lng2))
+    a = (
+        math.sin((lat2 - lat1) / 2) ** 2
+        + math.cos(lat1) * math.cos(lat2) * math.sin((lng2 - lng1) / 2) ** 2
+    )
+    return 2 * EARTH_RADIUS_KM * math.asin(math.sqrt(min(1.0, a)))
+
+
+class GridIndex:
+    """
+    Read-only nearest-point index over (lat, lng, item) entries.
+
+    Points are bucketed into fixed lat/lng cells. A lookup walks square
+    rings of cells outward from the query's cell and stops once no
+    unvisited cell can beat the k-th best distance, so it only touches
+    points near the query.
+    """
+
+    def __init__(self, points, cell_degrees=0.5):
+        self.cell_degrees = cell_degrees
+        grid = {}
+        for lat, lng, item in points:
+            grid.setdefault(self.cell(lat, lng), []).append((lat, lng, item))
+        self.grid = {key: tuple(entries) for key, entries in grid.items()}
+        rows = [row for row, col in self.grid] or [0]
+        cols = [col for row, col in self.grid] or [0]
+        self.bounds = (min(rows), max(rows), min(cols), max(cols))
+
+    def __bool__(self):
+        return bool(self.grid)
+
+    def cell(self, lat, lng):
+        return (math.floor(lat / self.cell_degrees), math.floor(lng / self.cell_degrees))
+
+    def nearest(self, lat, lng, k=1):
+        """The k items closest to (lat, lng), as (distance_km, item) pairs"""
+        if not self.grid or k <= 0:
+            return []
+        row, col = self.cell(lat, lng)
+        min_row, max_row, min_col, max_col = self.bounds
+        # Past this ring every occupied cell has been visited
+        last = max(abs(row - min_row), abs(row - max_row), abs(col - min_col), abs(col - max_col))
+        best = []  # Max-heap of (-distance, tiebreak, item) holding the k closest so far
+        radius = 0
+        while True:
+            if radius == 0:
+                cells = [(row, col)]
+            else:
+                cells = [(row + dr, col + dc) for dr in (-radius, radius) for dc in range(-radius, radius + 1)]
+                cells += [(row + dr, col + dc) for dc in (-radius, radius) for dr in range(-radius + 1, radius)]
+            for key in cells:
+                for point_lat, point_lng, item in self.grid.get(key, ()):
+                    entry = (-distance_km(lat, lng, point_lat, point_lng), id(item), item)
+                    if len(best) < k:
+                        heapq.heappush(best, entry)
+                    elif entry[0] > best[0][0]:
+                        heapq.heapreplace(best, entry)
+            # Anything beyond this ring is at least this far away; longitude
+            # degrees shrink towards the poles, so bound by the narrower side
+            reach = radius * self.cell_degrees
+            cos_lat = math.cos(math.radians(min(90.0, abs(lat) + reach + self.cell_degrees)))
+            bound = reach * KM_PER_DEGREE * max(cos_lat, 0.0)
+            if (len(best) == k and -best[0][0] <= bound) or radius >= last:
+                break
+            radius += 1
+        return [(-distance, item) for distance, _, item in sorted(best, key=lambda entry: -entry[0])]
@@ -0,0 +1,52 @@
+from functools import lru_cache
+
+from .gazetteer import COMMUNES
+from .geo import GridIndex
+
+# Rough bounding box of Algeria; points outside it are not resolved
+BOUNDS = (18.9, 37.2, -8.7, 12.0)  # min lat, max lat, min lng, max lng
+PRECISION = 3  # Decimal places kept for the cache key, ~100 m
+CACHE_SIZE = 4096
+# Nearest places looked at, and how much closer the winning wilaya's place
+# must be than any other wilaya's before its name is trusted
+NEIGHBOURS = 8
+MARGIN = 1.5
+
+# Built once at import: the gazetteer is static and ships with the code
+_index = GridIndex(
+    ((lat, lng, (wilaya, commune)) for wilaya, commune, lat, lng in COMMUNES),
+    cell_degrees=1.0,
+)
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def _resolve(lat, lng):
+    found = _index.nearest(lat, lng, NEIGHBOURS)
+    if not found:
+        return None
+    distance, (wilaya, commune) = found[0]
+    # Nearest place is only a proxy for the border: when another wilaya
+    # has a place almost as close, the point may well lie in either one
+    rival = next((d for d, (other, _) in found if other != wilaya), None)
+    if rival is not None and rival < distance * MARGIN:
+        return None, None, round(distance, 1)
+    return wilaya, commune, round(distance, 1)
+
+
+def reverse_geocode(lat, lng):
+    """
+    Wilaya and nearest listed commune for (lat, lng), or None outside Algeria.
+
+    Resolved against the bundled gazetteer, so no network call is made.
+    Near a wilaya border, where the nearest places belong to different
+    wilayas, wilaya and commune are None rather than a guess. Coordinates
+    are rounded before lookup so nearby clicks share a cache entry.
+    """
+    min_lat, max_lat, min_lng, max_lng = BOUNDS
+    if not (min_lat <= lat <= max_lat and min_lng <= lng <= max_lng):
+        return None
+    found = _resolve(round(lat, PRECISION), round(lng, PRECISION))
+    if found is None:
+        return None
+    wilaya, commune, distance = found
+    return {'wilaya': wilaya, 'commune': commune, 'distance_km': distance}
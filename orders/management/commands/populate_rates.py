@@ -16,19 +16,19 @@ class Command(BaseCommand):
             ('Tipaza', 800, 500),
             ('Tizi Ouzou', 800, 500),
             ('Bouira', 800, 500),
-            ('Bejaia', 800, 500),
+            ('Béjaïa', 800, 500),
             ('Médéa', 800, 500),
-            ('Ain Defla', 800, 500),
-            ('AinTimouchent', 800, 500),
+            ('Aïn Defla', 800, 500),
+            ('Aïn Témouchent', 800, 500),
             ('Chlef', 800, 500),
             ('Constantine', 800, 500),
-            ('Setif', 800, 500),
+            ('Sétif', 800, 500),
             ('Tiaret', 800, 500),
             ('Tlemcen', 800, 500),
             ('Relizane', 800, 500),
-            ('Sidi Bel Abbes', 800, 500),
+            ('Sidi Bel Abbès', 800, 500),
             ('Jijel', 900, 600),
-            ('Bordj Bou Arreridj', 900, 600),
+            ('Bordj Bou Arréridj', 900, 600),
             ('Annaba', 900, 600),
             ('Batna', 900, 600),
             ('Tissemsilt', 900, 600),
@@ -37,10 +37,10 @@ class Command(BaseCommand):
             ('M\'Sila', 900, 600),
             ('El Tarf', 950, 600),
             ('Guelma', 950, 600),
-            ('Kenchela', 950, 600),
-            ('Oum El Bouagui', 950, 600),
-            ('Souk Ahrass', 950, 600),
-            ('Tebessa', 1000, 600),
+            ('Khenchela', 950, 600),
+            ('Oum El Bouaghi', 950, 600),
+            ('Souk Ahras', 950, 600),
+            ('Tébessa', 1000, 600),
             ('Laghouat', 1000, 600),
             ('Djelfa', 1000, 600),
             ('Biskra', 1000, 600),
@@ -52,15 +52,15 @@ class Command(BaseCommand):
             ('Ouargla', 1100, 700),
             ('Touggourt', 1100, 700),
             ('El Bayadh', 1200, 800),
-            ('Naama', 1200, 800),
-            ('Bechar', 1200, 800),
+            ('Naâma', 1200, 800),
+            ('Béchar', 1200, 800),
             ('Béni Abbès', 1200, 0),
             ('Adrar', 1500, 1000),
             ('Timimoun', 1500, 1000),
             ('Tindouf', 1700, 1000),
             ('In Salah', 1800, 1200),
-            ('Ilizi', 1900, 1500),
-            ('Tamenrasset', 2000, 1500),
+            ('Illizi', 1900, 1500),
+            ('Tamanrasset', 2000, 1500),
             ('Djanet', 2200, 0),
         ]
         
@@ -0,0 +1,40 @@
+# Generated by Django 5.2.8 on 2026-10-18 14:00
+
+from django.db import migrations
+
+# Rates were loaded under spellings that differ from the wilaya names the
+# checkout form submits, so those wilayas were priced at the default rate.
+RENAMES = [
+    ('Bejaia', 'Béjaïa'),
+    ('Ain Defla', 'Aïn Defla'),
+    ('AinTimouchent', 'Aïn Témouchent'),
+    ('Setif', 'Sétif'),
+    ('Sidi Bel Abbes', 'Sidi Bel Abbès'),
+    ('Bordj Bou Arreridj', 'Bordj Bou Arréridj'),
+    ('Kenchela', 'Khenchela'),
+    ('Oum El Bouagui', 'Oum El Bouaghi'),
+    ('Souk Ahrass', 'Souk Ahras'),
+    ('Tebessa', 'Tébessa'),
+    ('Naama', 'Naâma'),
+    ('Bechar', 'Béchar'),
+    ('Ilizi', 'Illizi'),
+    ('Tamenrasset', 'Tamanrasset'),
+]
+
+
+def rename_wilayas(apps, schema_editor):
+    ShippingRate = apps.get_model('orders', 'ShippingRate')
+    for old, new in RENAMES:
+        if not ShippingRate.objects.filter(wilaya=new).exists():
+            ShippingRate.objects.filter(wilaya=old).update(wilaya=new)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('orders', '0003_order_idempotency_key'),
+    ]
+
+    operations = [
+        migrations.RunPython(rename_wilayas, migrations.RunPython.noop),
+    ]
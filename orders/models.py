@@ -1,7 +1,6 @@
 from django.db import models
 from django.contrib.auth.models import User
 from products.models import Product
-from django.core.cache import cache
 
 class Order(models.Model):
     STATUS_CHOICES = [
@@ -12,6 +11,15 @@ class Order(models.Model):
         ('cancelled', 'Cancelled'),
     ]
     
+    # Status changes allowed by orders.status.transition()
+    TRANSITIONS = {
+        'pending': {'processing', 'shipped', 'cancelled'},
+        'processing': {'shipped', 'cancelled'},
+        'shipped': {'delivered', 'cancelled'},
+        'delivered': set(),
+        'cancelled': set(),
+    }
+    
     DELIVERY_CHOICES = [
         ('home', 'Home Delivery'),
         ('stop_desk', 'Stop Desk (Point de Retrait)'),
@@ -49,6 +57,9 @@ class Order(models.Model):
     # Tracking
     tracking_number = models.CharField(max_length=100, blank=True, null=True)
     
+    # Checkout token, so a retried submit finds this order instead of placing another
+    idempotency_key = models.CharField(max_length=64, unique=True, null=True, blank=True, editable=False)
+    
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     
@@ -66,6 +77,9 @@ class Order(models.Model):
     def get_total_items(self):
         return sum(item.quantity for item in self.items.all())
     
+    def can_transition(self, status):
+        return status in self.TRANSITIONS.get(self.status, ())
+    
     def calculate_shipping(self):
         """Calculate shipping cost based on wilaya and delivery type"""
         return ShippingRate.get_shipping_cost(self.wilaya, self.delivery_type)
@@ -86,20 +100,29 @@ class ShippingRate(models.Model):
 
     @classmethod
     def get_shipping_cost(cls, wilaya, delivery_type='home'):
-        cache_key = f'shipping_{wilaya}_{delivery_type}'
-        cost = cache.get(cache_key)
-        
-        if cost is None:
-            try:
-                spleen = cls.objects.get(wilaya=wilaya)
-                cost = spleen.stop_desk_price if delivery_type == 'stop_desk' else spleen.home_delivery_price
-                cache.set(cache_key, cost, 3600)  # Cache for 1 hour
-            except cls.DoesNotExist:
-                cost = 400.00
-        
-        return cost
+        """Served from the in-process rate table, see orders.rates"""
+        from .rates import quote
+        return quote(wilaya, delivery_type)
 
 
+class OrderStatusEvent(models.Model):
+    """Append-only history of order status changes"""
+    order = models.ForeignKey(Order, on_delete=models.CASCADE, related_name='status_events')
+    status = models.CharField(max_length=20, choices=Order.STATUS_CHOICES)
+    previous_status = models.CharField(max_length=20, choices=Order.STATUS_CHOICES, blank=True)
+    changed_by = models.ForeignKey(User, on_delete=models.SET_NULL, null=True, blank=True, related_name='+')
+    created_at = models.DateTimeField(auto_now_add=True)
+    
+    class Meta:
+        ordering = ['created_at']
+        indexes = [
+            models.Index(fields=['order', 'created_at']),
+            models.Index(fields=['status', 'created_at']),
+        ]
+    
+    def __str__(self):
+        return f"Order #{self.order_id}: {self.previous_status or '-'} -> {self.status}"
+
 class OrderItem(models.Model):
     order = models.ForeignKey(Order, on_delete=models.CASCADE, related_name='items')
     product = models.ForeignKey(Product, on_delete=models.CASCADE)
@@ -0,0 +1,123 @@
+import hashlib
+import json
+import threading
+import time
+from decimal import Decimal
+from types import MappingProxyType
+
+from django.core.cache import cache
+
+from .models import ShippingRate
+
+VERSION_KEY = 'shipping_rates_version'
+DEFAULT_RATE = Decimal('400.00')  # Wilayas missing from the table
+DELIVERY_TYPES = ('home', 'stop_desk')
+# Reload at least this often. The version only reaches other workers
+# through a shared cache; with the default per-process cache this bounds
+# how long they keep charging old prices after an edit.
+MAX_AGE = 60
+
+# wilaya -> {'home': price, 'stop_desk': price or None}, read-only and replaced
+# wholesale on reload, so readers never see a half-built table. The whole
+# table is ~58 rows; each worker holds it and reloads when the version is
+# bumped after a ShippingRate edit, or once it is MAX_AGE seconds old.
+_table = MappingProxyType({})
+_payload = (b'{}', '')
+_version = None
+_loaded_at = 0.0
+_lock = threading.Lock()
+
+
+def current_version(key=VERSION_KEY):
+    version = cache.get(key)
+    if version is None:
+        cache.add(key, 1, None)
+        version = cache.get(key, 1)
+    return version
+
+
+def bump_version(key=VERSION_KEY):
+    """Make every worker reload the data versioned by key on next use"""
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.set(key, 1, None)
+
+
+def is_stale(version, loaded_version, loaded_at):
+    """Whether data loaded at loaded_at (monotonic) for loaded_version must be reloaded"""
+    return version != loaded_version or time.monotonic() - loaded_at >= MAX_AGE
+
+
+def json_payload(data):
+    """Serialized body and its strong ETag, computed once per version"""
+    body = json.dumps(data, sort_keys=True, separators=(',', ':')).encode()
+    return body, hashlib.sha256(body).hexdigest()[:32]
+
+
+def load_table():
+    """
+    The rate table from ShippingRate rows. A stop desk price of 0 or NULL
+    means the wilaya has no stop desk and is stored as None.
+    """
+    rows = ShippingRate.objects.values_list('wilaya', 'home_delivery_price', 'stop_desk_price')
+    return MappingProxyType({
+        wilaya: MappingProxyType({'home': home, 'stop_desk': stop_desk or None})
+        for wilaya, home, stop_desk in rows
+    })
+
+
+def _refresh():
+    """Reload the table and its JSON payload if the version has moved or it has aged out"""
+    global _table, _payload, _version, _loaded_at
+    version = current_version()
+    if is_stale(version, _version, _loaded_at):
+        with _lock:
+            if is_stale(version, _version, _loaded_at):
+                table = load_table()
+                _payload = json_payload({
+                    'rates': {
+                        wilaya: {kind: float(price) if price else None for kind, price in prices.items()}
+                        for wilaya, prices in table.items()
+                    },
+                    'default': float(DEFAULT_RATE),
+                })
+                _table, _version, _loaded_at = table, version, time.monotonic()
+
+
+def get_table():
+    """The current rate table, reloaded when its version moves or it ages out"""
+    _refresh()
+    return _table
+
+
+def get_payload():
+    """
+    (body, etag) of the rate table as served to the checkout page.
+
+    The body is {"rates": {wilaya: {"home": price, "stop_desk": price}},
+    "default": price}, default being what quote() charges elsewhere.
+    stop_desk is null for wilayas without a stop desk.
+    """
+    _refresh()
+    return _payload
+
+
+def offers_stop_desk(wilaya):
+    """False for wilayas whose stop desk price is 0 or unset"""
+    rates = get_table().get(wilaya)
+    return rates is None or rates['stop_desk'] is not None
+
+
+def quote(wilaya, delivery_type='home'):
+    """
+    Shipping price for wilaya and delivery_type, as charged at checkout.
+
+    Wilayas without a stop desk are delivered, and charged, at home.
+    """
+    if delivery_type not in DELIVERY_TYPES:
+        delivery_type = 'home'
+    rates = get_table().get(wilaya)
+    if not rates:
+        return DEFAULT_RATE
+    return rates[delivery_type] or rates['home']
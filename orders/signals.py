@@ -0,0 +1,19 @@
+from django.db import transaction
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+
+from .models import ShippingRate, StopDesk
+from . import desks, rates
+
+
+@receiver(post_save, sender=ShippingRate)
+@receiver(post_delete, sender=ShippingRate)
+def reload_rates(sender, **kwargs):
+    # After commit, so no worker reloads the table before the edit is visible
+    transaction.on_commit(rates.bump_version)
+
+
+@receiver(post_save, sender=StopDesk)
+@receiver(post_delete, sender=StopDesk)
+def reload_desks(sender, **kwargs):
+    transaction.on_commit(desks.reload)
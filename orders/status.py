@@ -0,0 +1,44 @@
+from django.db import transaction
+from django.db.models.functions import Now
+
+from .models import Order, OrderStatusEvent
+
+
+def allowed_from(status):
+    """Statuses an order can move to status from"""
+    return [current for current, targets in Order.TRANSITIONS.items() if status in targets]
+
+
+@transaction.atomic
+def transition(queryset, status, user=None, fields=('phone', 'tracking_number')):
+    """
+    Move the orders in queryset to status where Order.TRANSITIONS allows it.
+
+    Orders already past that point are left alone. Costs one locking
+    SELECT, one UPDATE and one INSERT of OrderStatusEvent rows however
+    many orders change. Returns the changed orders, loaded with fields
+    and their new status, each with previous_status set.
+    """
+    orders = list(
+        queryset.select_related(None).select_for_update(of=('self',))
+        .filter(status__in=allowed_from(status))
+        .only('id', 'status', *fields)
+    )
+    if not orders:
+        return []
+
+    Order.objects.filter(pk__in=[order.pk for order in orders]).update(status=status, updated_at=Now())
+    OrderStatusEvent.objects.bulk_create([
+        OrderStatusEvent(order_id=order.pk, status=status, previous_status=order.status, changed_by=user)
+        for order in orders
+    ])
+    for order in orders:
+        order.previous_status, order.status = order.status, status
+    return orders
+
+
+def record(order, previous_status='', user=None):
+    """Log a status set outside transition(), e.g. a new order or an admin edit"""
+    return OrderStatusEvent.objects.create(
+        order=order, status=order.status, previous_status=previous_status, changed_by=user,
+    )
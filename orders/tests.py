@@ -1,3 +1,307 @@
+import json
+from decimal import Decimal
+from unittest import mock
+
+from django.contrib.auth.models import User
 from django.test import TestCase
+from django.urls import reverse
+
+from cart.models import Cart, CartItem
+from products.models import Product
+from . import desks, rates, status
+from .geocoding import reverse_geocode
+from .models import Order, OrderItem, OrderStatusEvent, ShippingRate, StopDesk
+from .views import issue_checkout_token
+
+
+class ShippingRateTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        for wilaya, home, stop_desk in [
+            ('Oran', 750, 450),
+            ('Béni Abbès', 1200, 0),  # No stop desk, as in populate_rates
+            ('Djanet', 2200, 0),
+        ]:
+            ShippingRate.objects.create(wilaya=wilaya, home_delivery_price=home, stop_desk_price=stop_desk)
+
+    def setUp(self):
+        # The rows are never committed, so no signal reloads the table
+        rates.bump_version()
+
+    def test_quote(self):
+        self.assertEqual(rates.quote('Oran', 'home'), Decimal('750'))
+        self.assertEqual(rates.quote('Oran', 'stop_desk'), Decimal('450'))
+        self.assertEqual(rates.quote('Oran', 'drone'), Decimal('750'))
+        self.assertEqual(rates.quote('Atlantis', 'stop_desk'), rates.DEFAULT_RATE)
+
+    def test_zero_stop_desk_price_means_no_stop_desk(self):
+        body, _ = rates.get_payload()
+        payload = json.loads(body)
+        for wilaya, home in [('Béni Abbès', Decimal('1200')), ('Djanet', Decimal('2200'))]:
+            with self.subTest(wilaya=wilaya):
+                self.assertFalse(rates.offers_stop_desk(wilaya))
+                self.assertEqual(rates.quote(wilaya, 'stop_desk'), home)
+                self.assertEqual(payload['rates'][wilaya], {'home': float(home), 'stop_desk': None})
+        self.assertTrue(rates.offers_stop_desk('Oran'))
+        self.assertEqual(payload['default'], float(rates.DEFAULT_RATE))
+
+
+class ReverseGeocodeTests(TestCase):
+    # Clicks a few hundred metres from towns next to a wilaya border; the
+    # first three used to land in the neighbouring wilaya
+    BORDER_POINTS = [
+        ((36.703, 7.847), 'El Tarf'),  # Besbes, next to Annaba
+        ((36.606, 3.088), 'Alger'),  # Sidi Moussa, next to Blida
+        ((36.650, 3.330), 'Boumerdès'),  # Khemis El Khechna, next to Alger
+        ((36.738, 3.343), 'Alger'),  # Reghaïa, next to Boumerdès
+        ((35.575, -0.897), 'Oran'),  # Boutlélis, next to Aïn Témouchent
+        ((35.527, -1.016), 'Aïn Témouchent'),  # El Amria, next to Oran
+        ((36.153, 5.693), 'Sétif'),  # El Eulma, next to Mila
+        ((35.953, 5.033), 'Bordj Bou Arréridj'),  # Ras El Oued, next to Sétif
+    ]
+
+    def test_border_points(self):
+        for (lat, lng), wilaya in self.BORDER_POINTS:
+            with self.subTest(lat=lat, lng=lng):
+                self.assertEqual(reverse_geocode(lat, lng)['wilaya'], wilaya)
+
+    def test_no_guess_between_two_wilayas(self):
+        # Halfway between Reghaïa (Alger) and Ouled Haddadj (Boumerdès)
+        place = reverse_geocode(36.725, 3.341)
+        self.assertIsNone(place['wilaya'])
+        self.assertIsNone(place['commune'])
+
+    def test_outside_algeria(self):
+        self.assertIsNone(reverse_geocode(48.857, 2.352))
+
+    def test_locate_api(self):
+        url = reverse('orders:locate_api')
+        response = self.client.get(url, {'lat': '36.703', 'lng': '7.847'}, secure=True)
+        self.assertEqual(response.json()['wilaya'], 'El Tarf')
+        response = self.client.get(url, {'lat': '36.725', 'lng': '3.341'}, secure=True)
+        self.assertEqual(response.status_code, 200)
+        self.assertIsNone(response.json()['wilaya'])
+        response = self.client.get(url, {'lat': '48.857', 'lng': '2.352'}, secure=True)
+        self.assertEqual(response.status_code, 404)
+
+
+class CheckoutTestCase(TestCase):
+    """A logged-in customer with 2 units of a 2000 DA product in their cart"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user('buyer', password='secret-pass-123')
+        cls.product = Product.objects.create(
+            name='Miel de jujubier', category='Miel', quantity='1kg', price=Decimal('2000'), stock=5,
+        )
+        ShippingRate.objects.create(wilaya='Oran', home_delivery_price=750, stop_desk_price=450)
+
+    def setUp(self):
+        rates.bump_version()
+        desks.reload()
+        self.client.force_login(self.user)
+        self.cart = Cart.objects.create(user=self.user)
+        CartItem.add_quantities(self.cart, [(self.product.pk, 2)])
+
+    def place_order(self, token=None, **data):
+        form = {
+            'checkout_token': token or issue_checkout_token(self.user),
+            'full_name': 'Amina B.',
+            'phone': '0555123456',
+            'address': '12 rue Larbi Ben M\'hidi',
+            'city': 'Oran',
+            'wilaya': 'Oran',
+            'delivery_type': 'home',
+            **data,
+        }
+        return self.client.post(reverse('orders:place_order'), form, secure=True)
+
+
+class StopDeskAssignmentTests(CheckoutTestCase):
+    PIN = {'latitude': '35.70', 'longitude': '-0.63'}  # Oran city centre
+
+    def test_assigns_nearest_desk_in_the_wilaya(self):
+        StopDesk.objects.create(
+            name='Oran Centre', wilaya='Oran', city='Oran', address='x', phone='041',
+            latitude=Decimal('35.69'), longitude=Decimal('-0.64'),
+        )
+        # Closer to the pin but across the border
+        StopDesk.objects.create(
+            name='Sidi Chami', wilaya='Aïn Témouchent', city='x', address='x', phone='043',
+            latitude=Decimal('35.70'), longitude=Decimal('-0.63'),
+        )
+        desks.reload()
+        self.place_order(delivery_type='stop_desk', **self.PIN)
+        order = Order.objects.get()
+        self.assertEqual(order.delivery_type, 'stop_desk')
+        self.assertEqual(order.stop_desk.name, 'Oran Centre')
+        self.assertEqual(order.shipping_cost, Decimal('450'))
+
+    def test_no_desk_in_wilaya_is_a_form_error(self):
+        response = self.place_order(delivery_type='stop_desk', **self.PIN)
+        self.assertRedirects(response, reverse('orders:checkout'), fetch_redirect_response=False)
+        self.assertFalse(Order.objects.exists())
+
+    def test_no_pin_is_a_form_error(self):
+        StopDesk.objects.create(
+            name='Oran Centre', wilaya='Oran', city='Oran', address='x', phone='041',
+            latitude=Decimal('35.69'), longitude=Decimal('-0.64'),
+        )
+        desks.reload()
+        response = self.place_order(delivery_type='stop_desk')
+        self.assertRedirects(response, reverse('orders:checkout'), fetch_redirect_response=False)
+        self.assertFalse(Order.objects.exists())
+
+
+class PlaceOrderTests(CheckoutTestCase):
+    def test_resubmitting_the_token_returns_the_same_order(self):
+        token = issue_checkout_token(self.user)
+        first = self.place_order(token)
+        order = Order.objects.get()
+        # The cart is empty by now, so only the idempotency key can answer this
+        second = self.place_order(token)
+
+        self.assertEqual(Order.objects.count(), 1)
+        self.assertEqual(OrderItem.objects.count(), 1)
+        expected = reverse('orders:order_confirmation', args=[order.id])
+        self.assertRedirects(first, expected, fetch_redirect_response=False)
+        self.assertRedirects(second, expected, fetch_redirect_response=False)
+
+    def test_out_of_stock_rolls_back_and_keeps_the_cart(self):
+        scarce = Product.objects.create(
+            name='Miel de sidr', category='Miel', quantity='500g', price=Decimal('3500'), stock=1,
+        )
+        CartItem.add_quantities(self.cart, [(scarce.pk, 3)])
+
+        response = self.place_order()
+
+        self.assertRedirects(response, reverse('cart:view_cart'), fetch_redirect_response=False)
+        self.assertFalse(Order.objects.exists())
+        self.assertFalse(OrderItem.objects.exists())
+        # The first line was reserved before the second failed, and given back
+        self.product.refresh_from_db()
+        scarce.refresh_from_db()
+        self.assertEqual((self.product.stock, scarce.stock), (5, 1))
+        quantities = dict(CartItem.objects.filter(cart=self.cart).values_list('product_id', 'quantity'))
+        self.assertEqual(quantities, {self.product.pk: 2, scarce.pk: 3})
+        self.cart.refresh_from_db()
+        self.assertEqual((self.cart.item_count, self.cart.subtotal), (5, Decimal('14500')))
+
+    def test_shipping_cost_comes_from_the_rate_table(self):
+        self.place_order(shipping_cost='0')
+
+        order = Order.objects.get()
+        self.assertEqual(order.shipping_cost, rates.quote('Oran', 'home'))
+        self.assertEqual(order.shipping_cost, Decimal('750'))
+        self.assertEqual(order.total_price, Decimal('4750'))
+        self.assertFalse(CartItem.objects.filter(cart=self.cart).exists())
+
+
+class OrderAdminTestCase(CheckoutTestCase):
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        cls.admin = User.objects.create_superuser('manager', password='secret-pass-123')
+
+    def run_action(self, action, orders):
+        self.client.force_login(self.admin)
+        return self.client.post(
+            reverse('admin:orders_order_changelist'),
+            {'action': action, '_selected_action': [order.pk for order in orders]},
+            secure=True, follow=True,
+        )
+
+
+class StockReleaseTests(OrderAdminTestCase):
+    def test_cancelling_gives_stock_back_once(self):
+        self.place_order()
+        order = Order.objects.get()
+        self.product.refresh_from_db()
+        self.assertEqual(self.product.stock, 3)
+
+        self.run_action('mark_as_cancelled', [order])
+        self.product.refresh_from_db()
+        self.assertEqual(self.product.stock, 5)
+
+        # Already cancelled: skipped, nothing released again
+        self.run_action('mark_as_cancelled', [order])
+        self.product.refresh_from_db()
+        self.assertEqual(self.product.stock, 5)
+
+
+class StatusTransitionTests(OrderAdminTestCase):
+    def make_order(self, current):
+        return Order.objects.create(
+            user=self.user, status=current, full_name='Amina B.', phone='0555123456', address='x',
+            city='Oran', wilaya='Oran', subtotal=Decimal('4000'), total_price=Decimal('4750'),
+        )
+
+    def test_illegal_transitions_are_skipped(self):
+        delivered = self.make_order('delivered')
+        self.assertFalse(delivered.can_transition('pending'))
+
+        self.assertEqual(status.transition(Order.objects.filter(pk=delivered.pk), 'pending'), [])
+        delivered.refresh_from_db()
+        self.assertEqual(delivered.status, 'delivered')
+        self.assertFalse(OrderStatusEvent.objects.exists())
+
+    def test_action_reports_skipped_orders(self):
+        pending, processing, delivered = (self.make_order(s) for s in ('pending', 'processing', 'delivered'))
+
+        response = self.run_action('mark_as_shipped', [pending, processing, delivered])
+
+        message = str(list(response.context['messages'])[0])
+        self.assertIn('2 order(s) marked as Shipped', message)
+        self.assertIn('1 skipped', message)
+        statuses = dict(Order.objects.values_list('pk', 'status'))
+        self.assertEqual(statuses, {pending.pk: 'shipped', processing.pk: 'shipped', delivered.pk: 'delivered'})
+
+    def test_one_event_per_changed_order(self):
+        pending, processing, cancelled = (self.make_order(s) for s in ('pending', 'processing', 'cancelled'))
+
+        self.run_action('mark_as_shipped', [pending, processing, cancelled])
+
+        events = OrderStatusEvent.objects.order_by('order_id')
+        self.assertEqual(
+            list(events.values_list('order_id', 'previous_status', 'status', 'changed_by')),
+            [
+                (pending.pk, 'pending', 'shipped', self.admin.pk),
+                (processing.pk, 'processing', 'shipped', self.admin.pk),
+            ],
+        )
+
+    def change_form_data(self, order):
+        """The order's change form as the admin would submit it unchanged"""
+        response = self.client.get(reverse('admin:orders_order_change', args=[order.pk]), secure=True)
+        form = response.context['adminform'].form
+        data = {name: form[name].value() or '' for name in form.fields}
+        for inline in response.context['inline_admin_formsets']:
+            formset = inline.formset
+            for name, value in formset.management_form.initial.items():
+                data[f'{formset.prefix}-{name}'] = value
+            for n, inline_form in enumerate(formset.forms):
+                data[f'{formset.prefix}-{n}-id'] = inline_form.instance.pk
+                data[f'{formset.prefix}-{n}-order'] = order.pk
+        return data
+
+    def test_change_form_goes_through_transition(self):
+        self.place_order()
+        order = Order.objects.get()
+        self.client.force_login(self.admin)
+        data = self.change_form_data(order)
+        url = reverse('admin:orders_order_change', args=[order.pk])
+
+        with mock.patch('orders.admin.status.transition', wraps=status.transition) as transition:
+            self.client.post(url, {**data, 'status': 'cancelled'}, secure=True)
+        transition.assert_called_once()
+        order.refresh_from_db()
+        self.product.refresh_from_db()
+        self.assertEqual(order.status, 'cancelled')
+        self.assertEqual(self.product.stock, 5)  # Released like the bulk action does
+        self.assertEqual(order.status_events.filter(status='cancelled').count(), 1)
 
-# Create your tests here.
+        # Cancelled is final: the form no longer offers, or accepts, anything else
+        response = self.client.post(url, {**data, 'status': 'pending'}, secure=True)
+        self.assertIn('status', response.context['adminform'].form.errors)
+        order.refresh_from_db()
+        self.assertEqual(order.status, 'cancelled')
@@ -9,4 +9,8 @@ urlpatterns = [
     path('confirmation/<int:order_id>/', views.order_confirmation, name='order_confirmation'),
     path('detail/<int:order_id>/', views.order_detail, name='order_detail'),
     path('invoice/<int:order_id>/download/', views.download_invoice, name='download_invoice'),
+    path('api/rates/', views.rates_api, name='rates_api'),
+    path('api/locate/', views.locate_api, name='locate_api'),
+    path('api/stop-desks/nearest/', views.nearest_stop_desks_api, name='nearest_stop_desks_api'),
+    path('api/stop-desks/<str:wilaya>/', views.stop_desks_api, name='stop_desks_api'),
 ]
\ No newline at end of file
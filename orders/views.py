@@ -3,47 +3,159 @@ from django.contrib.auth.decorators import login_required
 from django.contrib import messages
 from django.http import JsonResponse, HttpResponse
 from django.template.loader import render_to_string
+from django.core import signing
+from django.urls import reverse
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import quote_etag
+from django.views.decorators.cache import cache_control
+from django.views.decorators.http import require_GET
+from django.db import IntegrityError, transaction
 import json
+import secrets
 from .models import Order, OrderItem, StopDesk
+from . import desks, rates, status
+from .geocoding import reverse_geocode
 from cart.models import Cart, CartItem
+from cart.summary import CartSummary
 from users.models import UserProfile
+from products.inventory import reserve_stock, OutOfStock
+
+CHECKOUT_TOKEN_SALT = 'orders.checkout'
+CHECKOUT_TOKEN_MAX_AGE = 60 * 60 * 24  # A checkout page left open a day still submits
+
+def issue_checkout_token(user):
+    """Signed one-order token rendered into the checkout form"""
+    return signing.dumps({'user': user.pk, 'key': secrets.token_urlsafe(24)}, salt=CHECKOUT_TOKEN_SALT)
+
+def read_checkout_token(token, user):
+    """Return the idempotency key in token, or None if it is not a valid token for user"""
+    try:
+        data = signing.loads(token or '', salt=CHECKOUT_TOKEN_SALT, max_age=CHECKOUT_TOKEN_MAX_AGE)
+    except signing.BadSignature:
+        return None
+    if not isinstance(data, dict) or data.get('user') != user.pk:
+        return None
+    return data.get('key')
 
 @login_required
 def checkout(request):
     """Display checkout page with user info pre-filled"""
-    cart = get_object_or_404(Cart, user=request.user)
-    cart_items = cart.items.all()
+    summary = CartSummary.for_request(request)
     
-    if not cart_items:
+    if not summary:
         messages.warning(request, "Your cart is empty!")
         return redirect('cart:view_cart')
     
     # Get user profile if exists
     try:
-        profile = UserProfile.objects.get(user=request.user)
+        profile = UserProfile.objects.select_related('user').get(user=request.user)
     except UserProfile.DoesNotExist:
         profile = None
     
-    total = cart.get_total()
-    
     context = {
-        'cart_items': cart_items,
-        'total': total,
+        'cart_items': summary.items,
+        'total': summary.subtotal,
         'profile': profile,
+        'checkout_token': issue_checkout_token(request.user),
+        # Versioned so the browser can keep the JSON until rates or desks change
+        'rates_url': f"{reverse('orders:rates_api')}?v={rates.get_payload()[1]}",
+        'stop_desks_url': f"{reverse('orders:stop_desks_api', args=['__wilaya__'])}?v={desks.get_digest()}",
     }
     
     return render(request, 'checkout.html', context)
 
+# ==================== Shipping data API ====================
+# Payloads are serialized once per version of the data. Requests carrying
+# the current content hash in ?v= may be cached for a year, since a change
+# in rates or desks changes the URL the checkout page asks for.
+
+IMMUTABLE_MAX_AGE = 60 * 60 * 24 * 365
+UNVERSIONED_MAX_AGE = 60 * 5
+
+def json_payload_response(request, body, etag, version):
+    """Serve a precomputed JSON body, answering revalidations with a 304"""
+    immutable = request.GET.get('v') == version
+    etag = quote_etag(etag)
+    response = get_conditional_response(request, etag=etag)
+    if response is None:
+        response = HttpResponse(body, content_type='application/json')
+    response['ETag'] = etag
+    if immutable:
+        patch_cache_control(response, public=True, max_age=IMMUTABLE_MAX_AGE, immutable=True)
+    else:
+        patch_cache_control(response, public=True, max_age=UNVERSIONED_MAX_AGE)
+    return response
+
+@require_GET
+def rates_api(request):
+    """Shipping prices per wilaya: {wilaya: {"home": price, "stop_desk": price}}"""
+    body, etag = rates.get_payload()
+    return json_payload_response(request, body, etag, version=etag)
+
+@require_GET
+def stop_desks_api(request, wilaya):
+    """Active stop desks in a wilaya"""
+    return json_payload_response(request, *desks.get_payload(wilaya), version=desks.get_digest())
+
+MAX_NEAREST_DESKS = 10
+
+def parse_coordinates(lat, lng):
+    """(lat, lng) as floats, or None if missing or out of range"""
+    try:
+        lat, lng = float(lat), float(lng)
+    except (TypeError, ValueError):
+        return None
+    if not (-90 <= lat <= 90 and -180 <= lng <= 180):
+        return None
+    return lat, lng
+
+@require_GET
+def nearest_stop_desks_api(request):
+    """The k active stop desks closest to ?lat=&lng=, nearest first"""
+    point = parse_coordinates(request.GET.get('lat'), request.GET.get('lng'))
+    if point is None:
+        return JsonResponse({'success': False, 'message': 'Invalid coordinates'}, status=400)
+    try:
+        k = min(max(int(request.GET.get('k', 3)), 1), MAX_NEAREST_DESKS)
+    except ValueError:
+        k = 3
+    return JsonResponse({
+        'desks': [
+            dict(desk, distance_km=round(distance, 1))
+            for distance, desk in desks.nearest(*point, k=k)
+        ],
+    })
+
+@require_GET
+@cache_control(public=True, max_age=60 * 60 * 24)  # Answers only depend on the bundled gazetteer
+def locate_api(request):
+    """Wilaya and commune of ?lat=&lng=, resolved offline"""
+    point = parse_coordinates(request.GET.get('lat'), request.GET.get('lng'))
+    if point is None:
+        return JsonResponse({'success': False, 'message': 'Invalid coordinates'}, status=400)
+    place = reverse_geocode(*point)
+    if place is None:
+        return JsonResponse({'success': False, 'message': 'Location is outside our delivery area'}, status=404)
+    return JsonResponse(place)
+
 @login_required
 def place_order(request):
-    """Process the order"""
+    """
+    Process the order.
+
+    Runs in one transaction and is idempotent: the token issued by
+    checkout becomes the order's idempotency_key, so a double submit or
+    a retried POST lands on the order the first one created.
+    """
     if request.method == 'POST':
-        cart = get_object_or_404(Cart, user=request.user)
-        cart_items = cart.items.all()
-        
-        if not cart_items:
-            messages.error(request, "Your cart is empty!")
-            return redirect('cart:view_cart')
+        key = read_checkout_token(request.POST.get('checkout_token'), request.user)
+        if key is None:
+            messages.error(request, "Your checkout page expired, please confirm your order again.")
+            return redirect('orders:checkout')
+
+        existing = Order.objects.filter(idempotency_key=key, user=request.user).first()
+        if existing:
+            return redirect('orders:order_confirmation', order_id=existing.id)
         
         # Get form data
         full_name = request.POST.get('full_name')
@@ -52,48 +164,97 @@ def place_order(request):
         city = request.POST.get('city')
         wilaya = request.POST.get('wilaya')
         delivery_type = request.POST.get('delivery_type', 'home')
+        if delivery_type not in rates.DELIVERY_TYPES:
+            delivery_type = 'home'
+        if delivery_type == 'stop_desk' and not rates.offers_stop_desk(wilaya):
+            delivery_type = 'home'  # No stop desk there; quote() prices it as home delivery too
         latitude = request.POST.get('latitude')
         longitude = request.POST.get('longitude')
-        shipping_cost = request.POST.get('shipping_cost', 800)
+
+        # Pickups go to the desk in the chosen wilaya closest to the pin
+        # dropped on the map, which is what shipping was priced for. A
+        # stop desk order is never saved without its desk.
+        stop_desk_id = None
+        if delivery_type == 'stop_desk':
+            point = parse_coordinates(latitude, longitude)
+            if point is None:
+                messages.error(request, "Please pick your location on the map so we can choose your stop desk.")
+                return redirect('orders:checkout')
+            closest = desks.nearest_in_wilaya(wilaya, *point)
+            if closest is None:
+                messages.error(request, f"There is no stop desk in {wilaya} yet, please choose home delivery.")
+                return redirect('orders:checkout')
+            stop_desk_id = closest['id']
+
+        # Priced here from the rate table, never from the submitted form
+        shipping_cost = rates.quote(wilaya, delivery_type)
         
-        # Calculate totals
-        subtotal = cart.get_total()
         try:
-            shipping_cost = int(shipping_cost)
-        except:
-            shipping_cost = 800.00
-        
-        total_price = subtotal + shipping_cost
-        
-        # Create order (stop_desk will be null - delivery company assigns it)
-        order = Order.objects.create(
-            user=request.user,
-            full_name=full_name,
-            phone=phone,
-            address=address,
-            city=city,
-            wilaya=wilaya,
-            delivery_type=delivery_type,
-            stop_desk=None,  # Delivery company assigns this
-            latitude=latitude if latitude else None,
-            longitude=longitude if longitude else None,
-            subtotal=subtotal,
-            shipping_cost=shipping_cost,
-            total_price=total_price,
-            payment_method='cod'
-        )
-        
-        # Create order items
-        for cart_item in cart_items:
-            OrderItem.objects.create(
-                order=order,
-                product=cart_item.product,
-                quantity=cart_item.quantity,
-                price=cart_item.product.price
+            with transaction.atomic():
+                # Lock the cart so concurrent submits of it run one after the other
+                cart = Cart.objects.select_for_update().filter(user=request.user).first()
+
+                # A concurrent retry may have placed the order while we waited
+                existing = Order.objects.filter(idempotency_key=key).first()
+                if existing:
+                    return redirect('orders:order_confirmation', order_id=existing.id)
+
+                summary = CartSummary.for_request(request)
+                if cart is None or not summary:
+                    messages.error(request, "Your cart is empty!")
+                    return redirect('cart:view_cart')
+
+                # Take stock first so an oversold cart creates nothing
+                reserve_stock(summary.lines())
+
+                # Create order
+                order = Order.objects.create(
+                    user=request.user,
+                    full_name=full_name,
+                    phone=phone,
+                    address=address,
+                    city=city,
+                    wilaya=wilaya,
+                    delivery_type=delivery_type,
+                    stop_desk_id=stop_desk_id,
+                    latitude=latitude if latitude else None,
+                    longitude=longitude if longitude else None,
+                    subtotal=summary.subtotal,
+                    shipping_cost=shipping_cost,
+                    total_price=summary.subtotal + shipping_cost,
+                    payment_method='cod',
+                    idempotency_key=key,
+                )
+                status.record(order, user=request.user)
+
+                # Create order items in one INSERT
+                OrderItem.objects.bulk_create([
+                    OrderItem(
+                        order=order,
+                        product=cart_item.product,
+                        quantity=cart_item.quantity,
+                        price=cart_item.product.price
+                    )
+                    for cart_item in summary.items
+                ])
+
+                # Clear cart
+                CartItem.objects.filter(cart=cart).delete()
+                Cart.objects.filter(pk=cart.pk).update(item_count=0, subtotal=0)
+                Cart.invalidate_counts([request.user.id])
+        except OutOfStock as e:
+            product = next(
+                (item.product for item in summary.items if item.product_id == e.product_id), None
             )
-        
-        # Clear cart
-        cart_items.delete()
+            name = product.name if product else 'A product'
+            messages.error(request, f"Sorry, {name} does not have enough stock for your order.")
+            return redirect('cart:view_cart')
+        except IntegrityError:
+            # Lost a race on idempotency_key: the other request placed the order
+            existing = Order.objects.filter(idempotency_key=key, user=request.user).first()
+            if existing is None:
+                raise
+            return redirect('orders:order_confirmation', order_id=existing.id)
         
         messages.success(request, f"Order #{order.id} placed successfully!")
         return redirect('orders:order_confirmation', order_id=order.id)
@@ -1,24 +1,33 @@
 from django.contrib import admin
-from .models import Product
+from .models import Product, ProductImage, ProductStats
+
+class ProductImageInline(admin.TabularInline):
+    model = ProductImage
+    extra = 1
+    fields = ['image', 'position', 'alt_text']
 
 @admin.register(Product)
 class ProductAdmin(admin.ModelAdmin):
-    list_display = ['name', 'category', 'quantity', 'price', 'slug']
+    list_display = ['name', 'category', 'quantity', 'price', 'stock', 'slug']
     list_filter = ['category']
     search_fields = ['name', 'description']
     prepopulated_fields = {'slug': ('name',)}
-    list_editable = ['price']
+    list_editable = ['price', 'stock']
     ordering = ['category', 'name']
+    inlines = [ProductImageInline]
     
     fieldsets = (
         ('Basic Information', {
-            'fields': ('name', 'slug', 'category', 'quantity', 'price')
+            'fields': ('name', 'slug', 'category', 'quantity', 'price', 'stock')
         }),
         ('Description', {
             'fields': ('description',)
         }),
-        ('Images', {
-            'fields': ('picture', 'picture_2', 'picture_3'),
-            'description': 'Upload up to 3 images for the product'
-        }),
-    )
\ No newline at end of file
+    )
+
+
+@admin.register(ProductStats)
+class ProductStatsAdmin(admin.ModelAdmin):
+    list_display = ['product', 'view_count', 'updated_at']
+    ordering = ['-view_count']
+    readonly_fields = ['product', 'view_count', 'updated_at']
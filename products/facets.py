@@ -0,0 +1,166 @@
+from django.core.cache import cache
+from django.db.models import Count, Max, Min, Q
+
+from .models import Product
+
+# Price range filter options: key -> (min_price, max_price), bounds inclusive
+PRICE_RANGES = {
+    '0-1500': (None, 1500),
+    '1500-2000': (1500, 2000),
+    '2000-3000': (2000, 3000),
+    '3000+': (3000, None),
+}
+
+FACETS_CACHE_KEY = 'products_facets'
+FACETS_CACHE_TIMEOUT = 3600  # Upper bound on drift from concurrent updates
+
+
+def price_in_range(price, price_range):
+    min_price, max_price = PRICE_RANGES[price_range]
+    return (min_price is None or price >= min_price) and (max_price is None or price <= max_price)
+
+
+def price_range_q(price_range):
+    """Q object selecting products whose price is in price_range"""
+    min_price, max_price = PRICE_RANGES[price_range]
+    condition = Q()
+    if min_price is not None:
+        condition &= Q(price__gte=min_price)
+    if max_price is not None:
+        condition &= Q(price__lte=max_price)
+    return condition
+
+
+def compute_facets():
+    """
+    Compute per-category counts, price bounds and price bucket counts.
+
+    Runs a single GROUP BY category query with one conditional count per
+    price bucket.
+    """
+    bucket_counts = {
+        f'bucket_{i}': Count('id', filter=price_range_q(key))
+        for i, key in enumerate(PRICE_RANGES)
+    }
+    rows = (
+        Product.objects.order_by()
+        .values('category')
+        .annotate(
+            count=Count('id'),
+            min_price=Min('price'),
+            max_price=Max('price'),
+            **bucket_counts,
+        )
+    )
+
+    categories = {}
+    for row in rows:
+        categories[row['category']] = {
+            'count': row['count'],
+            'min_price': row['min_price'],
+            'max_price': row['max_price'],
+            'buckets': {
+                key: row[f'bucket_{i}'] for i, key in enumerate(PRICE_RANGES)
+            },
+        }
+    return {'categories': categories}
+
+
+def get_facets():
+    """Return cached facets, computing them on a miss"""
+    facets = cache.get(FACETS_CACHE_KEY)
+    if facets is None:
+        facets = compute_facets()
+        cache.set(FACETS_CACHE_KEY, facets, FACETS_CACHE_TIMEOUT)
+    return facets
+
+
+def invalidate_facets():
+    cache.delete(FACETS_CACHE_KEY)
+
+
+def _add(facets, category, price):
+    stats = facets['categories'].setdefault(category, {
+        'count': 0,
+        'min_price': price,
+        'max_price': price,
+        'buckets': {key: 0 for key in PRICE_RANGES},
+    })
+    stats['count'] += 1
+    stats['min_price'] = min(stats['min_price'], price)
+    stats['max_price'] = max(stats['max_price'], price)
+    for key in PRICE_RANGES:
+        if price_in_range(price, key):
+            stats['buckets'][key] += 1
+
+
+def _remove(facets, category, price):
+    """Remove one product; return False if facets cannot be patched"""
+    stats = facets['categories'].get(category)
+    if stats is None:
+        return False
+    stats['count'] -= 1
+    if stats['count'] <= 0:
+        del facets['categories'][category]
+        return True
+    if price in (stats['min_price'], stats['max_price']):
+        return False  # New bound is unknown without a query
+    for key in PRICE_RANGES:
+        if price_in_range(price, key):
+            stats['buckets'][key] -= 1
+    return True
+
+
+def update_facets(added=None, removed=None):
+    """
+    Patch the cached facets with one product change.
+
+    added/removed are (category, price) pairs. Falls back to invalidating
+    the cache when a min/max bound would need a rescan.
+    """
+    facets = cache.get(FACETS_CACHE_KEY)
+    if facets is None:
+        return  # Nothing cached, next read computes fresh facets
+
+    if removed is not None and not _remove(facets, *removed):
+        invalidate_facets()
+        return
+    if added is not None:
+        _add(facets, *added)
+
+    cache.set(FACETS_CACHE_KEY, facets, FACETS_CACHE_TIMEOUT)
+
+
+def facet_options(facets, category=None, price_range=None):
+    """
+    Build filter options with counts for the catalog page.
+
+    Category counts respect the selected price range and price counts
+    respect the selected category, so every count matches what the
+    visitor gets after clicking it.
+    """
+    categories = facets['categories']
+    if price_range in PRICE_RANGES:
+        category_options = [
+            (name, stats['buckets'][price_range]) for name, stats in categories.items()
+        ]
+    else:
+        category_options = [(name, stats['count']) for name, stats in categories.items()]
+    category_options.sort()
+
+    if category in categories:
+        selected = [categories[category]]
+    else:
+        selected = list(categories.values())
+    price_options = [
+        (key, sum(stats['buckets'][key] for stats in selected)) for key in PRICE_RANGES
+    ]
+
+    return {
+        'category_options': category_options,
+        'price_options': price_options,
+        'all_categories_count': sum(count for _, count in category_options),
+        'total_count': sum(stats['count'] for stats in selected),
+        'min_price': min((stats['min_price'] for stats in selected), default=None),
+        'max_price': max((stats['max_price'] for stats in selected), default=None),
+    }
@@ -0,0 +1,53 @@
+from collections import Counter
+
+from django.db.models import F, Q
+from django.db.models.functions import Now
+
+from .models import Product
+
+
+class OutOfStock(Exception):
+    """Raised when a reservation asks for more units than are in stock"""
+
+    def __init__(self, product_id, requested):
+        self.product_id = product_id
+        self.requested = requested
+        super().__init__(f"Product #{product_id} has fewer than {requested} units in stock")
+
+
+def _totals(lines):
+    """Sum (product_id, quantity) lines per product, in a fixed lock order"""
+    totals = Counter()
+    for product_id, quantity in lines:
+        totals[product_id] += quantity
+    # Always lock rows in ascending id order so concurrent checkouts
+    # touching the same products cannot deadlock
+    return sorted(totals.items())
+
+
+def reserve_stock(lines):
+    """
+    Take stock for every (product_id, quantity) line, or raise OutOfStock.
+
+    Must be called inside transaction.atomic() so a failure rolls back
+    the lines already reserved. Each product is one conditional UPDATE,
+    so only the rows being bought are locked and stock never goes
+    negative. Products with no stock count (NULL) are not tracked.
+    """
+    for product_id, quantity in _totals(lines):
+        updated = (
+            Product.objects.filter(pk=product_id)
+            .filter(Q(stock__isnull=True) | Q(stock__gte=quantity))
+            .update(stock=F('stock') - quantity, updated_at=Now())
+        )
+        if not updated:
+            raise OutOfStock(product_id, quantity)
+
+
+def release_stock(lines):
+    """Give stock back for (product_id, quantity) lines, e.g. on cancellation"""
+    for product_id, quantity in _totals(lines):
+        Product.objects.filter(pk=product_id, stock__isnull=False).update(
+            stock=F('stock') + quantity,
+            updated_at=Now(),
+        )
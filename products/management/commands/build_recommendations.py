@@ -0,0 +1,26 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from products.recommendations import TOP_K, build_recommendations
+
+
+class Command(BaseCommand):
+    help = 'Update "customers also bought" recommendations from orders placed since the last run'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--full', action='store_true', help='Recount all orders instead of only new ones')
+        parser.add_argument('--top-k', type=int, default=TOP_K, help='Recommendations kept per product')
+        parser.add_argument('--chunk-size', type=int, default=5000, help='Order items read per batch')
+
+    def handle(self, *args, **options):
+        started = time.monotonic()
+        run = build_recommendations(
+            full=options['full'],
+            k=options['top_k'],
+            chunk_size=options['chunk_size'],
+        )
+        self.stdout.write(self.style.SUCCESS(
+            f'✓ {run.orders_processed} orders processed, {run.products_updated} products updated '
+            f'(up to order #{run.last_order_id}) in {time.monotonic() - started:.2f}s'
+        ))
@@ -0,0 +1,49 @@
+import csv
+import json
+import sys
+
+from django.core.management.base import BaseCommand
+
+from products.models import Product
+
+EXPORT_FIELDS = ['slug', 'name', 'category', 'quantity', 'price', 'stock', 'description']
+
+
+class Command(BaseCommand):
+    help = 'Export all products to CSV or JSON-lines, streaming rows in chunks'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--format', choices=['csv', 'jsonl'], default='csv')
+        parser.add_argument('--output', '-o', default='-', help='Output file, or - for stdout')
+        parser.add_argument('--chunk-size', type=int, default=2000)
+
+    def handle(self, *args, **options):
+        output = options['output']
+        stream = sys.stdout if output == '-' else open(output, 'w', newline='', encoding='utf-8')
+
+        rows = (
+            Product.objects.order_by('id')
+            .values_list(*EXPORT_FIELDS)
+            .iterator(chunk_size=options['chunk_size'])
+        )
+
+        count = 0
+        try:
+            if options['format'] == 'csv':
+                writer = csv.writer(stream)
+                writer.writerow(EXPORT_FIELDS)
+                for row in rows:
+                    writer.writerow(['' if value is None else value for value in row])
+                    count += 1
+            else:
+                for row in rows:
+                    record = dict(zip(EXPORT_FIELDS, row))
+                    record['price'] = str(record['price'])
+                    stream.write(json.dumps(record, ensure_ascii=False) + '\n')
+                    count += 1
+        finally:
+            if stream is not sys.stdout:
+                stream.close()
+
+        if output != '-':
+            self.stdout.write(self.style.SUCCESS(f'✓ {count} products exported to {output}'))
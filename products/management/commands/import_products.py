@@ -0,0 +1,158 @@
+import csv
+import json
+import sys
+import time
+from decimal import Decimal, InvalidOperation
+from itertools import islice
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.utils import timezone
+from django.utils.text import slugify
+
+from cart.models import Cart
+from products.models import Product
+from products import facets, search
+
+# Columns a row needs to create a product; updates may carry any subset
+REQUIRED_FIELDS = ['name', 'category', 'quantity', 'price']
+IMPORT_FIELDS = ['name', 'category', 'quantity', 'price', 'stock', 'description']
+
+
+def read_rows(stream, fmt):
+    """Yield one dict per product without loading the whole file"""
+    if fmt == 'csv':
+        yield from csv.DictReader(stream)
+    else:
+        for line in stream:
+            line = line.strip()
+            if line:
+                yield json.loads(line)
+
+
+def chunked(iterable, size):
+    iterator = iter(iterable)
+    while chunk := list(islice(iterator, size)):
+        yield chunk
+
+
+class Command(BaseCommand):
+    help = 'Create or update products by slug from a CSV or JSON-lines file'
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help='File to import, or - for stdin')
+        parser.add_argument('--format', choices=['csv', 'jsonl'], help='Defaults to the file extension')
+        parser.add_argument('--chunk-size', type=int, default=1000)
+
+    def handle(self, *args, **options):
+        path = options['path']
+        fmt = options['format'] or ('jsonl' if path.endswith(('.jsonl', '.json')) else 'csv')
+        chunk_size = options['chunk_size']
+
+        stream = sys.stdin if path == '-' else open(path, newline='', encoding='utf-8')
+        try:
+            totals = {'upserted': 0, 'updated': 0, 'skipped': 0}
+            started = time.monotonic()
+
+            for number, rows in enumerate(chunked(read_rows(stream, fmt), chunk_size), start=1):
+                chunk_started = time.monotonic()
+                counts = self.import_chunk(rows)
+                for key, value in counts.items():
+                    totals[key] += value
+                self.stdout.write(
+                    f'✓ Chunk {number}: {len(rows)} rows '
+                    f'({counts["upserted"]} upserted, {counts["updated"]} updated, {counts["skipped"]} skipped) '
+                    f'in {time.monotonic() - chunk_started:.2f}s'
+                )
+        finally:
+            if stream is not sys.stdin:
+                stream.close()
+
+        # Bulk queries skip the Product signals, so refresh derived data once
+        search.rebuild_index()
+        search.invalidate_autocomplete()
+        facets.invalidate_facets()
+        Cart.recalculate(Cart.objects.filter(item_count__gt=0))  # Prices may have changed
+
+        self.stdout.write(self.style.SUCCESS(
+            f'\n✓ {totals["upserted"]} upserted, {totals["updated"]} updated, '
+            f'{totals["skipped"]} skipped in {time.monotonic() - started:.2f}s'
+        ))
+
+    def clean_row(self, row):
+        """Return (slug, values) for a raw row; raise ValueError if invalid"""
+        values = {}
+        for field in IMPORT_FIELDS:
+            if field not in row or row[field] is None:
+                continue
+            value = row[field]
+            if field == 'price':
+                try:
+                    value = Decimal(str(value))
+                except InvalidOperation:
+                    raise ValueError(f'invalid price {value!r}')
+            elif field == 'stock':
+                value = int(value) if str(value).strip() != '' else None
+                if value is not None and value < 0:
+                    raise ValueError(f'negative stock {value}')
+            else:
+                value = str(value).strip()
+            values[field] = value
+
+        slug = (row.get('slug') or '').strip() or slugify(values.get('name', ''))
+        if not slug:
+            raise ValueError('row has neither slug nor name')
+        return slug, values
+
+    def import_chunk(self, rows):
+        counts = {'upserted': 0, 'updated': 0, 'skipped': 0}
+
+        cleaned = {}
+        for row in rows:
+            try:
+                slug, values = self.clean_row(row)
+            except ValueError as e:
+                self.stderr.write(f'  Skipping row: {e}')
+                counts['skipped'] += 1
+                continue
+            cleaned[slug] = values  # Last occurrence of a slug wins
+
+        # Full rows can be upserted in one statement
+        full = {slug: values for slug, values in cleaned.items() if all(f in values for f in REQUIRED_FIELDS)}
+        # Partial rows (e.g. slug,price for a re-pricing) only update existing products
+        partial = {slug: values for slug, values in cleaned.items() if slug not in full}
+
+        with transaction.atomic():
+            for fields, group in self.group_by_fields(full).items():
+                Product.objects.bulk_create(
+                    [Product(slug=slug, **values) for slug, values in group.items()],
+                    update_conflicts=True,
+                    unique_fields=['slug'],
+                    update_fields=list(fields) + ['updated_at'],
+                )
+                counts['upserted'] += len(group)
+
+            for fields, group in self.group_by_fields(partial).items():
+                existing = Product.objects.in_bulk(list(group), field_name='slug')
+                now = timezone.now()
+                for slug, values in group.items():
+                    product = existing.get(slug)
+                    if product is None:
+                        missing = ', '.join(f for f in REQUIRED_FIELDS if f not in values)
+                        self.stderr.write(f'  Skipping {slug}: unknown slug and missing {missing}')
+                        counts['skipped'] += 1
+                        continue
+                    for field, value in values.items():
+                        setattr(product, field, value)
+                    product.updated_at = now
+                Product.objects.bulk_update(list(existing.values()), list(fields) + ['updated_at'], batch_size=500)
+                counts['updated'] += len(existing)
+
+        return counts
+
+    def group_by_fields(self, rows):
+        """Group rows by the set of columns they carry, so each group is one statement"""
+        groups = {}
+        for slug, values in rows.items():
+            groups.setdefault(tuple(sorted(values)), {})[slug] = values
+        return groups
@@ -0,0 +1,32 @@
+# Generated by Django 5.2.8 on 2026-10-18 10:00
+
+import cloudinary.models
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('products', '0005_product_search_index'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ProductImage',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('image', cloudinary.models.CloudinaryField(max_length=255, verbose_name='image')),
+                ('position', models.PositiveSmallIntegerField(default=0, help_text='Lower comes first')),
+                ('alt_text', models.CharField(blank=True, max_length=255)),
+                ('thumbnail_url', models.URLField(blank=True, max_length=500)),
+                ('display_url', models.URLField(blank=True, max_length=500)),
+                ('srcset', models.JSONField(blank=True, default=dict, help_text='format -> srcset string')),
+                ('product', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='images', to='products.product')),
+            ],
+            options={
+                'ordering': ['position', 'id'],
+                'indexes': [models.Index(fields=['product', 'position'], name='products_pr_product_78e37c_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,79 @@
+# Move picture, picture_2 and picture_3 into ProductImage rows and
+# precompute their responsive variants.
+
+from django.db import migrations
+
+PICTURE_FIELDS = ('picture', 'picture_2', 'picture_3')
+
+# Frozen copy of ProductImage.WIDTHS / FORMATS at the time of this migration
+WIDTHS = (320, 640, 1024)
+FORMATS = ('webp', 'jpg')
+
+
+def raw_value(product, field):
+    """Stored Cloudinary reference ("image/upload/v1/id.jpg") or ''"""
+    value = getattr(product, field)
+    return str(getattr(value, 'name', value) or '')
+
+
+def build_variants(value):
+    from cloudinary.models import CloudinaryField
+
+    resource = CloudinaryField().parse_cloudinary_resource(value)
+
+    def url(width, fmt):
+        return resource.build_url(width=width, crop='limit', quality='auto', format=fmt, secure=True)
+
+    return {
+        'srcset': {
+            fmt: ', '.join(f"{url(width, fmt)} {width}w" for width in WIDTHS)
+            for fmt in FORMATS
+        },
+        'thumbnail_url': url(WIDTHS[0], 'jpg'),
+        'display_url': url(WIDTHS[-1], 'jpg'),
+    }
+
+
+def copy_pictures(apps, schema_editor):
+    Product = apps.get_model('products', 'Product')
+    ProductImage = apps.get_model('products', 'ProductImage')
+
+    images = []
+    for product in Product.objects.iterator(chunk_size=500):
+        position = 0
+        for field in PICTURE_FIELDS:
+            value = raw_value(product, field)
+            if not value:
+                continue
+            images.append(ProductImage(
+                product_id=product.id,
+                image=value,
+                position=position,
+                alt_text=product.name,
+                **build_variants(value),
+            ))
+            position += 1
+
+    ProductImage.objects.bulk_create(images, batch_size=500)
+
+
+def restore_pictures(apps, schema_editor):
+    Product = apps.get_model('products', 'Product')
+    ProductImage = apps.get_model('products', 'ProductImage')
+
+    for product in Product.objects.iterator(chunk_size=500):
+        images = ProductImage.objects.filter(product_id=product.id).order_by('position', 'id')[:3]
+        for field, image in zip(PICTURE_FIELDS, images):
+            setattr(product, field, image.image.get_prep_value())
+        product.save(update_fields=list(PICTURE_FIELDS))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('products', '0006_productimage'),
+    ]
+
+    operations = [
+        migrations.RunPython(copy_pictures, restore_pictures),
+    ]
@@ -0,0 +1,25 @@
+# Generated by Django 5.2.8 on 2026-10-18 10:00
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('products', '0007_copy_product_pictures'),
+    ]
+
+    operations = [
+        migrations.RemoveField(
+            model_name='product',
+            name='picture',
+        ),
+        migrations.RemoveField(
+            model_name='product',
+            name='picture_2',
+        ),
+        migrations.RemoveField(
+            model_name='product',
+            name='picture_3',
+        ),
+    ]
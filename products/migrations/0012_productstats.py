@@ -0,0 +1,29 @@
+# Generated by Django 5.2.8 on 2026-10-18 10:30
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('products', '0011_recommendations'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ProductStats',
+            fields=[
+                ('product', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='stats', serialize=False, to='products.product')),
+                ('view_count', models.PositiveBigIntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name_plural': 'Product stats',
+                'indexes': [
+                    models.Index(fields=['-view_count'], name='products_pr_view_co_96982d_idx'),
+                    models.Index(fields=['updated_at'], name='products_pr_updated_2d85ce_idx'),
+                ],
+            },
+        ),
+    ]
@@ -0,0 +1,26 @@
+# Generated by Django 5.2.8 on 2026-10-18 17:00
+
+from django.db import migrations, models
+from django.db.models.functions import Coalesce, Now
+
+
+def backfill_created_at(apps, schema_editor):
+    """Date products created before created_at existed by their last edit"""
+    Product = apps.get_model('products', 'Product')
+    Product.objects.filter(created_at__isnull=True).update(created_at=Coalesce('updated_at', Now()))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('products', '0012_productstats'),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_created_at, migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name='product',
+            name='created_at',
+            field=models.DateTimeField(auto_now_add=True),
+        ),
+    ]
@@ -8,11 +8,13 @@ class Product(models.Model):
     category = models.CharField(max_length=100)
     quantity = models.CharField(max_length=50)
     price = models.DecimalField(max_digits=10, decimal_places=2)
+    stock = models.PositiveIntegerField(
+        blank=True,
+        null=True,
+        help_text="Units available; leave empty to sell without tracking stock",
+    )
     description = models.TextField(blank=True)
-    picture =CloudinaryField('picture',blank=True, null=True)
-    picture_2 = CloudinaryField('picture_2',blank=True, null=True)
-    picture_3 =CloudinaryField('picture_3',blank=True, null=True)
-    created_at = models.DateTimeField(auto_now_add=True, blank=True, null=True)
+    created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True, blank=True, null=True)
     
     class Meta:
@@ -20,6 +22,8 @@ class Product(models.Model):
         indexes = [
             models.Index(fields=['category']),
             models.Index(fields=['slug']),
+            models.Index(fields=['-created_at', '-id']),  # Catalog keyset pagination
+            models.Index(fields=['updated_at']),  # Conditional GET freshness checks
         ]
     
     def save(self, *args, **kwargs):
@@ -29,16 +33,133 @@ class Product(models.Model):
     
     def __str__(self):
         return self.name
+
+    @property
+    def in_stock(self):
+        return self.stock is None or self.stock > 0
     
     def get_images(self):
         """Return list of available product images"""
-        images = []
-        if self.picture:
-            images.append(self.picture.url)
-        if self.picture_2:
-            images.append(self.picture_2.url)
-        if self.picture_3:
-            images.append(self.picture_3.url)
+        images = [image.display_url for image in self.images.all()]
 
         return images if images else ['/static/Images/jarofhoney.jpg']
 
+    @property
+    def main_image(self):
+        """First gallery image; uses the prefetch cache when available"""
+        images = self.images.all()
+        return images[0] if images else None
+
+
+class ProductImage(models.Model):
+    """One image in a product gallery, with its responsive variants"""
+
+    # Responsive variants built for every image: widths in px and formats
+    WIDTHS = (320, 640, 1024)
+    FORMATS = ('webp', 'jpg')
+
+    product = models.ForeignKey(Product, on_delete=models.CASCADE, related_name='images')
+    image = CloudinaryField('image')
+    position = models.PositiveSmallIntegerField(default=0, help_text="Lower comes first")
+    alt_text = models.CharField(max_length=255, blank=True)
+
+    # Precomputed Cloudinary URLs, rebuilt on save
+    thumbnail_url = models.URLField(max_length=500, blank=True)
+    display_url = models.URLField(max_length=500, blank=True)
+    srcset = models.JSONField(default=dict, blank=True, help_text="format -> srcset string")
+
+    class Meta:
+        ordering = ['position', 'id']
+        indexes = [
+            models.Index(fields=['product', 'position']),
+        ]
+
+    def save(self, *args, **kwargs):
+        super().save(*args, **kwargs)
+        # The Cloudinary public id is only known after the upload in save()
+        if self.image:
+            self.build_variants()
+            super().save(update_fields=['thumbnail_url', 'display_url', 'srcset'])
+
+    def __str__(self):
+        return f"{self.product.name} - Image {self.position + 1}"
+
+    def build_variants(self):
+        """Compute resized/reformatted delivery URLs for this image"""
+        self.srcset = {
+            fmt: ', '.join(
+                f"{self.variant_url(width, fmt)} {width}w" for width in self.WIDTHS
+            )
+            for fmt in self.FORMATS
+        }
+        self.thumbnail_url = self.variant_url(self.WIDTHS[0], 'jpg')
+        self.display_url = self.variant_url(self.WIDTHS[-1], 'jpg')
+
+    def variant_url(self, width, fmt):
+        # The field holds a plain string until it is reloaded from the database
+        image = self._meta.get_field('image').to_python(self.image)
+        return image.build_url(
+            width=width,
+            crop='limit',
+            quality='auto',
+            format=fmt,
+            secure=True,
+        )
+
+
+class ProductCooccurrence(models.Model):
+    """How many orders contained both product and other_product"""
+    product = models.ForeignKey(Product, on_delete=models.CASCADE, related_name='+')
+    other_product = models.ForeignKey(Product, on_delete=models.CASCADE, related_name='+')
+    count = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['product', 'other_product'], name='unique_product_cooccurrence'),
+        ]
+
+
+class ProductRecommendation(models.Model):
+    """Precomputed "customers also bought" list, top-K per product"""
+    product = models.ForeignKey(Product, on_delete=models.CASCADE, related_name='recommendations')
+    recommended = models.ForeignKey(Product, on_delete=models.CASCADE, related_name='recommended_for')
+    score = models.PositiveIntegerField(help_text="Number of orders containing both products")
+    rank = models.PositiveSmallIntegerField()
+
+    class Meta:
+        ordering = ['product', 'rank']
+        indexes = [
+            models.Index(fields=['product', 'rank']),
+        ]
+
+    def __str__(self):
+        return f"{self.product.name} -> {self.recommended.name} ({self.score})"
+
+
+class RecommendationRun(models.Model):
+    """Checkpoint of the recommendation builder: orders up to last_order_id are counted"""
+    last_order_id = models.BigIntegerField(default=0)
+    orders_processed = models.PositiveIntegerField(default=0)
+    products_updated = models.PositiveIntegerField(default=0)
+    full_rebuild = models.BooleanField(default=False)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ['-id']
+
+
+class ProductStats(models.Model):
+    """Popularity counters, written in batches by products.stats.flush_views"""
+    product = models.OneToOneField(Product, on_delete=models.CASCADE, primary_key=True, related_name='stats')
+    view_count = models.PositiveBigIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name_plural = "Product stats"
+        indexes = [
+            models.Index(fields=['-view_count']),
+            models.Index(fields=['updated_at']),
+        ]
+
+    def __str__(self):
+        return f"{self.product.name}: {self.view_count} views"
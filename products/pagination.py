@@ -0,0 +1,145 @@
+import base64
+import json
+
+from django.core.exceptions import ObjectDoesNotExist, ValidationError
+from django.db.models import F, Q
+from django.db.models.constants import LOOKUP_SEP
+
+# Sort options offered on the catalog page: key -> (field, descending).
+# Every ordering is tie-broken on id in the same direction so the
+# (field, id) pair is unique and can be used as a keyset cursor.
+SORT_ORDERINGS = {
+    'none': ('created_at', True),  # Follows Product.Meta.ordering
+    'price-low': ('price', False),
+    'price-high': ('price', True),
+    'name-az': ('name', False),
+    'name-za': ('name', True),
+    'most-viewed': ('stats__view_count', True),  # Products never viewed come last
+}
+
+DEFAULT_SORT = 'none'
+
+
+def get_sort(sort):
+    """Return a valid sort key, falling back to the default ordering"""
+    return sort if sort in SORT_ORDERINGS else DEFAULT_SORT
+
+
+def field_value(obj, field):
+    """Follow a field path like 'stats__view_count'; None if a link is missing"""
+    for name in field.split(LOOKUP_SEP):
+        try:
+            obj = getattr(obj, name)
+        except ObjectDoesNotExist:
+            return None
+        if obj is None:
+            return None
+    return obj
+
+
+def model_field(model, field):
+    """Resolve a field path to the model field at its end"""
+    *relations, name = field.split(LOOKUP_SEP)
+    for relation in relations:
+        model = model._meta.get_field(relation).related_model
+    return model._meta.get_field(name)
+
+
+def nullable(model, field):
+    """Whether field can be NULL: a nullable column, or one reached through a join"""
+    return LOOKUP_SEP in field or model_field(model, field).null
+
+
+def order_queryset(queryset, sort):
+    """
+    Order queryset by (field, id) for the given sort key.
+
+    NULLS LAST is only asked for where the field can be NULL: on a NOT
+    NULL column a plain ORDER BY matches the (field, id) index as is.
+    """
+    field, descending = SORT_ORDERINGS[get_sort(sort)]
+    ordering = F(field).desc() if descending else F(field).asc()
+    if nullable(queryset.model, field):
+        ordering.nulls_last = True
+    return queryset.order_by(ordering, '-id' if descending else 'id')
+
+
+def encode_cursor(product, sort):
+    """Encode the keyset position of product as an opaque URL-safe string"""
+    field, _ = SORT_ORDERINGS[get_sort(sort)]
+    value = field_value(product, field)
+    if value is not None:
+        value = value.isoformat() if hasattr(value, 'isoformat') else str(value)
+    payload = json.dumps([value, product.pk], separators=(',', ':'))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip('=')
+
+
+def decode_cursor(cursor, model, sort):
+    """Decode a cursor back to (value, pk); return None if it is invalid"""
+    if not cursor:
+        return None
+    field, _ = SORT_ORDERINGS[get_sort(sort)]
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        value, pk = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        if value is not None:
+            value = model_field(model, field).to_python(value)
+        return value, int(pk)
+    except (ValueError, TypeError, ValidationError):
+        return None
+
+
+def after_cursor(queryset, position, sort):
+    """
+    Filter queryset to the non-NULL rows strictly after position.
+
+    Written as field <= value AND (field < value OR id < pk) rather than
+    with an OR over the whole condition, so the database can range-scan
+    the (field, id) index from the cursor instead of sorting the rest of
+    the table. Where the field can be NULL, the NULL rows, which sort
+    last, are read separately with null_tail().
+    """
+    field, descending = SORT_ORDERINGS[get_sort(sort)]
+    value, pk = position
+    op = 'lt' if descending else 'gt'
+
+    # NULLs sort last, so a NULL position only has NULL rows after it
+    if value is None:
+        return queryset.filter(**{f'{field}__isnull': True, f'id__{op}': pk})
+
+    condition = Q(**{f'{field}__{op}e': value}) & (Q(**{f'{field}__{op}': value}) | Q(**{f'id__{op}': pk}))
+    return queryset.filter(condition)
+
+
+def null_tail(queryset, sort):
+    """Rows whose sort field is NULL, which come after every other row"""
+    field, _ = SORT_ORDERINGS[get_sort(sort)]
+    return queryset.filter(**{f'{field}__isnull': True})
+
+
+def paginate(queryset, cursor=None, sort=DEFAULT_SORT, page_size=12):
+    """
+    Return (items, next_cursor) for one page of queryset.
+
+    Uses keyset pagination, so the cost of a page does not grow with how
+    deep into the catalog the visitor has scrolled.
+    """
+    sort = get_sort(sort)
+    queryset = order_queryset(queryset, sort)
+
+    # Fetch one extra row to know whether there is a next page
+    position = decode_cursor(cursor, queryset.model, sort)
+    if position is None:
+        items = list(queryset[:page_size + 1])
+    else:
+        items = list(after_cursor(queryset, position, sort)[:page_size + 1])
+        # Ran out of non-NULL values mid-page: carry on into the NULL rows
+        field, _ = SORT_ORDERINGS[sort]
+        if position[0] is not None and len(items) <= page_size and nullable(queryset.model, field):
+            items += list(null_tail(queryset, sort)[:page_size + 1 - len(items)])
+    next_cursor = None
+    if len(items) > page_size:
+        items = items[:page_size]
+        next_cursor = encode_cursor(items[-1], sort)
+
+    return items, next_cursor
@@ -0,0 +1,184 @@
+import numpy as np
+from scipy import sparse
+from django.db import transaction
+from django.db.models.functions import Now
+
+from .models import Product, ProductCooccurrence, ProductRecommendation, RecommendationRun
+
+TOP_K = 4
+
+
+def order_baskets(last_order_id, chunk_size):
+    """
+    Yield (order_ids, product_ids) arrays for orders after last_order_id.
+
+    Chunks always end on an order boundary so a basket is never split.
+    """
+    from orders.models import OrderItem
+
+    rows = (
+        OrderItem.objects.filter(order_id__gt=last_order_id)
+        .exclude(order__status='cancelled')
+        .order_by('order_id')
+        .values_list('order_id', 'product_id')
+        .distinct()
+        .iterator(chunk_size=chunk_size)
+    )
+
+    chunk = []
+    for order_id, product_id in rows:
+        if len(chunk) >= chunk_size and order_id != chunk[-1][0]:
+            yield np.array(chunk, dtype=np.int64).T
+            chunk = []
+        chunk.append((order_id, product_id))
+    if chunk:
+        yield np.array(chunk, dtype=np.int64).T
+
+
+def cooccurrence_counts(baskets, product_ids):
+    """
+    Count, for every product pair, the orders that contain both.
+
+    Each chunk becomes a sparse orders x products incidence matrix X and
+    adds X.T @ X to the total, so the work is a handful of matrix products
+    instead of a Python loop over pairs, and grows with the items sold
+    rather than with the square of the catalog. Only the rows of products
+    found in baskets are non-empty. Returns (counts, order_count,
+    last_order_id) with counts a CSR matrix indexed like product_ids.
+    """
+    size = len(product_ids)
+    counts = sparse.csr_matrix((size, size), dtype=np.int64)
+    order_count = 0
+    last_order_id = None
+
+    for order_ids, item_product_ids in baskets:
+        # Skip items whose product was deleted while we were reading
+        columns = np.searchsorted(product_ids, item_product_ids)
+        known = (columns < size) & (product_ids[np.minimum(columns, size - 1)] == item_product_ids)
+        order_ids, columns = order_ids[known], columns[known]
+
+        unique_orders, rows = np.unique(order_ids, return_inverse=True)
+        incidence = sparse.csr_matrix(
+            (np.ones(len(rows), dtype=np.int64), (rows, columns)), shape=(len(unique_orders), size)
+        )
+        counts = counts + incidence.T @ incidence
+
+        order_count += len(unique_orders)
+        if len(unique_orders):
+            last_order_id = int(unique_orders[-1])
+
+    # A product is not related to itself
+    counts = (sparse.triu(counts, 1) + sparse.tril(counts, -1)).tocsr()
+    return counts, order_count, last_order_id
+
+
+def top_k(rows, k):
+    """Yield (columns, counts) of the k highest counts of every row of a CSR matrix"""
+    rows.sort_indices()
+    for n in range(rows.shape[0]):
+        start, end = rows.indptr[n], rows.indptr[n + 1]
+        # Stable on sorted columns, so ties go to the lowest product id
+        best = np.argsort(-rows.data[start:end], kind='stable')[:k]
+        yield rows.indices[start:end][best], rows.data[start:end][best]
+
+
+@transaction.atomic
+def build_recommendations(full=False, k=TOP_K, chunk_size=5000):
+    """
+    Fold new orders into the co-occurrence counts and refresh top-k lists.
+
+    Only products that appear in new orders are rewritten, so a periodic
+    run costs time proportional to recent sales, not to order history.
+    Pass full=True to recount everything, e.g. after orders are cancelled.
+    """
+    previous = RecommendationRun.objects.first()
+    last_order_id = 0 if full or previous is None else previous.last_order_id
+
+    product_ids = np.array(
+        Product.objects.order_by('id').values_list('id', flat=True), dtype=np.int64
+    )
+    if full:
+        ProductCooccurrence.objects.all().delete()
+        ProductRecommendation.objects.all().delete()
+
+    if len(product_ids) == 0:
+        return RecommendationRun.objects.create(last_order_id=last_order_id, full_rebuild=full)
+
+    delta, order_count, new_last_order_id = cooccurrence_counts(
+        order_baskets(last_order_id, chunk_size), product_ids
+    )
+    affected = np.flatnonzero(np.diff(delta.indptr))
+
+    # Full rows for the affected products only: stored counts plus the new ones
+    rows = delta[affected]
+    if not full and len(affected):
+        position = {int(product_ids[i]): n for n, i in enumerate(affected)}
+        column = {int(pid): i for i, pid in enumerate(product_ids)}
+        stored = ProductCooccurrence.objects.filter(
+            product_id__in=list(position)
+        ).values_list('product_id', 'other_product_id', 'count')
+        stored_rows, stored_columns, stored_counts = [], [], []
+        for product_id, other_product_id, count in stored.iterator(chunk_size=chunk_size):
+            if other_product_id in column:
+                stored_rows.append(position[product_id])
+                stored_columns.append(column[other_product_id])
+                stored_counts.append(count)
+        rows = rows + sparse.csr_matrix(
+            (np.array(stored_counts, dtype=np.int64), (stored_rows, stored_columns)), shape=rows.shape
+        )
+
+    affected_ids = [int(product_ids[i]) for i in affected]
+
+    # Persist the updated counts
+    pairs = rows.tocoo()
+    ProductCooccurrence.objects.bulk_create(
+        [
+            ProductCooccurrence(
+                product_id=affected_ids[n],
+                other_product_id=int(product_ids[i]),
+                count=int(count),
+            )
+            for n, i, count in zip(pairs.row, pairs.col, pairs.data)
+            if count > 0
+        ],
+        batch_size=1000,
+        update_conflicts=True,
+        unique_fields=['product', 'other_product'],
+        update_fields=['count'],
+    )
+
+    # Replace the top-k lists of the affected products
+    ProductRecommendation.objects.filter(product_id__in=affected_ids).delete()
+    ProductRecommendation.objects.bulk_create(
+        [
+            ProductRecommendation(
+                product_id=affected_ids[n],
+                recommended_id=int(product_ids[i]),
+                score=int(score),
+                rank=rank,
+            )
+            for n, (best, scores) in enumerate(top_k(rows, k))
+            for rank, (i, score) in enumerate(zip(best, scores))
+            if score > 0
+        ],
+        batch_size=1000,
+    )
+
+    # New recommendations change the product pages, so invalidate their ETags
+    Product.objects.filter(id__in=affected_ids).update(updated_at=Now())
+
+    return RecommendationRun.objects.create(
+        last_order_id=new_last_order_id if new_last_order_id is not None else last_order_id,
+        orders_processed=order_count,
+        products_updated=len(affected_ids),
+        full_rebuild=full,
+    )
+
+
+def get_recommendations(product, k=TOP_K):
+    """Products frequently bought with product, best first"""
+    return (
+        Product.objects.filter(recommended_for__product=product)
+        .order_by('recommended_for__rank')
+        .prefetch_related('images')[:k]
+    )
@@ -0,0 +1,236 @@
+import re
+import threading
+import time
+import unicodedata
+
+from django.core.cache import cache
+from django.db import connection
+from django.db.models import Q
+
+from .models import Product
+
+# Text search configuration. 'simple' does no stemming, which suits our
+# mixed French/English/Arabic product names better than a language config.
+SEARCH_CONFIG = 'simple'
+
+# Name of the FTS5 table used on SQLite (created in migration 0005)
+FTS_TABLE = 'products_product_fts'
+
+AUTOCOMPLETE_LIMIT = 8
+AUTOCOMPLETE_VERSION_KEY = 'products_autocomplete_version'
+AUTOCOMPLETE_MAX_AGE = 300  # Rebuild at least every 5 minutes
+
+TOKEN_RE = re.compile(r'\w+', re.UNICODE)
+
+
+def normalize(text):
+    """Lowercase and strip accents so 'Médéa' matches 'medea'"""
+    text = unicodedata.normalize('NFKD', text or '')
+    return ''.join(c for c in text if not unicodedata.combining(c)).lower()
+
+
+def tokenize(text):
+    return TOKEN_RE.findall(normalize(text))
+
+
+# ==================== Full-text search ====================
+
+def search_vector():
+    """Weighted document vector; must match the GIN index in migration 0005"""
+    from django.contrib.postgres.search import SearchVector
+    return (
+        SearchVector('name', weight='A', config=SEARCH_CONFIG)
+        + SearchVector('description', weight='B', config=SEARCH_CONFIG)
+    )
+
+
+def _search_postgres(query, offset, limit):
+    from django.contrib.postgres.search import SearchQuery, SearchRank
+
+    search_query = SearchQuery(query, search_type='websearch', config=SEARCH_CONFIG)
+    vector = search_vector()
+    queryset = (
+        Product.objects.annotate(document=vector)
+        .filter(document=search_query)
+        .annotate(rank=SearchRank(vector, search_query))
+        .order_by('-rank', '-id')
+    )
+    return list(queryset[offset:offset + limit])
+
+
+def _fts5_query(query):
+    """Build a safe FTS5 MATCH expression: every term must prefix-match"""
+    return ' '.join('"%s"*' % token.replace('"', '""') for token in tokenize(query))
+
+
+def _search_sqlite(query, offset, limit):
+    match = _fts5_query(query)
+    if not match:
+        return []
+
+    # bm25() returns lower-is-better scores; name hits weigh 10x description
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f'SELECT rowid FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s '
+            f'ORDER BY bm25({FTS_TABLE}, 10.0, 1.0), rowid DESC LIMIT %s OFFSET %s',
+            [match, limit, offset],
+        )
+        ids = [row[0] for row in cursor.fetchall()]
+
+    products = Product.objects.in_bulk(ids)
+    return [products[pk] for pk in ids if pk in products]
+
+
+def _search_fallback(query, offset, limit):
+    """Unindexed search for databases without a text index"""
+    condition = Q()
+    for token in query.split():
+        condition &= Q(name__icontains=token) | Q(description__icontains=token)
+    return list(Product.objects.filter(condition).order_by('-id')[offset:offset + limit])
+
+
+def search_products(query, page=1, page_size=12):
+    """
+    Return (products, has_next) for one page of ranked search results.
+
+    Uses a GIN-indexed tsvector on PostgreSQL and the FTS5 table on SQLite.
+    """
+    query = (query or '').strip()
+    if not query:
+        return [], False
+
+    offset = (max(page, 1) - 1) * page_size
+    limit = page_size + 1  # One extra row tells us if there is a next page
+
+    if connection.vendor == 'postgresql':
+        results = _search_postgres(query, offset, limit)
+    elif connection.vendor == 'sqlite':
+        results = _search_sqlite(query, offset, limit)
+    else:
+        results = _search_fallback(query, offset, limit)
+
+    return results[:page_size], len(results) > page_size
+
+
+def index_product(product):
+    """Insert or refresh one product in the SQLite FTS5 table"""
+    if connection.vendor != 'sqlite':
+        return  # PostgreSQL indexes the columns directly
+    with connection.cursor() as cursor:
+        cursor.execute(f'DELETE FROM {FTS_TABLE} WHERE rowid = %s', [product.pk])
+        cursor.execute(
+            f'INSERT INTO {FTS_TABLE}(rowid, name, description) VALUES (%s, %s, %s)',
+            [product.pk, product.name, product.description],
+        )
+
+
+def unindex_product(product_id):
+    """Remove one product from the SQLite FTS5 table"""
+    if connection.vendor != 'sqlite':
+        return
+    with connection.cursor() as cursor:
+        cursor.execute(f'DELETE FROM {FTS_TABLE} WHERE rowid = %s', [product_id])
+
+
+def rebuild_index():
+    """Rebuild the SQLite FTS5 table, e.g. after bulk updates that skip signals"""
+    if connection.vendor != 'sqlite':
+        return
+    with connection.cursor() as cursor:
+        cursor.execute(f'DELETE FROM {FTS_TABLE}')
+        cursor.execute(
+            f'INSERT INTO {FTS_TABLE}(rowid, name, description) '
+            f'SELECT id, name, description FROM {Product._meta.db_table}'
+        )
+
+
+# ==================== Autocomplete ====================
+
+class ProductTrie:
+    """
+    Prefix tree over the words of product names.
+
+    Each node keeps the first few matching products, so a lookup costs
+    O(len(prefix)) and never touches the database.
+    """
+
+    def __init__(self, limit=AUTOCOMPLETE_LIMIT):
+        self.limit = limit
+        self.root = {}
+
+    def insert(self, key, entry):
+        node = self.root
+        for char in key:
+            node = node.setdefault(char, {})
+            matches = node.setdefault('', [])  # '' never collides with a char
+            if len(matches) < self.limit and entry not in matches:
+                matches.append(entry)
+
+    def lookup(self, prefix):
+        node = self.root
+        for char in prefix:
+            node = node.get(char)
+            if node is None:
+                return []
+        return node.get('', [])
+
+    @classmethod
+    def build(cls, products):
+        trie = cls()
+        for name, slug in products:
+            entry = {'name': name, 'slug': slug}
+            words = tokenize(name)
+            # Index the name from every word so "fleurs" finds "Miel multi fleurs"
+            for i in range(len(words)):
+                trie.insert(' '.join(words[i:]), entry)
+        return trie
+
+
+_trie = None
+_trie_version = None
+_trie_built_at = 0
+_trie_lock = threading.Lock()
+
+
+def invalidate_autocomplete():
+    """Tell every worker to rebuild its trie on the next lookup"""
+    try:
+        cache.incr(AUTOCOMPLETE_VERSION_KEY)
+    except ValueError:
+        cache.set(AUTOCOMPLETE_VERSION_KEY, 1, None)
+
+    global _trie
+    _trie = None  # Drop this process's copy right away
+
+
+def get_trie():
+    global _trie, _trie_version, _trie_built_at
+
+    version = cache.get(AUTOCOMPLETE_VERSION_KEY, 0)
+    trie = _trie
+    if (
+        trie is not None
+        and version == _trie_version
+        and time.monotonic() - _trie_built_at < AUTOCOMPLETE_MAX_AGE
+    ):
+        return trie
+
+    with _trie_lock:
+        if _trie is trie:  # Nobody rebuilt it while we waited
+            products = (
+                Product.objects.filter(slug__isnull=False)
+                .order_by('name')
+                .values_list('name', 'slug')
+            )
+            _trie = ProductTrie.build(products)
+            _trie_version = version
+            _trie_built_at = time.monotonic()
+        return _trie
+
+
+def autocomplete(prefix, limit=AUTOCOMPLETE_LIMIT):
+    """Return up to limit {name, slug} suggestions for a typed prefix"""
+    prefix = ' '.join(tokenize(prefix))
+    if not prefix:
+        return []
+    return get_trie().lookup(prefix)[:limit]
@@ -0,0 +1,51 @@
+from django.core.cache import cache
+from django.db.models.signals import pre_save, post_save, post_delete
+from django.dispatch import receiver
+from django.utils import timezone
+
+from .models import Product, ProductImage
+from . import facets, search
+
+
+@receiver(pre_save, sender=Product)
+def remember_facet_values(sender, instance, **kwargs):
+    """Record the old category/price so cached facets can be patched"""
+    instance._facet_previous = None
+    if instance.pk and cache.get(facets.FACETS_CACHE_KEY) is not None:
+        instance._facet_previous = (
+            Product.objects.filter(pk=instance.pk)
+            .values_list('category', 'price')
+            .first()
+        )
+
+
+@receiver(post_save, sender=Product)
+def product_saved(sender, instance, created, **kwargs):
+    """Keep the search index, autocomplete trie and facets in sync with the catalog"""
+    search.index_product(instance)
+    search.invalidate_autocomplete()
+
+    price = Product._meta.get_field('price').to_python(instance.price)
+    current = (instance.category, price)
+    previous = getattr(instance, '_facet_previous', None)
+    if created:
+        facets.update_facets(added=current)
+    elif previous is None:
+        facets.invalidate_facets()
+    elif previous != current:
+        facets.update_facets(added=current, removed=previous)
+
+
+@receiver(post_delete, sender=Product)
+def product_deleted(sender, instance, **kwargs):
+    search.unindex_product(instance.pk)
+    search.invalidate_autocomplete()
+    price = Product._meta.get_field('price').to_python(instance.price)
+    facets.update_facets(removed=(instance.category, price))
+
+
+@receiver(post_save, sender=ProductImage)
+@receiver(post_delete, sender=ProductImage)
+def product_image_changed(sender, instance, **kwargs):
+    """Bump the product's updated_at so cached pages are revalidated"""
+    Product.objects.filter(pk=instance.product_id).update(updated_at=timezone.now())
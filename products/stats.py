@@ -0,0 +1,79 @@
+import atexit
+import logging
+import threading
+import time
+from collections import Counter
+
+from django.db import DatabaseError, transaction
+from django.db.models import BigIntegerField, Case, F, Value, When
+from django.db.models.functions import Now
+
+from .models import Product, ProductStats
+
+logger = logging.getLogger(__name__)
+
+FLUSH_INTERVAL = 60  # Seconds between batched writes of buffered views
+
+# Views counted by this process since the last flush: slug -> count.
+# A page view only touches this dict; the database sees one batch per
+# interval no matter how busy the product pages are.
+_buffer = Counter()
+_last_flush = time.monotonic()
+_lock = threading.Lock()
+
+
+def record_view(slug):
+    """Count one product page view, flushing the buffer when it is due"""
+    with _lock:
+        _buffer[slug] += 1
+        due = time.monotonic() - _last_flush >= FLUSH_INTERVAL
+    if due:
+        flush_views()
+
+
+def flush_views():
+    """
+    Add the buffered views to ProductStats and empty the buffer.
+
+    Costs one SELECT to resolve slugs, one INSERT for products seen for
+    the first time and one UPDATE for the whole batch. Returns the number
+    of products updated.
+    """
+    global _buffer, _last_flush
+    with _lock:
+        pending, _buffer = _buffer, Counter()
+        _last_flush = time.monotonic()
+    if not pending:
+        return 0
+
+    try:
+        ids = dict(Product.objects.filter(slug__in=list(pending)).values_list('slug', 'id'))
+        counts = {ids[slug]: count for slug, count in pending.items() if slug in ids}
+        if not counts:
+            return 0
+
+        with transaction.atomic():
+            ProductStats.objects.bulk_create(
+                [ProductStats(product_id=product_id) for product_id in counts],
+                ignore_conflicts=True,
+            )
+            ProductStats.objects.filter(product_id__in=list(counts)).update(
+                view_count=F('view_count') + Case(
+                    *[When(product_id=product_id, then=Value(count)) for product_id, count in counts.items()],
+                    default=Value(0),
+                    output_field=BigIntegerField(),
+                ),
+                updated_at=Now(),
+            )
+    except DatabaseError as e:
+        # Keep the counts for the next flush rather than losing them
+        logger.error(f"Could not flush product views: {e}")
+        with _lock:
+            _buffer.update(pending)
+        return 0
+
+    return len(counts)
+
+
+# Don't lose the last partial interval when a worker shuts down cleanly
+atexit.register(flush_views)
@@ -1,3 +1,106 @@
+from decimal import Decimal
+
+from django.db import transaction
 from django.test import TestCase
+from django.utils import timezone
+
+from .inventory import OutOfStock, release_stock, reserve_stock
+from .models import Product, ProductStats
+from .pagination import SORT_ORDERINGS, paginate
+
+
+class StockTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.tracked = Product.objects.create(name='Miel de thym', category='Miel', quantity='1kg', price=Decimal('2500'), stock=3)
+        cls.untracked = Product.objects.create(name='Pollen', category='Pollen', quantity='250g', price=Decimal('900'))
+
+    def stock(self):
+        self.tracked.refresh_from_db()
+        return self.tracked.stock
+
+    def test_reserve_never_goes_negative(self):
+        with transaction.atomic():
+            reserve_stock([(self.tracked.pk, 2), (self.tracked.pk, 1)])  # Lines are summed per product
+        self.assertEqual(self.stock(), 0)
+
+        with self.assertRaises(OutOfStock) as raised, transaction.atomic():
+            reserve_stock([(self.tracked.pk, 1)])
+        self.assertEqual(raised.exception.product_id, self.tracked.pk)
+        self.assertEqual(self.stock(), 0)
+
+    def test_failed_reservation_rolls_back_earlier_lines(self):
+        other = Product.objects.create(name='Miel de sidr', category='Miel', quantity='1kg', price=Decimal('4000'), stock=1)
+        with self.assertRaises(OutOfStock), transaction.atomic():
+            reserve_stock([(self.tracked.pk, 2), (other.pk, 2)])
+        other.refresh_from_db()
+        self.assertEqual((self.stock(), other.stock), (3, 1))
+
+    def test_untracked_stock_is_not_counted(self):
+        with transaction.atomic():
+            reserve_stock([(self.untracked.pk, 100)])
+        release_stock([(self.untracked.pk, 100)])
+        self.untracked.refresh_from_db()
+        self.assertIsNone(self.untracked.stock)
+
+    def test_release(self):
+        with transaction.atomic():
+            reserve_stock([(self.tracked.pk, 3)])
+        release_stock([(self.tracked.pk, 2), (self.tracked.pk, 1)])
+        self.assertEqual(self.stock(), 3)
+
+
+class KeysetPaginationTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        created_at = timezone.now()
+        for n in range(11):
+            product = Product.objects.create(
+                name=f'Miel {n % 3}',  # Equal names, prices and dates across pages
+                category='Miel',
+                quantity='1kg',
+                price=Decimal(1000 + 500 * (n % 4)),
+                slug=f'miel-{n}',
+            )
+            Product.objects.filter(pk=product.pk).update(created_at=created_at if n % 2 else timezone.now())
+            if n % 3:  # The rest have never been viewed, so view_count is NULL
+                ProductStats.objects.create(product=product, view_count=n % 2)
+
+    def expected(self, sort):
+        """Every product in the order the sort promises, computed in Python"""
+        field, descending = SORT_ORDERINGS[sort]
+        products = list(Product.objects.select_related('stats'))
+
+        def value(product):
+            if field == 'stats__view_count':
+                try:
+                    return product.stats.view_count
+                except ProductStats.DoesNotExist:
+                    return None
+            return getattr(product, field)
+
+        present = [product for product in products if value(product) is not None]
+        missing = [product for product in products if value(product) is None]
+        present.sort(key=lambda product: (value(product), product.pk), reverse=descending)
+        missing.sort(key=lambda product: product.pk, reverse=descending)
+        return [product.pk for product in present + missing]  # NULLs last
+
+    def test_pages_cover_every_product_once(self):
+        for sort in SORT_ORDERINGS:
+            for page_size in (1, 2, 4, 11, 12):
+                with self.subTest(sort=sort, page_size=page_size):
+                    seen, cursor, pages = [], None, 0
+                    while True:
+                        items, cursor = paginate(Product.objects.all(), cursor, sort, page_size)
+                        self.assertLessEqual(len(items), page_size)
+                        seen += [product.pk for product in items]
+                        pages += 1
+                        if cursor is None:
+                            break
+                        self.assertLess(pages, 20)
+                    self.assertEqual(seen, self.expected(sort))
 
-# Create your tests here.
+    def test_invalid_cursor_starts_over(self):
+        first, _ = paginate(Product.objects.all(), None, 'price-low', 4)
+        again, _ = paginate(Product.objects.all(), 'not-a-cursor', 'price-low', 4)
+        self.assertEqual(first, again)
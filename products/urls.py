@@ -5,5 +5,7 @@ app_name = 'products'
 
 urlpatterns = [
     path('', views.prodects_page, name='product_page'),
+    path('search/', views.search_products, name='search'),
+    path('autocomplete/', views.autocomplete, name='autocomplete'),
     path('<slug:slug>/', views.product_detail, name='product_detail'),
 ]
\ No newline at end of file
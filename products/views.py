@@ -1,11 +1,202 @@
+import hashlib
+from functools import wraps
+
 from django.shortcuts import render, get_object_or_404
-from .models import Product
+from django.http import JsonResponse
+from django.db.models import Count, Max, prefetch_related_objects
+from django.views.decorators.cache import cache_control
+from django.views.decorators.http import condition
+from django.views.decorators.vary import vary_on_cookie
+from cart.context_processors import cart_badge
+from .models import Product, ProductStats
+from .pagination import paginate, get_sort
+from .facets import PRICE_RANGES, get_facets, facet_options, price_range_q
+from .recommendations import get_recommendations
+from . import search, stats
+
+PAGE_SIZE = 12
+
+
+def filter_products(queryset, category=None, price_range=None):
+    """Apply catalog category and price filters in SQL"""
+    if category and category != 'all':
+        queryset = queryset.filter(category=category)
+
+    if price_range in PRICE_RANGES:
+        queryset = queryset.filter(price_range_q(price_range))
+
+    return queryset
+
+
+# ==================== Conditional GET ====================
+# Product pages only change when a product does, so browsers revalidate
+# them with ETag/Last-Modified and get a 304 without a template render.
+
+def make_etag(*parts):
+    return hashlib.md5(':'.join(str(part) for part in parts).encode(), usedforsecurity=False).hexdigest()
+
+
+def visitor_key(request):
+    """Pages embed a CSRF token, login-dependent links and the cart badge"""
+    # Memoized on the request, so the template reuses this count
+    cart_count = cart_badge(request)['cart_count']()
+    return f"{request.user.pk or 'anon'}:{request.META.get('CSRF_COOKIE', '')}:{cart_count}"
+
+
+def catalog_state(request):
+    """Latest updated_at and product count, queried once per request"""
+    if not hasattr(request, '_catalog_state'):
+        state = Product.objects.aggregate(
+            last_modified=Max('updated_at'),
+            count=Count('id'),
+        )
+        # Popularity order changes whenever buffered views are flushed
+        if get_sort(request.GET.get('sort')) == 'most-viewed':
+            state['views_modified'] = ProductStats.objects.aggregate(
+                last_modified=Max('updated_at'),
+            )['last_modified']
+        request._catalog_state = state
+    return request._catalog_state
+
+
+def catalog_etag(request):
+    state = catalog_state(request)
+    return make_etag(state['last_modified'], state['count'], state.get('views_modified'), visitor_key(request))
+
+
+def catalog_last_modified(request):
+    state = catalog_state(request)
+    return max(filter(None, [state['last_modified'], state.get('views_modified')]), default=None)
+
+
+def product_updated_at(request, slug):
+    if not hasattr(request, '_product_updated_at'):
+        request._product_updated_at = (
+            Product.objects.filter(slug=slug).values_list('updated_at', flat=True).first()
+        )
+    return request._product_updated_at
+
 
+def product_etag(request, slug):
+    updated_at = product_updated_at(request, slug)
+    if updated_at is None:
+        return None  # Unknown product or no timestamp, render normally
+    return make_etag(slug, updated_at, visitor_key(request))
+
+
+def count_view(view):
+    """Count product page views, including ones answered with a 304"""
+    @wraps(view)
+    def wrapper(request, slug, *args, **kwargs):
+        response = view(request, slug, *args, **kwargs)
+        if response.status_code in (200, 304):
+            stats.record_view(slug)
+        return response
+    return wrapper
+
+
+@vary_on_cookie
+@cache_control(private=True, no_cache=True)
+@condition(etag_func=catalog_etag, last_modified_func=catalog_last_modified)
 def prodects_page(request):  # Fixed typo
-    products = Product.objects.all()  # Get all products from database
+    category = request.GET.get('category', 'all')
+    price_range = request.GET.get('price', 'all')
+    sort = get_sort(request.GET.get('sort'))
+
+    products = filter_products(
+        Product.objects.select_related('stats').prefetch_related('images'),
+        category,
+        price_range,
+    )
+    products, next_cursor = paginate(
+        products,
+        cursor=request.GET.get('cursor'),
+        sort=sort,
+        page_size=PAGE_SIZE,
+    )
+
+    # Keep the current filters when building the page links
+    params = request.GET.copy()
+    first_query = None
+    if params.pop('cursor', None):
+        first_query = params.urlencode()
+    next_query = None
+    if next_cursor:
+        params['cursor'] = next_cursor
+        next_query = params.urlencode()
+
+    # Filter counts come from the cached facets, not from a table scan
+    options = facet_options(get_facets(), category, price_range)
+
+    return render(request, 'products/prodect_page.html', {
+        'products': products,
+        'facets': options,
+        'selected_category': category,
+        'selected_price': price_range,
+        'selected_sort': sort,
+        'first_query': first_query,
+        'next_query': next_query,
+    })
+
+def search_products(request):
+    """Ranked full-text search over product names and descriptions"""
+    query = request.GET.get('q', '').strip()
+    try:
+        page = max(int(request.GET.get('page', 1)), 1)
+    except ValueError:
+        page = 1
+
+    products, has_next = search.search_products(query, page=page, page_size=PAGE_SIZE)
+    prefetch_related_objects(products, 'images')
+
+    # Check if AJAX request
+    if request.headers.get('X-Requested-With') == 'XMLHttpRequest':
+        return JsonResponse({
+            'query': query,
+            'page': page,
+            'has_next': has_next,
+            'results': [
+                {
+                    'id': product.id,
+                    'name': product.name,
+                    'slug': product.slug,
+                    'category': product.category,
+                    'price': float(product.price),
+                }
+                for product in products
+            ],
+        })
+
+    params = request.GET.copy()
+    first_query = None
+    if page > 1:
+        params['page'] = 1
+        first_query = params.urlencode()
+    next_query = None
+    if has_next:
+        params['page'] = page + 1
+        next_query = params.urlencode()
+
     return render(request, 'products/prodect_page.html', {
-        'products': products
+        'products': products,
+        'search_query': query,
+        'first_query': first_query,
+        'next_query': next_query,
     })
+
+
+def autocomplete(request):
+    """Product name suggestions served from the in-memory trie"""
+    return JsonResponse({'suggestions': search.autocomplete(request.GET.get('q', ''))})
+
+
+@count_view
+@vary_on_cookie
+@cache_control(private=True, no_cache=True)
+@condition(etag_func=product_etag, last_modified_func=product_updated_at)
 def product_detail(request, slug):
-    product = get_object_or_404(Product, slug=slug)
-    return render(request, 'products/product_detail.html', {'product': product})
\ No newline at end of file
+    product = get_object_or_404(Product.objects.prefetch_related('images'), slug=slug)
+    return render(request, 'products/product_detail.html', {
+        'product': product,
+        'recommendations': get_recommendations(product),
+    })
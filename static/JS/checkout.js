@@ -1,62 +1,8 @@
-// Shipping rates data
-const shippingRates = {
-    'Mostaganem': { home: 600, stop: 400 },
-    'Mascara': { home: 750, stop: 450 },
-    'Saida': { home: 750, stop: 450 },
-    'Oran': { home: 750, stop: 450 },
-    'Alger': { home: 700, stop: 450 },
-    'Boumerdès': { home: 800, stop: 500 },
-    'Blida': { home: 800, stop: 500 },
-    'Tipaza': { home: 800, stop: 500 },
-    'Tizi Ouzou': { home: 800, stop: 500 },
-    'Bouira': { home: 800, stop: 500 },
-    'Béjaïa': { home: 800, stop: 500 },
-    'Médéa': { home: 800, stop: 500 },
-    'Aïn Defla': { home: 800, stop: 500 },
-    'Aïn Témouchent': { home: 800, stop: 500 },
-    'Chlef': { home: 800, stop: 500 },
-    'Constantine': { home: 800, stop: 500 },
-    'Sétif': { home: 800, stop: 500 },
-    'Tiaret': { home: 800, stop: 500 },
-    'Tlemcen': { home: 800, stop: 500 },
-    'Relizane': { home: 800, stop: 500 },
-    'Sidi Bel Abbès': { home: 800, stop: 500 },
-    'Jijel': { home: 900, stop: 600 },
-    'Bordj Bou Arréridj': { home: 900, stop: 600 },
-    'Annaba': { home: 900, stop: 600 },
-    'Batna': { home: 900, stop: 600 },
-    'Tissemsilt': { home: 900, stop: 600 },
-    'Skikda': { home: 900, stop: 600 },
-    'Mila': { home: 900, stop: 600 },
-    'M\'Sila': { home: 900, stop: 600 },
-    'El Tarf': { home: 950, stop: 600 },
-    'Guelma': { home: 950, stop: 600 },
-    'Khenchela': { home: 950, stop: 600 },
-    'Oum El Bouaghi': { home: 950, stop: 600 },
-    'Souk Ahras': { home: 950, stop: 600 },
-    'Tébessa': { home: 1000, stop: 600 },
-    'Laghouat': { home: 1000, stop: 600 },
-    'Djelfa': { home: 1000, stop: 600 },
-    'Biskra': { home: 1000, stop: 600 },
-    'Ouled Djellal': { home: 1000, stop: 1000 },
-    'Ghardaïa': { home: 1100, stop: 700 },
-    'El Meniaa': { home: 1100, stop: 700 },
-    'El Oued': { home: 1100, stop: 700 },
-    'El M\'Ghair': { home: 1100, stop: 1100 },
-    'Ouargla': { home: 1100, stop: 700 },
-    'Touggourt': { home: 1100, stop: 700 },
-    'El Bayadh': { home: 1200, stop: 800 },
-    'Naâma': { home: 1200, stop: 800 },
-    'Béchar': { home: 1200, stop: 800 },
-    'Béni Abbès': { home: 1200, stop: 1200 },
-    'Adrar': { home: 1500, stop: 1000 },
-    'Timimoun': { home: 1500, stop: 1000 },
-    'Tindouf': { home: 1700, stop: 1000 },
-    'In Salah': { home: 1800, stop: 1200 },
-    'Illizi': { home: 1900, stop: 1500 },
-    'Tamanrasset': { home: 2000, stop: 1500 },
-    'Djanet': { home: 2200, stop: 2200 }
-};
+// Shipping rates, fetched once from /orders/api/rates/ (browser-cached per version)
+// null until loaded; wilayas missing from rates cost defaultRate, as on the server
+let shippingRates = null;
+let defaultRate = null;
+const stopDeskCache = {};
 
 // Global variables
 let map, marker;
@@ -72,8 +18,70 @@ document.addEventListener('DOMContentLoaded', function() {
         radio.addEventListener('change', handleDeliveryChange);
     });
     document.getElementById('checkoutForm')?.addEventListener('submit', validateCheckoutForm);
+    loadShippingRates();
 });
 
+// ========== Shipping Data ==========
+function loadShippingRates() {
+    const form = document.getElementById('checkoutForm');
+    if (!form?.dataset.ratesUrl) return;
+
+    fetch(form.dataset.ratesUrl)
+        .then(response => response.json())
+        .then(data => {
+            shippingRates = data.rates;
+            defaultRate = data.default;
+            updateShippingCost();
+        })
+        .catch(error => console.error('Could not load shipping rates:', error));
+}
+
+function loadStopDesks(wilaya) {
+    const form = document.getElementById('checkoutForm');
+    const list = document.getElementById('stop-desk-list');
+    if (!list || !form?.dataset.stopDesksUrl) return;
+
+    if (!stopDeskCache[wilaya]) {
+        const url = form.dataset.stopDesksUrl.replace('__wilaya__', encodeURIComponent(wilaya));
+        stopDeskCache[wilaya] = fetch(url).then(response => response.json());
+    }
+    stopDeskCache[wilaya].then(renderStopDesks)
+        .catch(error => console.error('Could not load stop desks:', error));
+}
+
+function loadNearestStopDesks(lat, lng) {
+    const form = document.getElementById('checkoutForm');
+    if (!form?.dataset.nearestDesksUrl) return;
+
+    fetch(`${form.dataset.nearestDesksUrl}?lat=${lat}&lng=${lng}&k=3`)
+        .then(response => response.json())
+        .then(data => renderStopDesks(data.desks || []))
+        .catch(error => console.error('Could not load nearest stop desks:', error));
+}
+
+function renderStopDesks(desks) {
+    const list = document.getElementById('stop-desk-list');
+    if (!list) return;
+
+    list.innerHTML = '';
+    desks.forEach(desk => {
+        const li = document.createElement('li');
+        const distance = desk.distance_km !== undefined ? ` - ${desk.distance_km} km` : '';
+        li.textContent = `${desk.name} - ${desk.address}, ${desk.city} (${desk.working_hours})${distance}`;
+        list.appendChild(li);
+    });
+}
+
+function showStopDesks(wilaya) {
+    const lat = document.getElementById('latitude').value;
+    const lng = document.getElementById('longitude').value;
+    if (lat && lng) {
+        loadNearestStopDesks(lat, lng);
+    } else {
+        loadStopDesks(wilaya);
+    }
+}
+
 // ========== Shipping Cost Calculation ==========
 function updateShippingCost() {
     const wilaya = document.getElementById('wilaya').value;
@@ -86,13 +94,38 @@ function updateShippingCost() {
         return;
     }
 
-    const rates = shippingRates[wilaya] || { home: 800, stop: 800 };
+    if (!shippingRates) {
+        // Rates not loaded yet, don't guess a price the server won't charge
+        document.getElementById('home-price').textContent = '—';
+        document.getElementById('stop-price').textContent = '—';
+        document.getElementById('shipping-cost-display').textContent = '—';
+        return;
+    }
+
+    const wilayaRates = shippingRates[wilaya] || { home: defaultRate, stop_desk: defaultRate };
+    const rates = { home: wilayaRates.home, stop: wilayaRates.stop_desk };
+
+    // No stop desk price means no stop desk: delivered, and charged, at home
+    const stopRadio = document.getElementById('stop_desk');
+    if (stopRadio) {
+        stopRadio.disabled = !rates.stop;
+        if (!rates.stop && stopRadio.checked) {
+            document.getElementById('home_delivery').checked = true;
+            handleDeliveryChange();
+            return;
+        }
+    }
     
     // Update price labels
     document.getElementById('home-price').textContent = rates.home + ' DZD';
-    document.getElementById('stop-price').textContent = rates.stop + ' DZD (Save ' + (rates.home - rates.stop) + ' DZD!)';
+    document.getElementById('stop-price').textContent = rates.stop
+        ? rates.stop + ' DZD (Save ' + (rates.home - rates.stop) + ' DZD!)'
+        : 'Not available in this wilaya';
 
     const shippingCost = deliveryType === 'stop_desk' ? rates.stop : rates.home;
+    if (deliveryType === 'stop_desk') {
+        showStopDesks(wilaya);
+    }
     document.getElementById('shipping-cost-display').textContent = shippingCost + ' DZD';
     document.getElementById('shipping_cost').value = shippingCost;
     updateGrandTotal(shippingCost);
@@ -149,27 +182,11 @@ function initMap() {
         marker = L.marker([lat, lng]).addTo(map);
         document.getElementById('latitude').value = lat;
         document.getElementById('longitude').value = lng;
+        if (document.querySelector('input[name="delivery_type"]:checked')?.value === 'stop_desk') {
+            loadNearestStopDesks(lat, lng);
+        }
 
-        // Reverse geocoding to get address
-        fetch(`https://nominatim.openstreetmap.org/reverse?format=json&lat=${lat}&lon=${lng}`)
-            .then(response => response.json())
-            .then(data => {
-                if (data.address) {
-                    const addr = data.address;
-                    let addressText = '';
-                    
-                    if (addr.road) addressText += addr.road + ', ';
-                    if (addr.suburb) addressText += addr.suburb + ', ';
-                    if (addr.city || addr.town) addressText += (addr.city || addr.town);
-                    
-                    document.getElementById('address').value = addressText || data.display_name;
-                    
-                    if (addr.city || addr.town) {
-                        document.getElementById('city').value = addr.city || addr.town;
-                    }
-                }
-            })
-            .catch(err => console.log('Geocoding error:', err));
+        locateWilaya(lat, lng);
     });
 
     // Get user's current location
@@ -186,6 +203,32 @@ function initMap() {
     }
 }
 
+// ========== Wilaya Detection ==========
+// Resolved by our own server against a bundled gazetteer, so the detected
+// wilaya always matches a shipping rate
+function locateWilaya(lat, lng) {
+    const form = document.getElementById('checkoutForm');
+    if (!form?.dataset.locateUrl) return;
+
+    fetch(`${form.dataset.locateUrl}?lat=${lat.toFixed(3)}&lng=${lng.toFixed(3)}`)
+        .then(response => response.ok ? response.json() : null)
+        .then(place => {
+            // No wilaya near a border: leave the choice to the customer
+            if (!place?.wilaya) return;
+
+            const select = document.getElementById('wilaya');
+            if ([...select.options].some(option => option.value === place.wilaya)) {
+                select.value = place.wilaya;
+            }
+            const city = document.getElementById('city');
+            if (!city.value) {
+                city.value = place.commune;
+            }
+            updateShippingCost();
+        })
+        .catch(err => console.log('Geocoding error:', err));
+}
+
 // ========== Form Validation ==========
 function validateCheckoutForm(e) {
     const wilaya = document.getElementById('wilaya').value;
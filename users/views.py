@@ -5,73 +5,27 @@ from django.contrib import messages
 from .models import UserProfile, Wishlist
 from products.models import Product
 from orders.models import Order
+from cart.guest import merge_guest_cart
 from django.contrib.auth.models import User
 from django.db.models import Sum
-from twilio.rest import Client
+from notifications.models import SmsOutbox
 import random
-from django.conf import settings
 import logging
 from django.contrib.auth.tokens import default_token_generator
-from django.utils.http import urlsafe_base64_encode, urlsafe_base64_decode
+from django.utils.http import urlsafe_base64_encode, urlsafe_base64_decode, url_has_allowed_host_and_scheme
 from django.utils.encoding import force_bytes, force_str
 from django.template.loader import render_to_string
 
 logger = logging.getLogger(__name__)
 
-def clean_phone_number(phone):
-    """Convert Algerian phone to +213XXXXXXXXX format"""
-    phone = str(phone).replace(' ', '').replace('-', '').replace('(', '').replace(')', '')
-    
-    if phone.startswith('00213'):
-        phone = '+' + phone[2:]
-    elif phone.startswith('0'):
-        phone = '+213' + phone[1:]
-    elif phone.startswith('213'):
-        phone = '+' + phone
-    elif not phone.startswith('+'):
-        phone = '+213' + phone
-    
-    return phone
-
 def send_verification_sms(phone, code):
-    """Send SMS verification code"""
-    try:
-        # Check if we have API Key credentials
-        if hasattr(settings, 'SMS_API_KEY_SID') and settings.SMS_API_KEY_SID:
-            # Using API Key (more secure)
-            client = Client(
-                settings.SMS_API_KEY_SID,
-                settings.SMS_API_KEY_SECRET,
-                settings.SMS_ACCOUNT_SID
-            )
-            logger.info("Using Twilio API Key authentication")
-        else:
-            # Using Auth Token
-            client = Client(
-                settings.SMS_ACCOUNT_SID,
-                settings.SMS_AUTH_TOKEN
-            )
-            logger.info("Using Twilio Auth Token authentication")
-        
-        # Clean phone number
-        phone = clean_phone_number(phone)
-        logger.info(f"Sending SMS to: {phone}")
-        
-        # Send message
-        message = client.messages.create(
-            body=f"Your Bee House verification code is: {code} 🐝",
-            from_=settings.SMS_TWILIO_NUMBER,
-            to=phone
-        )
-        
-        logger.info(f"SMS feels successfully. SID: {message.sid}")
-        return True
-        
-    except Exception as e:
-        logger.error(f"SMS Error: {str(e)}")
-        logger.error(f"Phone number: {phone}")
-        logger.error(f"Twilio Number: {settings.SMS_TWILIO_NUMBER}")
-        raise e
+    """Queue the SMS verification code, sent ahead of other SMS by the sms_worker command"""
+    SmsOutbox.enqueue(
+        phone,
+        f"Your Bee House verification code is: {code} 🐝",
+        kind='verification',
+        priority=SmsOutbox.PRIORITY_HIGH,
+    )
 
 def verify(request):
     reg_data = request.session.get('reg_data')
@@ -140,30 +94,10 @@ def register(request):
             'verification_code': verification_code
         }
 
-        # Try to send SMS
-        try:
-            send_verification_sms(phone, verification_code)
-            messages.success(request, f'Verification code sent to {phone}!')
-            return redirect('users:verify')
-        except Exception as e:
-            logger.error(f"Registration SMS failed: {str(e)}")
-            
-            # Provide detailed error message
-            error_msg = str(e)
-            if "Unable to create record" in error_msg:
-                messages.error(request, f'Invalid phone number format. Please use format: 0783927367')
-            elif "authenticate" in error_msg.lower():
-                messages.error(request, 'SMS service configuration error. Please contact support.')
-            elif "20003" in error_msg:
-                messages.error(request, 'Twilio authentication failed. Please contact support.')
-            elif "21211" in error_msg:
-                messages.error(request, f'Invalid phone number: {phone}. Please check and try again.')
-            elif "21608" in error_msg:
-                messages.error(request, 'Phone number is not verified with Twilio. Please contact support.')
-            else:
-                messages.error(request, f'Error sending SMS: {error_msg}')
-            
-            return redirect('users:register')
+        # Queue the SMS, the outbox worker sends it
+        send_verification_sms(phone, verification_code)
+        messages.success(request, f'Verification code sent to {phone}!')
+        return redirect('users:verify')
         
     return render(request, 'users/register.html')
 
@@ -184,7 +118,12 @@ def user_login(request):
             
             # Redirect to next page or home
             next_page = request.GET.get('next', 'home:home_page')
-            return redirect(next_page)
+            if not url_has_allowed_host_and_scheme(next_page, allowed_hosts={request.get_host()}):
+                next_page = 'home:home_page'
+            response = redirect(next_page)
+            # Keep what the visitor put in their cart before logging in
+            merge_guest_cart(request, response)
+            return response
         else:
             messages.error(request, 'Invalid username or password!')
     
@@ -213,7 +152,11 @@ def profile(request):
     recent_orders = Order.objects.filter(user=request.user).prefetch_related('items')[:5]
     
     # Get wishlist items
-    wishlist_items = Wishlist.objects.filter(user=request.user).select_related('product')
+    wishlist_items = (
+        Wishlist.objects.filter(user=request.user)
+        .select_related('product')
+        .prefetch_related('product__images')
+    )
     
     if request.method == 'POST':
         # Update profile